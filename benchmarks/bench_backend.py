@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import synthetic  # noqa: E402
+from translator_toolkit import backend  # noqa: E402
+from translator_toolkit.mxliff import Mxliff  # noqa: E402
+from translator_toolkit.sdlxliff import Sdlxliff  # noqa: E402
+
+
+def scan(cls, source_file: str, backend_: str) -> int:
+    count = 0
+    for _, tu in cls.stream_trans_units(source_file, backend=backend_):
+        count += 1
+    return count
+
+
+def timed(cls, source_file: str, backend_: str) -> float:
+    start = time.perf_counter()
+    scan(cls, source_file, backend_)
+    return time.perf_counter() - start
+
+
+def bench(label: str, source_file: str, backend_: str):
+    # each run gets its own process so that the peak rss includes the memory lxml allocates outside of python
+    result = subprocess.run([sys.executable, __file__, '--run', label, source_file, backend_], capture_output=True, text=True, check=True)
+    seconds, peak = result.stdout.split()
+    print(f'{label:<24} {backend_:<6} {float(seconds):8.2f} s {int(peak) / 1024:8.2f} MB peak rss')
+
+
+def run(label: str, source_file: str, backend_: str):
+    cls = Sdlxliff if label == 'Sdlxliff' else Mxliff
+    seconds = timed(cls, source_file, backend_)
+    print(seconds, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--run':
+        run(*sys.argv[2:5])
+        return
+    units = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        sdlxliff_file = os.path.join(tmp_dir, 'synthetic.sdlxliff')
+        mxliff_file = os.path.join(tmp_dir, 'synthetic.mxliff')
+        synthetic.write_sdlxliff(sdlxliff_file, units)
+        synthetic.write_mxliff(mxliff_file, units)
+        print(f'{units} trans-units per file, stream_trans_units')
+        for backend_ in backend.BACKENDS:
+            bench('Sdlxliff', sdlxliff_file, backend_)
+        for backend_ in backend.BACKENDS:
+            bench('Mxliff', mxliff_file, backend_)
+
+
+if __name__ == '__main__':
+    main()
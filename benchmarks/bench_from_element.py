@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+import os
+import sys
+import tempfile
+import timeit
+
+from lxml import etree
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import synthetic  # noqa: E402
+from translator_toolkit.ns import XLF, SDLXLF, MXLF  # noqa: E402
+from translator_toolkit.mxliff import MxliffTransUnit, MxliffAltTrans  # noqa: E402
+from translator_toolkit.sdlxliff import SdlxliffTransUnit, SdlxliffSegmentPair, SdlxliffSegDefinition  # noqa: E402
+from translator_toolkit.util import stringutil  # noqa: E402
+
+
+def find_mxliff_alt_trans(elem):
+    # the find()-based constructors as they were before the single child scan
+    origin = elem.get('origin', '')
+    v = elem.get('match-quality', '0')
+    match_quality = float(v) if stringutil.is_float(v) else 0
+    target_elem = elem.find(f'./{XLF}target')
+    target = target_elem.text or '' if target_elem is not None else ''
+    return MxliffAltTrans(origin, match_quality, target)
+
+
+def find_mxliff_trans_unit(elem):
+    id_ = elem.get('id', '')
+    m_trans_origin = elem.get(MXLF + 'trans-origin', '')
+    m_confirmed = elem.get(MXLF + 'confirmed', '')
+    m_locked = True if elem.get(MXLF + 'locked') != 'false' else False
+    v = elem.get(MXLF + 'score', '0')
+    m_score = float(v) if stringutil.is_float(v) else 0
+    v = elem.get(MXLF + 'gross-score', '0')
+    m_gross_score = float(v) if stringutil.is_float(v) else 0
+    m_para_id = elem.get(MXLF + 'para-id', '')
+    m_created_at = stringutil.unixtime_to_datetime(elem.get(MXLF + 'created-at', '0'))
+    m_created_by = elem.get(MXLF + 'created-by', '')
+    m_modified_at = stringutil.unixtime_to_datetime(elem.get(MXLF + 'modified-at', '0'))
+    m_modified_by = elem.get(MXLF + 'modified-by', '')
+    m_level_edited = elem.get(MXLF + 'level-edited') == 'true'
+    source_elem = elem.find(f'./{XLF}source')
+    target_elem = elem.find(f'./{XLF}target')
+    source = source_elem.text or '' if source_elem is not None else ''
+    target = target_elem.text or '' if target_elem is not None else ''
+    alt_trans_units = [find_mxliff_alt_trans(e) for e in elem.iterchildren(XLF + 'alt-trans')]
+    return MxliffTransUnit(id_, source, target, m_trans_origin, m_score, m_gross_score, m_confirmed, m_locked,
+                           m_para_id, m_created_at, m_created_by, m_modified_at, m_modified_by, m_level_edited,
+                           alt_trans_units)
+
+
+def find_sdlxliff_trans_unit(elem):
+    segment_pairs = []
+    seg_source = elem.find(f'./{XLF}seg-source')
+    target = elem.find(f'./{XLF}target')
+    if seg_source is not None and target is not None:
+        src_mrks = (e for e in seg_source.iterchildren(XLF + 'mrk') if e.get('mtype') == 'seg')
+        tgt_mrks = (e for e in target.iterchildren(XLF + 'mrk') if e.get('mtype') == 'seg')
+        segment_pairs = [SdlxliffSegmentPair.from_element(s, t) for s, t in zip(src_mrks, tgt_mrks)]
+    seg_defs = elem.find(f'./{SDLXLF}seg-defs')
+    segment_definitions = [SdlxliffSegDefinition.from_element(e) for e in seg_defs.iterchildren(SDLXLF + 'seg')] if seg_defs is not None else []
+    return SdlxliffTransUnit(elem.get('id', ''), segment_pairs, segment_definitions)
+
+
+def bench(label: str, elems: list, func, repeat: int = 5):
+    best = min(timeit.repeat(lambda: [func(e) for e in elems], number=1, repeat=repeat))
+    per_unit = best / len(elems) * 1e6
+    print(f'{label:<40} {per_unit:8.2f} us/unit')
+    return per_unit
+
+
+def main():
+    units = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        sdlxliff_file = os.path.join(tmp_dir, 'synthetic.sdlxliff')
+        mxliff_file = os.path.join(tmp_dir, 'synthetic.mxliff')
+        synthetic.write_sdlxliff(sdlxliff_file, units)
+        synthetic.write_mxliff(mxliff_file, units)
+        parser = etree.XMLParser(huge_tree=True)
+        mx_elems = list(etree.parse(mxliff_file, parser).getroot().iterdescendants(XLF + 'trans-unit'))
+        sdl_elems = list(etree.parse(sdlxliff_file, parser).getroot().iterdescendants(XLF + 'trans-unit'))
+
+    print(f'{units} trans-units per file')
+    before = bench('MxliffTransUnit (find)', mx_elems, find_mxliff_trans_unit)
+    after = bench('MxliffTransUnit.from_element', mx_elems, MxliffTransUnit.from_element)
+    print(f'{"speedup":<40} {before / after:8.2f}x')
+    alt_elems = [e for tu in mx_elems for e in tu.iterchildren(XLF + 'alt-trans')]
+    before = bench('MxliffAltTrans (find)', alt_elems, find_mxliff_alt_trans)
+    after = bench('MxliffAltTrans.from_element', alt_elems, MxliffAltTrans.from_element)
+    print(f'{"speedup":<40} {before / after:8.2f}x')
+    before = bench('SdlxliffTransUnit (find)', sdl_elems, find_sdlxliff_trans_unit)
+    after = bench('SdlxliffTransUnit.from_element', sdl_elems, SdlxliffTransUnit.from_element)
+    print(f'{"speedup":<40} {before / after:8.2f}x')
+
+
+if __name__ == '__main__':
+    main()
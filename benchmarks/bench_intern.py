@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+import gc
+import os
+import sys
+import tempfile
+import tracemalloc
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import synthetic  # noqa: E402
+from translator_toolkit.mxliff import Mxliff  # noqa: E402
+from translator_toolkit.sdlxliff import Sdlxliff  # noqa: E402
+
+SDLXLIFF_FIELDS = ['mid', 'segment_definitions']
+MXLIFF_FIELDS = ['id', 'm_trans_origin', 'm_confirmed', 'm_created_by', 'm_modified_by', 'alt_trans_units']
+
+
+def measure(load, source_file, fields, intern=True) -> tuple[int, int]:
+    gc.collect()
+    tracemalloc.start()
+    if intern:
+        doc = load(source_file, fields=fields)
+    else:
+        with mock.patch('sys.intern', lambda s: s):
+            doc = load(source_file, fields=fields)
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size, len(doc.files)
+
+
+def bench(label, load, source_file, fields):
+    before, _ = measure(load, source_file, fields, intern=False)
+    after, _ = measure(load, source_file, fields, intern=True)
+    print(f'{label:<12} {before / 1e6:8.2f} MB -> {after / 1e6:8.2f} MB ({(before - after) / before:6.1%} saved)')
+
+
+def main():
+    units = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        sdlxliff_file = os.path.join(tmp_dir, 'synthetic.sdlxliff')
+        mxliff_file = os.path.join(tmp_dir, 'synthetic.mxliff')
+        synthetic.write_sdlxliff(sdlxliff_file, units)
+        synthetic.write_mxliff(mxliff_file, units)
+
+        print(f'{units} trans-units per file, retained memory of the loaded document (attribute fields only)')
+        bench('Sdlxliff', Sdlxliff.load, sdlxliff_file, SDLXLIFF_FIELDS)
+        bench('Mxliff', Mxliff.load, mxliff_file, MXLIFF_FIELDS)
+
+        print('retained memory of the loaded document (all fields)')
+        bench('Sdlxliff', Sdlxliff.load, sdlxliff_file, None)
+        bench('Mxliff', Mxliff.load, mxliff_file, None)
+
+
+if __name__ == '__main__':
+    main()
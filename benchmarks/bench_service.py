@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import synthetic  # noqa: E402
+from translator_toolkit import service  # noqa: E402
+
+
+def report(label: str, latencies: list[float]):
+    print(f'{label:<24} p50 {service.get_percentile(latencies, 50) * 1000:8.2f} ms p99 {service.get_percentile(latencies, 99) * 1000:8.2f} ms')
+
+
+def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        source_file = os.path.join(tmp_dir, 'small.sdlxliff')
+        synthetic.write_sdlxliff(source_file, 20)
+        print(f'{requests} requests for a 20 trans-unit file')
+
+        # a new pool per request, as a service without warm workers would do
+        latencies = []
+        for _ in range(requests):
+            start = time.perf_counter()
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                executor.submit(service.run_job, 'segments', source_file, {}).result()
+            latencies.append(time.perf_counter() - start)
+        report('pool per request', latencies)
+
+        with service.ParsingService(max_workers=2) as svc:
+            latencies = []
+            for _ in range(requests):
+                start = time.perf_counter()
+                svc.run('segments', source_file)
+                latencies.append(time.perf_counter() - start)
+            report('ParsingService', latencies)
+
+
+if __name__ == '__main__':
+    main()
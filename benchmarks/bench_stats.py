@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import synthetic  # noqa: E402
+from translator_toolkit import stats  # noqa: E402
+
+
+def bench(label: str, func, source_file: str):
+    start = time.perf_counter()
+    file_stats = func(source_file)
+    seconds = time.perf_counter() - start
+    print(f'{label:<24} {seconds:8.2f} s {file_stats.segments:>8} segments')
+
+
+def main():
+    units = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        sdlxliff_file = os.path.join(tmp_dir, 'synthetic.sdlxliff')
+        mxliff_file = os.path.join(tmp_dir, 'synthetic.mxliff')
+        synthetic.write_sdlxliff(sdlxliff_file, units)
+        synthetic.write_mxliff(mxliff_file, units)
+        print(f'{units} trans-units per file')
+        bench('Sdlxliff get_stats', stats.get_stats, sdlxliff_file)
+        bench('Sdlxliff scan_stats', stats.scan_stats, sdlxliff_file)
+        bench('Mxliff get_stats', stats.get_stats, mxliff_file)
+        bench('Mxliff scan_stats', stats.scan_stats, mxliff_file)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+import argparse
+import os
+import random
+from xml.sax.saxutils import escape
+
+WORDS = ['video', 'document', 'header', 'footer', 'cover', 'design', 'theme', 'style', 'click', 'insert', 'gallery',
+         'element', 'online', 'keyword', 'search', 'professional', 'matching', 'sidebar', 'unity', 'text', 'box']
+KANJI = 'ビデオを使うと伝えたい内容を明確に表現できます文書全体の統一感を出すこともできます表紙追加挿入検索'
+CONFS = ['Translated', 'Draft', 'ApprovedTranslation', 'Unspecified']
+ORIGINS = [('mt', 'Google Cloud Translation API'), ('tm', 'Main TM'), ('interactive', ''), ('auto-propagated', 'Propagated')]
+
+
+def _sentence(rnd: random.Random, n: int) -> str:
+    return ' '.join(rnd.choice(WORDS) for _ in range(n)).capitalize() + '.'
+
+
+def _ja_sentence(rnd: random.Random, n: int) -> str:
+    return ''.join(rnd.choice(KANJI) for _ in range(n)) + '。'
+
+
+def write_sdlxliff(path: str, units: int, segments_per_unit: int = 3, seed: int = 0):
+    rnd = random.Random(seed)
+    with open(path, 'w', encoding='utf-8') as out:
+        out.write('<?xml version="1.0" encoding="utf-8"?>\n')
+        out.write('<xliff xmlns:sdl="http://sdl.com/FileTypes/SdlXliff/1.0" xmlns="urn:oasis:names:tc:xliff:document:1.2" version="1.2" sdl:version="1.0">\n')
+        out.write('<doc-info xmlns="http://sdl.com/FileTypes/SdlXliff/1.0"><cmt-defs>\n')
+        for i in range(max(1, units // 100)):
+            out.write(f'<cmt-def id="cmt-{i}"><Comments><Comment severity="Low" user="user" date="2020-04-05T15:57:58.6608253+09:00" version="1.0">'
+                      f'Comment {i}</Comment></Comments></cmt-def>\n')
+        out.write('</cmt-defs></doc-info>\n')
+        out.write('<file original="synthetic.docx" datatype="x-sdlfilterframework2" source-language="ja-JP" target-language="en-US">\n')
+        out.write(f'<header><reference><internal-file form="base64">{"QUJD" * 2048}</internal-file></reference></header>\n<body>\n')
+        mid = 0
+        for i in range(units):
+            sources, src_mrks, tgt_mrks, segs = [], [], [], []
+            for _ in range(segments_per_unit):
+                mid += 1
+                source = escape(_ja_sentence(rnd, rnd.randint(10, 40)))
+                target = escape(_sentence(rnd, rnd.randint(5, 20)))
+                if mid % 100 == 0:
+                    target = f'<mrk mtype="x-sdl-comment" sdl:cid="cmt-{mid // 100 - 1}">{target}</mrk>'
+                sources.append(source)
+                src_mrks.append(f'<mrk mtype="seg" mid="{mid}">{source}</mrk>')
+                tgt_mrks.append(f'<mrk mtype="seg" mid="{mid}"><g id="{mid}">{target}</g></mrk>')
+                origin, origin_system = rnd.choice(ORIGINS)
+                segs.append(f'<sdl:seg id="{mid}" conf="{rnd.choice(CONFS)}" origin="{origin}" origin-system="{origin_system}" percent="{rnd.choice([0, 75, 100])}">'
+                            f'<sdl:value key="created_by">user</sdl:value></sdl:seg>')
+            out.write(f'<group><sdl:cxts><sdl:cxt id="1"/></sdl:cxts><trans-unit id="tu-{i}">'
+                      f'<source>{"".join(sources)}</source>'
+                      f'<seg-source>{"".join(src_mrks)}</seg-source><target>{"".join(tgt_mrks)}</target>'
+                      f'<sdl:seg-defs>{"".join(segs)}</sdl:seg-defs></trans-unit></group>\n')
+        out.write('</body>\n</file>\n</xliff>\n')
+
+
+def write_mxliff(path: str, units: int, seed: int = 0):
+    rnd = random.Random(seed)
+    with open(path, 'w', encoding='utf-8') as out:
+        out.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        out.write('<xliff xmlns="urn:oasis:names:tc:xliff:document:1.2" xmlns:m="http://www.memsource.com/mxlf/2.0" version="1.2" m:version="2.4" m:level="2">\n')
+        out.write('<file original="synthetic.docx" source-language="ja" target-language="en" datatype="x-undefined" m:file-format="DOC" m:task-id="task">\n')
+        out.write('<header><m:in-ctx-preview-skel bilingual="false"/></header>\n<body>\n')
+        for i in range(units):
+            score = rnd.choice(['0.0', '75.0', '90.9', '100.0'])
+            out.write(f'<group id="{i}" m:para-id="{i // 3}"><context-group><context context-type="x-file-part">word/document.xml::body</context></context-group>'
+                      f'<trans-unit id="{i}" xml:space="preserve" m:score="{score}" m:gross-score="{score}" m:trans-origin="{rnd.choice(["tm", "mt", "null"])}" '
+                      f'm:confirmed="{rnd.choice(["0", "1", "2"])}" m:locked="{rnd.choice(["true", "false"])}" m:para-id="{i // 3}" '
+                      f'm:created-at="1580950266722" m:created-by="232275" m:modified-at="1580950876561" m:modified-by="5911" m:level-edited="true">'
+                      f'<source>{escape(_ja_sentence(rnd, rnd.randint(10, 40)))}</source><target>{escape(_sentence(rnd, rnd.randint(5, 20)))}</target>'
+                      f'<alt-trans origin="machine-trans" match-quality="0.0"><target>{escape(_sentence(rnd, 8))}</target></alt-trans>'
+                      f'<alt-trans origin="memsource-tm" match-quality="{rnd.choice(["0.0", "75.0", "99.0"])}"><target>{escape(_sentence(rnd, 8))}</target></alt-trans>'
+                      f'<m:editing-stats><m:editing-time>0</m:editing-time><m:thinking-time>0</m:thinking-time></m:editing-stats>'
+                      f'</trans-unit></group>\n')
+        out.write('</body>\n</file>\n</xliff>\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate synthetic SDLXLIFF/MXLIFF files for benchmarks')
+    parser.add_argument('output_dir')
+    parser.add_argument('--units', type=int, default=20000)
+    args = parser.parse_args()
+    os.makedirs(args.output_dir, exist_ok=True)
+    write_sdlxliff(os.path.join(args.output_dir, 'synthetic.sdlxliff'), args.units)
+    write_mxliff(os.path.join(args.output_dir, 'synthetic.mxliff'), args.units)
+
+
+if __name__ == '__main__':
+    main()
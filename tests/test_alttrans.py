@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+import os
+
+import pytest
+
+from translator_toolkit import alttrans
+from translator_toolkit.alttrans import AltTransAnalysis
+from translator_toolkit.mxliff import Mxliff, MxliffFile, MxliffBody, MxliffGroup, MxliffTransUnit, MxliffAltTrans, EPOCH
+
+data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+MXLIFF_FILE = os.path.join(data_dir, '01_ja-ja-en-R.mxliff')
+
+
+def create_trans_unit(id_, source, target, alt_trans_units):
+    return MxliffTransUnit(id_, source, target, '', 0.0, 0.0, '', False, '', EPOCH, '', EPOCH, '', False,
+                           [MxliffAltTrans(origin, quality, alt_target) for origin, quality, alt_target in alt_trans_units])
+
+
+def create_document(trans_units):
+    group = MxliffGroup('g', '0', [], trans_units)
+    return Mxliff('a.mxliff', 2, '1.2', '2.4', [MxliffFile('ja', 'en', 'a.docx', 'x', 'docx', '', MxliffBody([group]))])
+
+
+def test_get_origin_rank():
+    assert alttrans.get_origin_rank('memsource-tm') < alttrans.get_origin_rank('nt') < alttrans.get_origin_rank('machine-trans')
+    assert alttrans.get_origin_rank('other') == alttrans.get_origin_rank('unknown') == len(alttrans.ORIGIN_PRIORITY)
+
+
+def test_add_document():
+    analysis = AltTransAnalysis()
+    analysis.add_document(create_document([
+        create_trans_unit('1', 'one two', '', [('machine-trans', 0.0, 'mt'), ('memsource-tm', 99.0, '')]),
+        create_trans_unit('2', 'three', 'done', [('nt', 75.0, 'nt')])
+    ]))
+    assert analysis.source_files == ['a.mxliff']
+    assert [(i, tu.id) for i, tu in analysis.trans_units] == [(0, '1'), (0, '2')]
+    # candidates without a target are not collected
+    assert [c.target for c in analysis.candidates] == ['mt', 'nt']
+    assert analysis.words.tolist() == [2, 1]
+    assert analysis.translated.tolist() == [0, 1]
+
+
+def test_best_candidates():
+    pytest.importorskip('numpy')
+    analysis = AltTransAnalysis()
+    analysis.add_document(create_document([
+        create_trans_unit('1', 'one two', '', [('machine-trans', 0.0, 'mt'), ('memsource-tm', 99.0, 'tm99'), ('memsource-tm', 101.0, 'tm101')]),
+        create_trans_unit('2', 'three', '', [('machine-trans', 75.0, 'mt'), ('memsource-tm', 75.0, 'tm')]),
+        create_trans_unit('3', 'four five six', 'done', [('memsource-tm', 100.0, 'first'), ('memsource-tm', 100.0, 'second')]),
+        create_trans_unit('4', 'seven', '', [('memsource-tm', 100.0, '')]),
+        create_trans_unit('5', 'eight', '', [])
+    ]))
+    assert [c.target if c else None for c in map(analysis.get_best, range(5))] == ['tm101', 'tm', 'first', None, None]
+    assert analysis.get_best_qualities().tolist() == [101.0, 75.0, 100.0, -1.0, -1.0]
+    counts = analysis.get_band_counts()
+    assert counts['101'] == {'units': 1, 'words': 2}
+    assert counts['75-84'] == {'units': 1, 'words': 1}
+    assert counts['100'] == {'units': 1, 'words': 3}
+    assert counts['none'] == {'units': 2, 'words': 2}
+
+    assert [(i, c.target) for i, c in analysis.select(75.0).items()] == [(0, 'tm101'), (1, 'tm')]
+    assert [(i, c.target) for i, c in analysis.select(75.0, overwrite=True, origins=['machine-trans']).items()] == [(1, 'mt')]
+    assert analysis.prefill(100.0) == 1
+    assert analysis.trans_units[0][1].target == 'tm101'
+    assert analysis.prefill(100.0) == 0
+
+
+def test_write_targets(tmp_path):
+    pytest.importorskip('numpy')
+    analysis = alttrans.analyze([MXLIFF_FILE])
+    qualities = analysis.get_best_qualities().tolist()
+    assert qualities == [0.0, 75.0]
+    assert analysis.write_targets(75.0, overwrite=True, output_dir=str(tmp_path)) == 1
+    doc = Mxliff.load(str(tmp_path / os.path.basename(MXLIFF_FILE)))
+    tus = list(doc.get_all_trans_units())
+    assert tus[0].target == 'BBBB'
+    assert tus[1].target == analysis.get_best(1).target
+
+
+def test_write_selected_targets(tmp_path, monkeypatch):
+    analysis = alttrans.analyze([MXLIFF_FILE])
+    # the selection needs numpy, the write-back only the selected candidates
+    monkeypatch.setattr(analysis, 'select', lambda *args: {1: analysis.candidates[-1]})
+    assert analysis.write_targets(output_dir=str(tmp_path)) == 1
+    tus = list(Mxliff.load(str(tmp_path / os.path.basename(MXLIFF_FILE))).get_all_trans_units())
+    assert [tu.target for tu in tus] == ['BBBB', analysis.candidates[-1].target]
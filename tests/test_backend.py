@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+import os
+
+import pytest
+
+from translator_toolkit import backend
+from translator_toolkit import segment as segmentlib
+from translator_toolkit.sdlxliff import Sdlxliff
+from translator_toolkit.mxliff import Mxliff
+from translator_toolkit.error import TranslatorToolkitError
+
+data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+SDLXLIFF_FILE = os.path.join(data_dir, 'merged.docx.sdlxliff')
+MXLIFF_FILE = os.path.join(data_dir, '01_ja-ja-en-R.mxliff')
+
+
+def to_dict(obj):
+    if isinstance(obj, list):
+        return [to_dict(o) for o in obj]
+    if hasattr(obj, '__dict__'):
+        return {k: to_dict(v) for k, v in vars(obj).items()}
+    return obj
+
+
+@pytest.mark.parametrize('cls,source_file,fields,replacements', [
+    (Sdlxliff, SDLXLIFF_FILE, None, []),
+    (Sdlxliff, SDLXLIFF_FILE, ['mid', 'target'], []),
+    # comments and processing instructions inside seg mrks are part of the content
+    (Sdlxliff, SDLXLIFF_FILE, None, [(b'mid="2">Clicking', b'mid="2">Click<!-- note --><?pi data?><?empty?>ing'),
+                                     (b'>With videos</mrk>', b'>With <!--c-->videos</mrk>')]),
+    (Mxliff, MXLIFF_FILE, None, []),
+    (Mxliff, MXLIFF_FILE, ['id', 'm_score', 'alt_trans_units'], []),
+    (Mxliff, MXLIFF_FILE, None, [(b'<source>AAAA</source>', b'<source>AA<!-- note -->AA</source>'), (b'<target>EEEE', b'<target>EE<?pi?>EE')])
+])
+def test_expat_backend(tmp_path, cls, source_file, fields, replacements):
+    if replacements:
+        with open(source_file, 'rb') as f:
+            data = f.read()
+        for old, new in replacements:
+            assert old in data
+            data = data.replace(old, new)
+        source_file = str(tmp_path / os.path.basename(source_file))
+        with open(source_file, 'wb') as f:
+            f.write(data)
+    expected = [(to_dict(file), to_dict(tu)) for file, tu in cls.stream_trans_units(source_file, fields)]
+    actual = [(to_dict(file), to_dict(tu)) for file, tu in cls.stream_trans_units(source_file, fields, backend=backend.EXPAT)]
+    assert actual == expected
+
+
+def test_stream_segments():
+    for source_file in [SDLXLIFF_FILE, MXLIFF_FILE]:
+        expected = [s.to_json() for s in segmentlib.stream_segments(source_file)]
+        assert [s.to_json() for s in segmentlib.stream_segments(source_file, backend=backend.EXPAT)] == expected
+    with pytest.raises(TranslatorToolkitError):
+        list(segmentlib.stream_segments(os.path.join(data_dir, 'sample.xlf'), backend=backend.EXPAT))
+    with pytest.raises(TranslatorToolkitError):
+        list(segmentlib.stream_segments(SDLXLIFF_FILE, backend='sax'))
+
+
+def test_markup_writer():
+    writer = backend.MarkupWriter()
+    writer.text('a < b & c')
+    writer.start('urn:oasis:names:tc:xliff:document:1.2 g', {'id': '1', 'ctype': 'x-"q"'})
+    writer.text('bold')
+    writer.end('urn:oasis:names:tc:xliff:document:1.2 g')
+    writer.start('urn:oasis:names:tc:xliff:document:1.2 x', {'http://sdl.com/FileTypes/SdlXliff/1.0 cid sdl': 'c1'})
+    writer.end('urn:oasis:names:tc:xliff:document:1.2 x')
+    writer.start('urn:oasis:names:tc:xliff:document:1.2 g', {})
+    writer.comment(' note ')
+    writer.pi('pi', '')
+    writer.end('urn:oasis:names:tc:xliff:document:1.2 g')
+    assert writer.getvalue() == 'a &lt; b &amp; c<g id="1" ctype="x-&quot;q&quot;">bold</g><x sdl:cid="c1"/><g><!-- note --><?pi?></g>'
+
+
+def test_invalid_xml(tmp_path):
+    source_file = tmp_path / 'broken.mxliff'
+    source_file.write_text('<xliff xmlns="urn:oasis:names:tc:xliff:document:1.2"><file><body><trans-unit id="1">', encoding='utf-8')
+    with pytest.raises(TranslatorToolkitError):
+        list(Mxliff.stream_trans_units(str(source_file), backend=backend.EXPAT))
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+import csv
+import json
+import os
+import shutil
+
+from lxml import etree
+
+from translator_toolkit import cli
+
+data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+
+def copy_data(tmp_path) -> str:
+    input_dir = tmp_path / 'input'
+    input_dir.mkdir()
+    for name in ['01_ja-ja-en-R.mxliff', 'merged.docx.sdlxliff']:
+        shutil.copy(os.path.join(data_dir, name), input_dir)
+    return str(input_dir)
+
+
+def test_convert(tmp_path):
+    input_dir = copy_data(tmp_path)
+    output_dir = str(tmp_path / 'output')
+    for format_ in cli.CONVERT_FORMATS:
+        assert cli.main(['convert', input_dir, '-f', format_, '-o', output_dir, '-j', '2']) == 0
+
+    with open(os.path.join(output_dir, '01_ja-ja-en-R.mxliff.jsonl'), encoding='utf-8') as f:
+        units = [json.loads(line) for line in f]
+    assert [(u['id'], u['source'], u['target']) for u in units] == [('0', 'AAAA', 'BBBB'), ('1', 'DDDD', 'EEEE')]
+
+    with open(os.path.join(output_dir, 'merged.docx.sdlxliff.csv'), encoding='utf-8', newline='') as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 13
+    assert rows[3]['id'] == '4 a'
+    assert rows[3]['status'] == 'Translated'
+
+    with open(os.path.join(output_dir, 'merged.docx.sdlxliff.json'), encoding='utf-8') as f:
+        assert len(json.load(f)['files']) == 2
+
+    tmx = etree.parse(os.path.join(output_dir, '01_ja-ja-en-R.mxliff.tmx')).getroot()
+    assert tmx.find('header').get('srclang') == 'ja'
+    assert [seg.text for seg in tmx.iter('seg')] == ['AAAA', 'BBBB', 'DDDD', 'EEEE']
+
+
+def test_stats(tmp_path, capsys):
+    input_dir = copy_data(tmp_path)
+    assert cli.main(['stats', input_dir]) == 0
+    stats = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [(s['segments'], s['locked'], s['statuses'], s['words']) for s in stats] == [(2, 1, {'2': 1, '0': 1}, None), (13, 0, {'Translated': 13}, None)]
+    assert cli.main(['stats', input_dir, '-w', '-j', '2']) == 0
+    assert [json.loads(line)['words'] for line in capsys.readouterr().out.splitlines()] == [2, 502]
+
+
+def test_qa_and_extract(tmp_path, capsys):
+    input_dir = copy_data(tmp_path)
+    report = str(tmp_path / 'qa.jsonl')
+    assert cli.main(['qa', input_dir, '-f', 'jsonl', '-o', report, '--strict']) == 1
+    with open(report, encoding='utf-8') as f:
+        assert [json.loads(line)['check'] for line in f] == ['locked-edited']
+
+    assert cli.main(['extract', os.path.join(input_dir, '01_ja-ja-en-R.mxliff'), '-s', 'both']) == 0
+    assert capsys.readouterr().out == 'AAAA\tBBBB\nDDDD\tEEEE\n'
+    assert cli.main(['extract', os.path.join(input_dir, 'merged.docx.sdlxliff'), '-u']) == 0
+    assert len(capsys.readouterr().out.splitlines()) == 7
+
+
+def test_comments(tmp_path, capsys):
+    input_dir = copy_data(tmp_path)
+    report = str(tmp_path / 'comments.jsonl')
+    assert cli.main(['comments', input_dir, '-f', 'jsonl', '-o', report, '-j', '2']) == 0
+    with open(report, encoding='utf-8') as f:
+        rows = [json.loads(line) for line in f]
+    assert [r['segment_id'] for r in rows] == ['', '', '1', '1', '1', '1', '1', '3', '3']
+    assert capsys.readouterr().err.strip() == '9 comments'
+
+
+def test_consistency(tmp_path, capsys):
+    input_dir = copy_data(tmp_path)
+    assert cli.main(['consistency', input_dir, '--strict', '-j', '2']) == 0
+    assert capsys.readouterr().err.strip() == '0 inconsistencies in 15 segments'
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+import os
+
+import pytest
+
+from translator_toolkit import columnar
+from translator_toolkit.error import TranslatorToolkitError
+
+data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+
+def test_read_mxliff_columns():
+    columns = columnar.read_columns(os.path.join(data_dir, '01_ja-ja-en-R.mxliff'))
+    assert len(columns) == 2
+    assert columns.columns['id'] == ['0', '1']
+    assert columns.columns['source'] == ['AAAA', 'DDDD']
+    assert columns.columns['target'] == ['BBBB', 'EEEE']
+    assert columns.columns['score'].tolist() == [0.0, 90.9]
+    assert columns.columns['gross_score'].tolist() == [0.0, 90.0]
+    assert columns.columns['confirmed'].tolist() == [1, 0]
+    assert columns.columns['locked'].tolist() == [0, 1]
+    assert columns.columns['created_at'].tolist() == [1580950266722, 1580950272298]
+    assert columns.columns['modified_at'].tolist() == [1580950876561, 1580950876561]
+
+
+def test_read_mxliff_columns_first_children(tmp_path):
+    source_file = tmp_path / 'first.mxliff'
+    source_file.write_text(
+        '<xliff xmlns="urn:oasis:names:tc:xliff:document:1.2" version="1.2"><file><body><group>'
+        '<trans-unit id="0"><source>A</source><target>B</target><source>C</source><target>D</target></trans-unit>'
+        '</group></body></file></xliff>', encoding='utf-8')
+    columns = columnar.read_mxliff_columns(str(source_file))
+    assert (columns.columns['source'], columns.columns['target']) == (['A'], ['B'])
+
+
+def test_read_sdlxliff_columns():
+    columns = columnar.read_columns(os.path.join(data_dir, 'merged.docx.sdlxliff'))
+    assert len(columns) == 13
+    assert columns.columns['id'][3] == '4 a'
+    assert columns.columns['status'][3] == 'Translated'
+    assert all(columns.columns['confirmed'])
+    assert list(columns.columns) == list(columnar.SDLXLIFF_COLUMNS)
+
+
+def test_read_columns_unsupported():
+    with pytest.raises(TranslatorToolkitError):
+        columnar.read_columns(os.path.join(data_dir, 'sample.xlf'))
+
+
+def test_to_numpy():
+    np = pytest.importorskip('numpy')
+    arrays = columnar.read_columns(os.path.join(data_dir, '01_ja-ja-en-R.mxliff')).to_numpy()
+    assert arrays['created_at'].dtype == np.int64
+    assert arrays['locked'].dtype == np.bool_
+    assert arrays['locked'].tolist() == [False, True]
+    assert arrays['id'].tolist() == ['0', '1']
+
+
+def test_write_parquet(tmp_path):
+    pq = pytest.importorskip('pyarrow.parquet')
+    output_file = str(tmp_path / 'out.parquet')
+    assert columnar.write_parquet(os.path.join(data_dir, '01_ja-ja-en-R.mxliff'), output_file) == 2
+    table = pq.read_table(output_file)
+    assert table.column_names == list(columnar.MXLIFF_COLUMNS)
+    assert table.column('gross_score').to_pylist() == [0.0, 90.0]
+    assert table.column('confirmed').to_pylist() == [True, False]
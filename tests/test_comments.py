@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+import csv
+import io
+import json
+import os
+
+import pytest
+from lxml import etree
+
+from translator_toolkit import comments
+from translator_toolkit.sdlxliff import Sdlxliff, SdlxliffComment
+from translator_toolkit.error import TranslatorToolkitError
+
+data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+SDLXLIFF_FILE = os.path.join(data_dir, 'merged.docx.sdlxliff')
+
+
+def test_iter_comments():
+    records = comments.get_comments(SDLXLIFF_FILE)
+    assert [(r.segment_id, r.side, r.comment.text) for r in records] == [
+        ('', 'file', 'File-level comment1'),
+        ('', 'file', 'File-level comment2'),
+        ('1', 'target', 'Comment1'),
+        ('1', 'target', 'Comment 3\nABC'),
+        ('1', 'target', 'Comment4'),
+        ('1', 'target', 'Comment5'),
+        ('1', 'target', 'Comment 2'),
+        ('3', 'target', 'Segment-level comment'),
+        ('3', 'target', 'Segment-level comment2')
+    ]
+    # nested comments keep the text they are attached to
+    assert records[6].commented_text == 'With videos'
+    assert records[4].commented_text == 'With videos, you can clearly articulate'
+    assert records[2].target == 'With videos, you can clearly articulate what you want to convey.'
+    assert records[2].source
+
+    doc_info = Sdlxliff.load(SDLXLIFF_FILE).doc_info
+    assert all(r.comment.text in [c.text for c in doc_info.get_comments(r.cid)] for r in records)
+
+    with pytest.raises(TranslatorToolkitError):
+        comments.get_comments(os.path.join(data_dir, '01_ja-ja-en-R.mxliff'))
+
+
+def test_trans_unit_first_children():
+    elem = etree.fromstring(
+        '<trans-unit xmlns="urn:oasis:names:tc:xliff:document:1.2" xmlns:sdl="http://sdl.com/FileTypes/SdlXliff/1.0">'
+        '<seg-source><mrk mtype="seg" mid="1">A</mrk></seg-source>'
+        '<target><mrk mtype="seg" mid="1"><mrk mtype="x-sdl-comment" sdl:cid="c1">B</mrk></mrk></target>'
+        '<target><mrk mtype="seg" mid="1"><mrk mtype="x-sdl-comment" sdl:cid="c1">D</mrk></mrk></target></trans-unit>')
+    comment_map = {'c1': [SdlxliffComment('Medium', 'user', None, '1.0', 'text')]}
+    records = list(comments.get_trans_unit_comments('a.sdlxliff', elem, comment_map))
+    assert [(r.commented_text, r.source, r.target) for r in records] == [('B', 'A', 'B')]
+
+
+def test_write_report():
+    records = list(comments.iter_files_comments([SDLXLIFF_FILE, SDLXLIFF_FILE], max_workers=2))
+    assert len(records) == 18
+
+    outfile = io.StringIO()
+    assert comments.write_report(records, outfile, 'jsonl') == 18
+    rows = [json.loads(line) for line in outfile.getvalue().splitlines()]
+    assert list(rows[0]) == comments.REPORT_COLUMNS
+
+    outfile = io.StringIO(newline='')
+    assert comments.write_report(records, outfile) == 18
+    rows = list(csv.DictReader(io.StringIO(outfile.getvalue(), newline='')))
+    assert rows[3]['comment'] == 'Comment 3\nABC'
+    assert rows[3]['user'] == records[3].comment.user
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+import csv
+import io
+import json
+import os
+
+from translator_toolkit import consistency
+from translator_toolkit import pipeline
+from translator_toolkit.segment import Segment, SDLXLIFF
+
+data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+SDLXLIFF_FILE = os.path.join(data_dir, 'merged.docx.sdlxliff')
+MXLIFF_FILE = os.path.join(data_dir, '01_ja-ja-en-R.mxliff')
+
+
+def create_segment(source_file, id_, source, target):
+    return Segment(SDLXLIFF, source_file, id_, source, target, 'ja-JP', 'en-US', 'Translated', 0.0, False, False)
+
+
+def edit_targets(segment):
+    if segment.id == '16':
+        return 'Videos help you make your point.'
+    if segment.id == '21':
+        return 'For example, you can add matching covers, headers, and sidebars.'
+    return None
+
+
+def summarize(index, kind=None):
+    return [(i.kind, i.text, [(v.text, [segment_id for _, segment_id in v.locations]) for v in i.variants]) for i in index.get_inconsistencies(kind)]
+
+
+def test_consistency_index():
+    index = consistency.ConsistencyIndex()
+    index.add_segments([
+        create_segment('a.sdlxliff', '1', '追加', 'Add'),
+        create_segment('a.sdlxliff', '2', '<g id="1">追加</g>', 'Insert'),
+        create_segment('b.sdlxliff', '1', '追加', ' Add '),
+        create_segment('b.sdlxliff', '2', '挿入', 'Insert'),
+        create_segment('b.sdlxliff', '3', '削除', ''),
+        create_segment('b.sdlxliff', '4', '削除', 'delete'),
+        create_segment('b.sdlxliff', '5', '削除', 'Delete'),
+    ])
+    assert len(index) == 6
+    assert summarize(index) == [
+        ('source', '追加', [('Add', ['1', '1']), ('Insert', ['2'])]),
+        ('source', '削除', [('delete', ['4']), ('Delete', ['5'])]),
+        ('target', 'Insert', [('追加', ['2']), ('挿入', ['2'])]),
+    ]
+    assert [i.variants[0].locations for i in index.get_inconsistencies('target')] == [[('a.sdlxliff', '2')]]
+
+    index = consistency.ConsistencyIndex(ignore_case=True)
+    index.add(create_segment('b.sdlxliff', '4', '削除', 'delete'))
+    index.add(create_segment('b.sdlxliff', '5', '削除', 'Delete'))
+    assert summarize(index) == []
+
+
+def test_check_files(tmp_path):
+    edited_file = str(tmp_path / 'edited.sdlxliff')
+    assert pipeline.transform(SDLXLIFF_FILE, edit_targets, edited_file, max_workers=1) == 2
+    assert summarize(consistency.check_files([SDLXLIFF_FILE, MXLIFF_FILE], max_workers=1)) == []
+
+    source_files = [SDLXLIFF_FILE, MXLIFF_FILE, edited_file]
+    index = consistency.check_files(source_files, max_workers=1)
+    expected = summarize(index)
+    assert [(kind, len(variants)) for kind, _, variants in expected] == [('source', 2), ('source', 2), ('target', 2)]
+    assert expected[0][2] == [('With videos, you can clearly articulate what you want to convey.', ['1', '16', '1']),
+                              ('Videos help you make your point.', ['16'])]
+
+    # shards are merged in file order, so the result does not depend on the number of workers
+    sharded = consistency.check_files(source_files, max_workers=2)
+    assert summarize(sharded) == expected
+    assert sharded.get_locations(range(len(sharded))) == index.get_locations(range(len(index)))
+
+
+def test_write_report():
+    index = consistency.ConsistencyIndex()
+    index.add_segments([create_segment('a.sdlxliff', '1', '追加', 'Add'), create_segment('a.sdlxliff', '2', '追加', 'Insert')])
+    outfile = io.StringIO()
+    assert consistency.write_report(index.get_inconsistencies(), outfile) == 1
+    rows = list(csv.DictReader(io.StringIO(outfile.getvalue())))
+    assert [(r['group'], r['variant'], r['variant_text'], r['segment_id']) for r in rows] == [('1', '1', 'Add', '1'), ('1', '2', 'Insert', '2')]
+
+    outfile = io.StringIO()
+    assert consistency.write_report(index.get_inconsistencies(), outfile, 'jsonl') == 1
+    assert json.loads(outfile.getvalue())['variants'][1] == {'text': 'Insert', 'locations': [['a.sdlxliff', '2']]}
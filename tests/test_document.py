@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+import os
+import shutil
+
+import pytest
+
+import translator_toolkit
+from translator_toolkit import document
+from translator_toolkit.document import Document
+from translator_toolkit.segment import SDLXLIFF, MXLIFF, XLIFF, XLIFF2
+from translator_toolkit.sdlxliff import Sdlxliff
+from translator_toolkit.mxliff import Mxliff
+from translator_toolkit.error import TranslatorToolkitError
+
+data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+SDLXLIFF_FILE = os.path.join(data_dir, 'merged.docx.sdlxliff')
+MXLIFF_FILE = os.path.join(data_dir, '01_ja-ja-en-R.mxliff')
+XLIFF_FILE = os.path.join(data_dir, 'sample.xlf')
+XLIFF2_FILE = os.path.join(data_dir, 'sample_v2.xlf')
+
+
+def test_open():
+    assert translator_toolkit.open is document.open_document
+    doc = translator_toolkit.open(SDLXLIFF_FILE)
+    assert isinstance(doc, Document)
+    assert doc.format == SDLXLIFF
+    segments = list(doc)
+    assert segments
+    assert all(s.source_file == SDLXLIFF_FILE for s in segments)
+    assert isinstance(doc.load(), Sdlxliff)
+
+    doc = document.open_document(MXLIFF_FILE)
+    assert doc.format == MXLIFF
+    assert [s.id for s in doc.segments()] == [s.id for s in doc]
+    assert isinstance(doc.load(), Mxliff)
+
+
+def test_open_sniffs_namespaces(tmp_path):
+    sdlxliff_file = str(tmp_path / 'a.xlf')
+    mxliff_file = str(tmp_path / 'b.sdlxliff')
+    shutil.copy(SDLXLIFF_FILE, sdlxliff_file)
+    shutil.copy(MXLIFF_FILE, mxliff_file)
+    assert document.open_document(sdlxliff_file).format == SDLXLIFF
+    assert document.open_document(mxliff_file).format == MXLIFF
+
+    unknown_file = tmp_path / 'c.xml'
+    unknown_file.write_text('<?xml version="1.0"?><root/>', encoding='utf-8')
+    with pytest.raises(TranslatorToolkitError):
+        document.open_document(str(unknown_file))
+
+
+def test_stream_segments():
+    segments = list(document.stream_segments([SDLXLIFF_FILE, MXLIFF_FILE]))
+    formats = {s.format for s in segments}
+    assert formats == {SDLXLIFF, MXLIFF}
+    assert len(segments) == len(list(document.open_document(SDLXLIFF_FILE))) + len(list(document.open_document(MXLIFF_FILE)))
+
+
+def test_open_xliff():
+    doc = document.open_document(XLIFF_FILE)
+    assert doc.format == XLIFF
+    segments = list(doc)
+    assert [s.id for s in segments] == ['1', '2', '3', '1']
+    assert segments[0].plain_source == 'Hello world'
+    assert segments[0].status == 'translated'
+    assert segments[2].locked
+
+    doc = document.open_document(XLIFF2_FILE)
+    assert doc.format == XLIFF2
+    segments = list(doc)
+    assert [s.id for s in segments] == ['s1', 'u1_2', 'u2', 's3']
+    assert [s.locked for s in segments] == [False, False, True, False]
+    assert segments[0].plain_target == 'Bonjour le monde.'
+    assert segments[0].srclang == 'en'
+    assert segments[0].tgtlang == 'fr'
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+import subprocess
+import sys
+
+import pytest
+
+import translator_toolkit
+from translator_toolkit.sdlxliff import Sdlxliff
+from translator_toolkit.error import TranslatorToolkitError
+
+HEAVY_MODULES = ['lxml', 'regex', 'translator_toolkit.sdlxliff', 'translator_toolkit.mxliff']
+
+
+def run_python(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run([sys.executable, *args], capture_output=True, text=True, check=True)
+
+
+def test_lazy_attributes():
+    assert translator_toolkit.Sdlxliff is Sdlxliff
+    assert translator_toolkit.TranslatorToolkitError is TranslatorToolkitError
+    assert 'Mxliff' in dir(translator_toolkit)
+    with pytest.raises(AttributeError):
+        translator_toolkit.NoSuchThing
+
+
+def test_import_does_not_load_heavy_modules():
+    code = 'import sys, translator_toolkit; print(" ".join(sorted(sys.modules)))'
+    modules = set(run_python('-c', code).stdout.split())
+    assert not modules.intersection(HEAVY_MODULES)
+
+
+def test_import_trace_has_no_lxml_or_regex():
+    # -X importtime lines: "import time: self [us] | cumulative | imported package"
+    # the trace also lists modules that were imported and later removed from sys.modules, the timings themselves are not checked
+    result = run_python('-X', 'importtime', '-c', 'import translator_toolkit')
+    imported = [line.rsplit('|', 1)[1].strip() for line in result.stderr.splitlines() if line.startswith('import time:') and '|' in line]
+    assert 'translator_toolkit' in imported
+    assert not [name for name in imported if name.split('.')[0] in ('lxml', 'regex')]
+
+
+def test_cli_help_does_not_load_heavy_modules():
+    result = run_python('-X', 'importtime', '-m', 'translator_toolkit', '--help')
+    imported = {line.rsplit('|', 1)[1].strip() for line in result.stderr.splitlines() if line.startswith('import time:') and '|' in line}
+    assert not imported.intersection(HEAVY_MODULES)
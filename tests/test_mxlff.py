@@ -1,6 +1,9 @@
 #!/usr/bin/env python3
 import os
-from translator_toolkit.mxliff import Mxliff
+import pytest
+from lxml import etree
+from translator_toolkit.mxliff import Mxliff, MxliffTransUnit, MxliffContextIndex
+from translator_toolkit.error import TranslatorToolkitError
 from translator_toolkit.util import stringutil
 
 data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
@@ -126,3 +129,78 @@ def test_to_json():
     assert xunit1['target'] == 'EEEE'
     assert xunit1['srclang'] == 'ja'
     assert xunit1['tgtlang'] == 'en'
+
+
+def test_context_type():
+    mxlf = Mxliff.load(os.path.join(data_dir, '01_ja-ja-en-R.mxliff'), fields={'context_groups'})
+    contexts = [c for g in mxlf.files[0].body.gruops for cg in g.context_groups for c in cg.contexts]
+    assert [(c.context_type, c.value) for c in contexts] == [('x-file-part', 'word/document.xml::body')] * 2
+
+
+def test_load_fields():
+    file = os.path.join(data_dir, '01_ja-ja-en-R.mxliff')
+    mxlf = Mxliff.load(file, fields={'id', 'target', 'm_confirmed'})
+    assert mxlf.source_language == 'ja'
+
+    mgroup1 = mxlf.files[0].body.gruops[1]
+    assert mgroup1.id == '1'
+    assert mgroup1.context_groups == []
+
+    tu = mgroup1.trans_units[0]
+    assert tu.id == '1'
+    assert tu.target == 'EEEE'
+    assert tu.m_confirmed == '0'
+    assert tu.source == ''
+    assert tu.m_score == 0.0
+    assert not tu.m_locked
+    assert tu.m_created_at == stringutil.unixtime_to_datetime('0')
+    assert tu.alt_trans_units == []
+
+    mxlf = Mxliff.load(file, fields={'alt_trans_units', 'context_groups'})
+    mgroup0 = mxlf.files[0].body.gruops[0]
+    assert [c.value for c in mgroup0.context_groups[0].contexts] == ['word/document.xml::body']
+    assert mgroup0.trans_units[0].target == ''
+    assert [a.target for a in mgroup0.trans_units[0].alt_trans_units] == ['CCCC', '']
+
+    with pytest.raises(TranslatorToolkitError):
+        Mxliff.load(file, fields={'id', 'unknown'})
+
+
+def test_context_index():
+    mxlf = Mxliff.load(os.path.join(data_dir, '01_ja-ja-en-R.mxliff'))
+    index = mxlf.get_context_index()
+    assert mxlf.get_context_index() is index
+    assert index.get('1').source == 'DDDD'
+    assert index.get('9') is None
+    assert index.get_group('1').id == '1'
+    assert index.get_previous('0') is None
+    assert index.get_next('0').id == '1'
+    assert index.get_previous('1').id == '0'
+    assert index.get_next('1') is None
+    assert [[tu.id for tu in units] for units in index.get_neighbours('0', 2, 2)] == [[], ['1']]
+    assert [tu.id for tu in index.get_paragraph('1')] == ['0', '1']
+    assert index.get_contexts('1') == {'x-file-part': 'word/document.xml::body'}
+    with pytest.raises(TranslatorToolkitError):
+        index.get_contexts('9')
+
+
+def test_context_index_duplicate_ids(tmp_path):
+    file = tmp_path / 'duplicate.mxliff'
+    file.write_text(
+        '<xliff xmlns="urn:oasis:names:tc:xliff:document:1.2" version="1.2"><file><body>'
+        '<group id="0"><trans-unit id="0"><source>A</source></trans-unit></group>'
+        '<group id="1"><trans-unit id="0"><source>B</source></trans-unit></group>'
+        '</body></file></xliff>', encoding='utf-8')
+    mxlf = Mxliff.load(str(file))
+    index = mxlf.get_context_index()
+    assert index.get('0').source == 'B'
+    assert index.get_group('0').id == '1'
+    assert [tu.source for tu in index.trans_units] == ['A', 'B']
+    assert MxliffContextIndex.from_files(mxlf.files).get('0').source == 'B'
+
+
+def test_trans_unit_first_children():
+    tu = MxliffTransUnit.from_element(etree.fromstring(
+        '<trans-unit xmlns="urn:oasis:names:tc:xliff:document:1.2" id="0">'
+        '<source>A</source><target>B</target><source>C</source><target>D</target></trans-unit>'))
+    assert (tu.source, tu.target) == ('A', 'B')
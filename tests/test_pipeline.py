@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+import os
+
+import pytest
+
+from translator_toolkit import pipeline
+from translator_toolkit import segment as segmentlib
+from translator_toolkit.writeback import TargetUpdate
+from translator_toolkit.error import TranslatorToolkitError
+
+data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+SDLXLIFF_FILE = os.path.join(data_dir, 'merged.docx.sdlxliff')
+MXLIFF_FILE = os.path.join(data_dir, '01_ja-ja-en-R.mxliff')
+XLIFF_FILE = os.path.join(data_dir, 'sample.xlf')
+
+
+def mark_target(segment):
+    return f'[{segment.id}]'
+
+
+def confirm(segment):
+    return TargetUpdate(segment.target, 'Translated') if segment.target else None
+
+
+def keep(segment):
+    return segment.target
+
+
+def mark_second(segment):
+    return '[2]' if segment.id == '2' else None
+
+
+def get_segments(source_file):
+    return [(s.id, s.source, s.target) for s in segmentlib.stream_segments(source_file)]
+
+
+@pytest.mark.parametrize('source_file', [SDLXLIFF_FILE, MXLIFF_FILE])
+@pytest.mark.parametrize('max_workers, batch_size', [(1, 1), (1, 500), (2, 1)])
+def test_transform(tmp_path, source_file, max_workers, batch_size):
+    output_file = str(tmp_path / os.path.basename(source_file))
+    before = get_segments(source_file)
+    count = pipeline.transform(source_file, mark_target, output_file, max_workers=max_workers, batch_size=batch_size, max_pending=1)
+    after = get_segments(output_file)
+    assert count == len(before)
+    assert after == [(id_, source, f'[{id_}]') for id_, source, _ in before]
+
+
+def test_transform_unchanged(tmp_path):
+    output_file = str(tmp_path / 'out.sdlxliff')
+    assert pipeline.transform(SDLXLIFF_FILE, keep, output_file, max_workers=1) == 0
+    assert get_segments(output_file) == get_segments(SDLXLIFF_FILE)
+
+
+@pytest.mark.parametrize('max_workers', [1, 2])
+def test_transform_char_refs(tmp_path, max_workers):
+    source_file = tmp_path / 'refs.docx.sdlxliff'
+    with open(SDLXLIFF_FILE, 'rb') as f:
+        source_file.write_bytes(f.read().replace(b'mid="4_x0020_a">Combine', b'mid="4_x0020_a">A&#xA0;B Combine'))
+    source_file = str(source_file)
+    assert pipeline.transform(source_file, mark_second, max_workers=max_workers) == 1
+    segments = {s.id: s.target for s in segmentlib.stream_segments(source_file)}
+    assert segments['2'] == '[2]'
+    assert segments['4 a'].startswith('A\xa0B Combine')
+
+
+def test_transform_status(tmp_path):
+    output_file = str(tmp_path / 'out.mxliff')
+    count = pipeline.transform(MXLIFF_FILE, confirm, output_file, max_workers=1)
+    segments = list(segmentlib.stream_segments(output_file))
+    assert count == sum(1 for s in segments if s.target)
+    assert get_segments(output_file) == get_segments(MXLIFF_FILE)
+
+
+def test_transform_unsupported(tmp_path):
+    with pytest.raises(TranslatorToolkitError):
+        pipeline.transform(XLIFF_FILE, mark_target, str(tmp_path / 'out.xlf'))
+    with pytest.raises(TranslatorToolkitError):
+        pipeline.transform(SDLXLIFF_FILE, mark_target, str(tmp_path / 'out.sdlxliff'), batch_size=0)
+    assert not os.listdir(tmp_path)
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+import io
+import os
+import json
+
+from translator_toolkit import qa
+from translator_toolkit.segment import Segment, SDLXLIFF, MXLIFF
+
+data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+
+def create_segment(id_, source, target, format_=SDLXLIFF, locked=False, edited=False):
+    return Segment(format_, 'test.sdlxliff', id_, source, target, 'ja-JP', 'en-US', 'Translated', 0.0, locked, edited)
+
+
+def test_checks():
+    segments = [
+        create_segment('1', 'ビデオ', ''),
+        create_segment('2', 'Word', 'Word'),
+        create_segment('3', '<g id="1">表紙</g>と<x id="2"/>', '<g id="1">Cover</g> and'),
+        create_segment('4', '１０個と2.5', '10 and 3'),
+        create_segment('5', '追加', 'Add  it'),
+        create_segment('6', 'ビデオを使うと、伝えたい内容を明確に表現できます。', 'X'),
+        create_segment('7', '{1>AAAA<1}', '{1>BBBB', format_=MXLIFF, locked=True, edited=True),
+        create_segment('8', '追加', 'Insert'),
+    ]
+    issues = [(i.segment_id, i.check) for i in qa.QaEngine().run(segments)]
+    assert issues == [
+        ('1', 'empty-target'),
+        ('2', 'identical-target'),
+        ('3', 'tag-mismatch'),
+        ('4', 'number-mismatch'),
+        ('5', 'double-space'),
+        ('6', 'length-ratio'),
+        ('7', 'tag-mismatch'),
+        ('7', 'locked-edited'),
+        ('5', 'inconsistent-translation'),
+        ('8', 'inconsistent-translation'),
+    ]
+
+
+def test_run_files():
+    files = [os.path.join(data_dir, 'merged.docx.sdlxliff'), os.path.join(data_dir, '01_ja-ja-en-R.mxliff')]
+    issues = list(qa.QaEngine().run_files(files, max_workers=2))
+    assert [(i.segment_id, i.check) for i in issues] == [('1', 'locked-edited')]
+    assert issues[0].source_file == files[1]
+
+    engine = qa.QaEngine([qa.InconsistentTranslationCheck()])
+    assert list(engine.run_files(files * 2, max_workers=2)) == []
+
+
+def test_write_report():
+    issues = [qa.QaIssue('a.sdlxliff', '1', 'empty-target', 'target is empty')]
+    out = io.StringIO()
+    assert qa.write_report(iter(issues), out) == 1
+    assert out.getvalue().splitlines() == ['source_file,segment_id,check,message', 'a.sdlxliff,1,empty-target,target is empty']
+    out = io.StringIO()
+    qa.write_report(issues, out, format_='jsonl')
+    assert json.loads(out.getvalue()) == issues[0].to_json()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+import os
+
+import pytest
+from lxml import etree
+
+from translator_toolkit import repetition, writeback
+from translator_toolkit import segment as segmentlib
+from translator_toolkit.segment import Segment, SDLXLIFF, MXLIFF
+from translator_toolkit.writeback import TargetUpdate, write_targets
+from translator_toolkit.error import TranslatorToolkitError
+
+data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+SDLXLIFF_FILE = os.path.join(data_dir, 'merged.docx.sdlxliff')
+MXLIFF_FILE = os.path.join(data_dir, '01_ja-ja-en-R.mxliff')
+
+
+def create_segment(id_, source, target='', status='', format_=SDLXLIFF, locked=False):
+    return Segment(format_, 'a.sdlxliff', id_, source, target, 'en', 'ja', status, 0.0, locked, False)
+
+
+def get_segments(source_file):
+    return {s.id: s for s in segmentlib.stream_segments(source_file)}
+
+
+def test_normalize_source():
+    segment = create_segment('1', '<g id="1">Hello</g>  world &amp; <x id="2"/>')
+    assert repetition.normalize_source(segment) == 'Hello world &'
+    assert repetition.normalize_source(segment, repetition.PLACEHOLDER_TAGS) == '\ufffcHello\ufffc world & \ufffc'
+    segment = create_segment('1', '{1>Hello<1} world', format_=MXLIFF)
+    assert repetition.normalize_source(segment) == 'Hello world'
+    with pytest.raises(TranslatorToolkitError):
+        repetition.normalize_source(segment, 'lower')
+
+
+def test_repetition_index():
+    index = repetition.RepetitionIndex()
+    index.add_segments([
+        create_segment('1', '<g id="1">Hello</g> world', 'こんにちは', 'Translated'),
+        create_segment('2', 'Hello world'),
+        create_segment('3', 'Hello  world', locked=True),
+        create_segment('4', '<g id="1">Hello</g> world', 'Draft target', 'Draft'),
+        create_segment('5', 'Goodbye'),
+        create_segment('6', ' '),
+    ])
+    assert list(index.get_repetitions()) == [[('a.sdlxliff', '1'), ('a.sdlxliff', '2'), ('a.sdlxliff', '3'), ('a.sdlxliff', '4')]]
+    assert index.repeated_count == 3
+    propagations = index.get_propagations()
+    # '2' differs in tags and '3' is locked
+    assert list(propagations) == ['a.sdlxliff']
+    assert {k: (v.target, v.status) for k, v in propagations['a.sdlxliff'].items()} == {'4': ('こんにちは', 'Translated')}
+
+    index = repetition.RepetitionIndex(repetition.PLACEHOLDER_TAGS)
+    index.add_segments([create_segment('1', '<g id="1">Hello</g> world'), create_segment('2', 'Hello world')])
+    assert list(index.get_repetitions()) == []
+
+
+def test_write_targets(tmp_path):
+    output_file = str(tmp_path / 'out.sdlxliff')
+    updates = {'17': TargetUpdate('', 'Draft'), '4 a': TargetUpdate('<g id="1">New</g> &amp; target', None)}
+    assert write_targets(SDLXLIFF_FILE, updates, output_file) == 2
+    original = get_segments(SDLXLIFF_FILE)
+    segments = get_segments(output_file)
+    assert segments['17'].target == ''
+    assert segments['17'].status == 'Draft'
+    assert segments['4 a'].target == '<g id="1">New</g> &amp; target'
+    assert segments['4 a'].status == 'Translated'
+    assert [(s.id, s.target) for s in segments.values() if s.id not in updates] == [(s.id, s.target) for s in original.values() if s.id not in updates]
+
+    output_file = str(tmp_path / 'out.mxliff')
+    assert write_targets(MXLIFF_FILE, {'1': TargetUpdate('ZZZZ', '2')}, output_file) == 1
+    segments = get_segments(output_file)
+    assert [(s.id, s.target, s.status) for s in segments.values()] == [('0', 'BBBB', '2'), ('1', 'ZZZZ', '2')]
+
+    with pytest.raises(TranslatorToolkitError):
+        write_targets(SDLXLIFF_FILE, {'1': TargetUpdate('<g>')}, output_file)
+    with pytest.raises(TranslatorToolkitError):
+        write_targets(os.path.join(data_dir, 'sample.xlf'), {}, output_file)
+
+
+def test_propagate(tmp_path):
+    source_file = str(tmp_path / 'merged.docx.sdlxliff')
+    write_targets(SDLXLIFF_FILE, {'17': TargetUpdate('', 'Draft'), '19': TargetUpdate('x', 'Draft')}, source_file)
+
+    index = repetition.find_repetitions([source_file])
+    propagations = index.get_propagations()
+    assert sorted(propagations[source_file]) == ['17', '19']
+
+    output_dir = str(tmp_path / 'out')
+    assert index.propagate(output_dir) == 2
+    segments = get_segments(os.path.join(output_dir, 'merged.docx.sdlxliff'))
+    original = get_segments(SDLXLIFF_FILE)
+    assert segments['17'].target == original['2'].target
+    assert segments['19'].target == original['4 a'].target
+    assert segments['19'].status == 'Translated'
+
+    with pytest.raises(TranslatorToolkitError):
+        index.propagate()
+    with pytest.raises(TranslatorToolkitError):
+        index.propagate(output_dir, in_place=True)
+    assert index.propagate(in_place=True) == 2
+    assert get_segments(source_file)['17'].target == original['2'].target
+    assert repetition.find_repetitions([source_file]).get_propagations() == {}
+
+
+def test_write_targets_char_refs(tmp_path):
+    source_file = tmp_path / 'refs.docx.sdlxliff'
+    with open(SDLXLIFF_FILE, 'rb') as f:
+        source_file.write_bytes(f.read().replace(b'mid="4_x0020_b_x0020_b_x0020_a">Click', b'mid="4_x0020_b_x0020_b_x0020_a">A&#xA0;B Click'))
+    source_file = str(source_file)
+    # untouched segments keep their character references through write_targets and propagate
+    write_targets(source_file, {'17': TargetUpdate('', 'Draft'), '19': TargetUpdate('x', 'Draft')})
+    assert get_segments(source_file)['4 b b a'].target.startswith('A\xa0B Click')
+
+    index = repetition.find_repetitions([source_file])
+    assert index.propagate(in_place=True) == 2
+    segments = get_segments(source_file)
+    assert segments['4 b b a'].target.startswith('A\xa0B Click')
+    assert segments['17'].target == get_segments(SDLXLIFF_FILE)['2'].target
+
+
+def test_propagate_same_names(tmp_path):
+    source_files = []
+    for name in ['a', 'b']:
+        (tmp_path / name).mkdir()
+        source_files.append(str(tmp_path / name / 'merged.docx.sdlxliff'))
+        write_targets(SDLXLIFF_FILE, {'17': TargetUpdate('', 'Draft')}, source_files[-1])
+    index = repetition.find_repetitions(source_files)
+    output_dir = tmp_path / 'out'
+    assert index.propagate(str(output_dir)) == 2
+    # the output keeps the directories below the common root
+    for name in ['a', 'b']:
+        assert get_segments(str(output_dir / name / 'merged.docx.sdlxliff'))['17'].target == get_segments(SDLXLIFF_FILE)['2'].target
+
+
+def test_update_unit_first_children():
+    tu = etree.fromstring(
+        '<trans-unit xmlns="urn:oasis:names:tc:xliff:document:1.2" id="0">'
+        '<source>A</source><target>B</target><source>C</source><target>D</target></trans-unit>')
+    assert writeback.update_mxliff_unit(tu, {'0': TargetUpdate('Z')}) == 1
+    assert [e.text for e in tu] == ['A', 'Z', 'C', 'D']
+    tu = etree.fromstring(
+        '<trans-unit xmlns="urn:oasis:names:tc:xliff:document:1.2" id="0"><source>A</source><source>C</source></trans-unit>')
+    writeback.update_mxliff_unit(tu, {'0': TargetUpdate('Z')})
+    assert [e.text for e in tu] == ['A', 'Z', 'C']
+    tu = etree.fromstring(
+        '<trans-unit xmlns="urn:oasis:names:tc:xliff:document:1.2">'
+        '<seg-source><mrk mtype="seg" mid="1">A</mrk></seg-source><target><mrk mtype="seg" mid="1">B</mrk></target>'
+        '<target><mrk mtype="seg" mid="1">D</mrk></target></trans-unit>')
+    assert writeback.update_sdlxliff_unit(tu, {'1': TargetUpdate('Z')}) == 1
+    assert [''.join(e.itertext()) for e in tu] == ['A', 'Z', 'D']
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+import os
+import zipfile
+
+import pytest
+
+from translator_toolkit.sdlpackage import SdlPackage
+from translator_toolkit.error import TranslatorToolkitError
+
+data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+
+def create_package(tmp_path) -> str:
+    package_file = str(tmp_path / 'project.sdlppx')
+    with zipfile.ZipFile(package_file, 'w') as zf:
+        zf.writestr('project.sdlproj', '<Project/>')
+        zf.writestr('ja-JP/test1.docx', b'')
+        zf.write(os.path.join(data_dir, 'merged.docx.sdlxliff'), 'en-US/merged.docx.sdlxliff')
+        zf.write(os.path.join(data_dir, 'merged.docx.sdlxliff'), 'en-US/sub/merged2.docx.sdlxliff')
+        zf.write(os.path.join(data_dir, 'merged.docx.sdlxliff'), 'fr-FR/merged.docx.sdlxliff')
+    return package_file
+
+
+def test_open(tmp_path):
+    package = SdlPackage.open(create_package(tmp_path))
+    assert package.languages == ['en-US', 'fr-FR']
+    assert package.files['en-US'] == ['en-US/merged.docx.sdlxliff', 'en-US/sub/merged2.docx.sdlxliff']
+    assert package.files['fr-FR'] == ['fr-FR/merged.docx.sdlxliff']
+    assert not package.is_loaded('fr-FR/merged.docx.sdlxliff')
+
+    sxlf = package.get('fr-FR/merged.docx.sdlxliff')
+    assert package.is_loaded('fr-FR/merged.docx.sdlxliff')
+    assert not package.is_loaded('en-US/merged.docx.sdlxliff')
+    assert sxlf.source_file == 'fr-FR/merged.docx.sdlxliff'
+    assert sxlf.source_language == 'ja-JP'
+    assert len(list(sxlf.get_all_segment_pairs())) == 13
+    assert package.get('fr-FR/merged.docx.sdlxliff') is sxlf
+
+    with pytest.raises(TranslatorToolkitError):
+        package.get('de-DE/merged.docx.sdlxliff')
+
+
+def test_load_all(tmp_path):
+    package = SdlPackage.open(create_package(tmp_path), lazy=False, max_workers=2)
+    assert all(package.is_loaded(m) for m in package.members)
+    docs = [d for d in package.get_documents('en-US')]
+    assert len(docs) == 2
+    expected = [(sp.mid, sp.source, sp.target) for sp in docs[0].get_all_segment_pairs()]
+    assert [(sp.mid, sp.source, sp.target) for sp in docs[1].get_all_segment_pairs()] == expected
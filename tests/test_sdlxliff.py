@@ -1,6 +1,10 @@
 #!/usr/bin/env python3
 import os
-from translator_toolkit.sdlxliff import Sdlxliff
+import sys
+import pytest
+from lxml import etree
+from translator_toolkit.sdlxliff import Sdlxliff, SdlxliffTransUnit
+from translator_toolkit.error import TranslatorToolkitError
 from datetime import datetime
 
 data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
@@ -374,3 +378,44 @@ def test_to_json():
                                  'tgtlang': 'en-us',
                                  'properties': None},
                                 ]
+
+
+def test_load_fields():
+    file = os.path.join(data_dir, 'merged.docx.sdlxliff')
+    sxlf = Sdlxliff.load(file, fields={'mid', 'target'})
+    assert sxlf.doc_info.comment_definitions == []
+
+    tu = sxlf.files[0].body.trans_units[0]
+    assert tu.id == ''
+    assert tu.segment_definitions == []
+    assert [(x.mid, x.source) for x in tu.segment_pairs] == [('1', ''), ('2', ''), ('3', '')]
+    assert tu.segment_pairs[1].target == 'Clicking Online Video will allow you to paste the video you want to add in the corresponding embed code.'
+
+    sxlf = Sdlxliff.load(file, fields={'id', 'segment_definitions'})
+    tu = sxlf.files[1].body.trans_units[0]
+    assert tu.id == 'c70a0969-f44e-4873-a2bc-7c370dc8d495'
+    assert tu.segment_pairs == []
+    assert [x.id for x in tu.segment_definitions] == ['16', '17', '18']
+
+    with pytest.raises(TranslatorToolkitError):
+        Sdlxliff.load(file, fields={'unknown'})
+
+
+def test_load_interned():
+    file = os.path.join(data_dir, 'merged.docx.sdlxliff')
+    sxlf = Sdlxliff.load(file)
+    seg_defs = [seg_def for file in sxlf.files for tu in file.body.trans_units for seg_def in tu.segment_definitions if seg_def.conf]
+    assert len(seg_defs) > 1
+    assert all(seg_def.conf is sys.intern(seg_def.conf) for seg_def in seg_defs)
+    assert sxlf.files[0].target_language is sxlf.files[1].target_language
+
+
+def test_trans_unit_first_children():
+    tu = SdlxliffTransUnit.from_element(etree.fromstring(
+        '<trans-unit xmlns="urn:oasis:names:tc:xliff:document:1.2" xmlns:sdl="http://sdl.com/FileTypes/SdlXliff/1.0" id="1">'
+        '<seg-source><mrk mtype="seg" mid="1">A</mrk></seg-source><target><mrk mtype="seg" mid="1">B</mrk></target>'
+        '<seg-source><mrk mtype="seg" mid="1">C</mrk></seg-source><target><mrk mtype="seg" mid="1">D</mrk></target>'
+        '<sdl:seg-defs><sdl:seg id="1" conf="Translated"/></sdl:seg-defs><sdl:seg-defs><sdl:seg id="1" conf="Draft"/></sdl:seg-defs>'
+        '</trans-unit>'))
+    assert [(x.source, x.target) for x in tu.segment_pairs] == [('A', 'B')]
+    assert [x.conf for x in tu.segment_definitions] == ['Translated']
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+import os
+
+from translator_toolkit import search
+from translator_toolkit.search import SearchIndex, SearchHit
+
+data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+sdlxliff_file = os.path.join(data_dir, 'merged.docx.sdlxliff')
+mxliff_file = os.path.join(data_dir, '01_ja-ja-en-R.mxliff')
+
+
+def test_tokenize():
+    assert search.tokenize('Click <Insert>, then Ｗｏｒｄ') == ['click', 'insert', 'then', 'word']
+    assert search.tokenize('ビデオを使う Word版') == ['ビデ', 'デオ', 'オを', 'を使', '使う', 'word', '版']
+
+
+def test_search(tmp_path):
+    index = SearchIndex()
+    index.add_file(sdlxliff_file)
+    index.add_file(mxliff_file)
+
+    assert index.search('ビデオ') == [
+        SearchHit(sdlxliff_file, '1'), SearchHit(sdlxliff_file, '2'), SearchHit(sdlxliff_file, '3'),
+        SearchHit(sdlxliff_file, '16'), SearchHit(sdlxliff_file, '17'), SearchHit(sdlxliff_file, '18')
+    ]
+    assert index.search('ビデオ -オンライン') == [SearchHit(sdlxliff_file, '1'), SearchHit(sdlxliff_file, '16')]
+    assert index.search('"online video"', field='target') == [SearchHit(sdlxliff_file, '2'), SearchHit(sdlxliff_file, '17')]
+    assert index.search('"video online"', field='target') == []
+    assert index.search('sidebars OR eeee', field='target') == [SearchHit(sdlxliff_file, '4 b a'), SearchHit(sdlxliff_file, '20'),
+                                                                SearchHit(mxliff_file, '1')]
+    assert index.search('articulate convey', field='target') == [SearchHit(sdlxliff_file, '1'), SearchHit(sdlxliff_file, '16')]
+    assert index.search('挿') == [SearchHit(sdlxliff_file, '4 b b a'), SearchHit(sdlxliff_file, '21')]
+
+    index_file = str(tmp_path / 'index.json.gz')
+    index.save(index_file)
+    loaded = SearchIndex.load(index_file)
+    assert loaded.search('"online video"', field='target') == index.search('"online video"', field='target')
+    assert loaded.postings == index.postings
+
+    assert loaded.remove_file(sdlxliff_file)
+    assert sdlxliff_file not in loaded
+    assert loaded.search('ビデオ') == []
+    assert loaded.search('dddd') == [SearchHit(mxliff_file, '1')]
+    loaded.add_file(sdlxliff_file)
+    assert loaded.search('sidebars', field='target') == [SearchHit(sdlxliff_file, '4 b a'), SearchHit(sdlxliff_file, '20')]
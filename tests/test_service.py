@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+import json
+import os
+import signal
+import stat
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from translator_toolkit import service
+from translator_toolkit.error import TranslatorToolkitError
+
+data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+SDLXLIFF_FILE = os.path.join(data_dir, 'merged.docx.sdlxliff')
+MXLIFF_FILE = os.path.join(data_dir, '01_ja-ja-en-R.mxliff')
+
+
+def test_get_percentile():
+    assert service.get_percentile([], 99) == 0.0
+    assert service.get_percentile([float(i) for i in range(100, 0, -1)], 50) == 51.0
+    assert service.get_percentile([1.0, 2.0], 99) == 2.0
+
+
+def test_operations():
+    segments = service.get_segments(MXLIFF_FILE)
+    assert segments['columns'] == service.SEGMENT_COLUMNS
+    assert segments['rows'][1] == ['1', 'DDDD', 'EEEE', '0', 90.9, True]
+    assert service.get_stats(SDLXLIFF_FILE)['segments'] == 13
+    assert len(service.get_comments(SDLXLIFF_FILE)) == 9
+
+
+def test_service(tmp_path):
+    socket_path = str(tmp_path / 'service.sock')
+    with service.ParsingService(max_workers=2) as svc:
+        assert svc.worker_pids
+        futures = [svc.submit('segments', f) for f in [SDLXLIFF_FILE, MXLIFF_FILE] * 3]
+        assert [len(f.result()['rows']) for f in futures] == [13, 2] * 3
+        with pytest.raises(TranslatorToolkitError):
+            svc.submit('load', SDLXLIFF_FILE)
+
+        svc.serve(socket_path)
+        assert stat.S_IMODE(os.stat(socket_path).st_mode) == service.SOCKET_MODE
+        with service.ServiceClient(socket_path) as client:
+            assert client.request('stats', MXLIFF_FILE, words=True)['words'] == 2
+            assert client.request('segments', SDLXLIFF_FILE, backend='expat')['rows'] == svc.run('segments', SDLXLIFF_FILE)['rows']
+            with pytest.raises(TranslatorToolkitError, match='FileNotFoundError'):
+                client.request('segments', str(tmp_path / 'missing.sdlxliff'))
+            with pytest.raises(TranslatorToolkitError, match='unknown operation'):
+                client.request('load', SDLXLIFF_FILE)
+            metrics = client.get_metrics()
+        assert metrics['submitted'] == 10
+        assert metrics['completed'] == 9
+        assert metrics['failed'] == 1
+        assert metrics['queue_depth'] == 0
+        assert metrics['max_queue_depth'] >= 1
+        assert metrics['restarts'] == 0
+        assert 0 < metrics['latency_ms']['p50'] <= metrics['latency_ms']['p99'] <= metrics['latency_ms']['max']
+    assert not os.path.exists(socket_path)
+
+
+def test_service_restart():
+    with service.ParsingService(max_workers=1) as svc:
+        pid = svc.worker_pids[0]
+        os.kill(pid, signal.SIGKILL)
+        # the job either fails with the dying pool or is the first one submitted to the restarted pool
+        try:
+            svc.run('stats', MXLIFF_FILE)
+        except BrokenProcessPool:
+            pass
+        assert svc.run('stats', MXLIFF_FILE)['segments'] == 2
+        assert svc.metrics.to_json()['restarts'] == 1
+        assert svc.worker_pids != [pid]
+
+
+def test_service_malformed_frames(tmp_path):
+    socket_path = str(tmp_path / 'service.sock')
+    with service.ParsingService(max_workers=1) as svc:
+        svc.serve(socket_path)
+        with service.ServiceClient(socket_path) as client:
+            for data in [b'{"op": ', b'\xff', b'[1, 2]']:
+                client.sock.sendall(service.FRAME_HEADER.pack(len(data)) + data)
+                response = json.loads(service.read_frame(client.sock))
+                assert response['id'] is None
+                assert not response['ok']
+            # the connection is still usable after malformed requests
+            assert client.request('stats', MXLIFF_FILE)['segments'] == 2
+            client.sock.sendall(service.FRAME_HEADER.pack(service.MAX_FRAME_SIZE + 1))
+            response = json.loads(service.read_frame(client.sock))
+            assert 'frame too large' in response['error']
+            assert service.read_frame(client.sock) is None
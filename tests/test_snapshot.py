@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+import os
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from translator_toolkit import snapshot
+from translator_toolkit.snapshot import SdlxliffSnapshot, MxliffSnapshot
+from translator_toolkit.sdlxliff import Sdlxliff
+from translator_toolkit.mxliff import Mxliff
+from translator_toolkit.error import TranslatorToolkitError
+
+data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+
+def test_sdlxliff_snapshot():
+    doc = Sdlxliff.load(os.path.join(data_dir, 'merged.docx.sdlxliff'))
+    snap = snapshot.snapshot(doc)
+    assert isinstance(snap, SdlxliffSnapshot)
+    assert snap.source_language == 'ja-JP'
+    assert [sp.mid for sp in snap.get_all_segment_pairs()] == [sp.mid for sp in doc.get_all_segment_pairs()]
+
+    pair = snap.get_segment_pair('4 a')
+    assert pair.target == doc.files[0].body.trans_units[1].segment_pairs[0].target
+    assert pair.definition.conf == 'Translated'
+    assert pair.definition.conf is snap.get_segment_pair('1').definition.conf
+    assert snap.get_segment_pair('missing') is None
+
+    cid = doc.doc_info.comment_definitions[0].id
+    assert [c.text for c in snap.get_comments(cid)] == [c.text for c in doc.doc_info.get_comments(cid)]
+    assert snap.get_comments('missing') == ()
+
+    with pytest.raises(AttributeError):
+        snap.files[0].original = 'x'
+    with pytest.raises(TypeError):
+        snap.segment_pairs['1'] = None
+
+    assert pickle.loads(pickle.dumps(snap)) == snap
+
+
+def test_mxliff_snapshot():
+    doc = Mxliff.load(os.path.join(data_dir, '01_ja-ja-en-R.mxliff'))
+    snap = MxliffSnapshot.from_document(doc)
+    assert snap.level == 2
+    assert snap.target_language == 'en'
+    tu = snap.get_trans_unit('1')
+    assert (tu.source, tu.target, tu.m_score, tu.m_locked) == ('DDDD', 'EEEE', 90.9, True)
+    assert [a.target for a in tu.alt_trans_units] == ['FFFF', 'GGGG']
+    assert [t.id for t in snap.get_all_trans_units()] == ['0', '1']
+    assert isinstance(snap.files[0].groups, tuple)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(lambda id_: snap.get_trans_unit(id_).target, ['0', '1'] * 50))
+    assert results == ['BBBB', 'EEEE'] * 50
+
+    assert pickle.loads(pickle.dumps(snap)) == snap
+
+    with pytest.raises(TranslatorToolkitError):
+        snapshot.snapshot(object())
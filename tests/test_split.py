@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+import os
+
+import pytest
+
+from translator_toolkit import split
+from translator_toolkit import segment as segmentlib
+from translator_toolkit.sdlxliff import Sdlxliff
+from translator_toolkit.mxliff import Mxliff
+from translator_toolkit.error import TranslatorToolkitError
+
+data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+SDLXLIFF_FILE = os.path.join(data_dir, 'merged.docx.sdlxliff')
+MXLIFF_FILE = os.path.join(data_dir, '01_ja-ja-en-R.mxliff')
+
+
+def get_segments(source_file):
+    return [(s.id, s.source, s.target, s.status, s.locked) for s in segmentlib.stream_segments(source_file)]
+
+
+def test_get_chunk_file():
+    assert split.get_chunk_file('/a/b.docx.sdlxliff', 0) == '/a/b.docx.part001.sdlxliff'
+    assert split.get_chunk_file('/a/b.mxliff', 11, '/c') == '/c/b.part012.mxliff'
+    assert split.sort_chunk_files(['b.part010.mxliff', 'b.part002.mxliff']) == ['b.part002.mxliff', 'b.part010.mxliff']
+    with pytest.raises(TranslatorToolkitError):
+        split.sort_chunk_files(['b.mxliff'])
+
+
+@pytest.mark.parametrize('by, size, count', [('units', 1, 4), ('units', 100, 1), ('words', 1, 4), ('files', 0, 2)])
+def test_split_and_merge_sdlxliff(tmp_path, by, size, count):
+    chunk_files = split.split(SDLXLIFF_FILE, by=by, size=size, output_dir=str(tmp_path))
+    assert len(chunk_files) == count
+    assert split.find_chunk_files(SDLXLIFF_FILE, str(tmp_path)) == chunk_files
+
+    segments = []
+    for chunk_file in chunk_files:
+        doc = Sdlxliff.load(chunk_file)
+        cids = {cid for sp in doc.get_all_segment_pairs() for cid in sp.get_comment_ids()}
+        assert cids <= {c.id for c in doc.doc_info.comment_definitions}
+        segments.extend(get_segments(chunk_file))
+    assert segments == get_segments(SDLXLIFF_FILE)
+
+    output_file = str(tmp_path / 'merged.sdlxliff')
+    assert split.merge(chunk_files, output_file) == 4
+    assert get_segments(output_file) == get_segments(SDLXLIFF_FILE)
+    merged = Sdlxliff.load(output_file)
+    original = Sdlxliff.load(SDLXLIFF_FILE)
+    assert [f.original for f in merged.files] == [f.original for f in original.files]
+    assert {c.id for c in merged.doc_info.comment_definitions} == {c.id for c in original.doc_info.comment_definitions}
+
+
+def test_split_file_level_comments(tmp_path):
+    chunk_files = split.split(SDLXLIFF_FILE, by='units', size=1, output_dir=str(tmp_path))
+    # the second chunk only holds units of test1.docx, whose header references a comment
+    doc = Sdlxliff.load(chunk_files[1])
+    assert [c.id for c in doc.doc_info.comment_definitions] == ['554c69e6-bedc-4ed3-90c0-c66c0562c346']
+
+
+def test_split_and_merge_char_refs(tmp_path):
+    source_file = tmp_path / 'refs.docx.sdlxliff'
+    with open(SDLXLIFF_FILE, 'rb') as f:
+        source_file.write_bytes(f.read().replace(b'<mrk mtype="seg" mid="2">Clicking', b'<mrk mtype="seg" mid="2">A&#xA0;B Clicking'))
+    chunk_files = split.split(str(source_file), by='units', size=1, output_dir=str(tmp_path / 'chunks'))
+    output_file = str(tmp_path / 'merged.sdlxliff')
+    split.merge(chunk_files, output_file)
+    segments = {s.id: s.target for s in segmentlib.stream_segments(output_file)}
+    assert segments['2'].startswith('A\xa0B Clicking')
+
+
+def test_split_and_merge_mxliff(tmp_path):
+    chunk_files = split.split(MXLIFF_FILE, by='units', size=1, output_dir=str(tmp_path))
+    assert len(chunk_files) == 2
+    docs = [Mxliff.load(f) for f in chunk_files]
+    assert [[g.id for g in d.files[0].body.gruops] for d in docs] == [['0'], ['1']]
+    assert all(d.files[0].m_task_id == 'stbZWjwCihfeyJzn_dc5' for d in docs)
+
+    output_file = str(tmp_path / 'merged.mxliff')
+    assert split.merge(split.sort_chunk_files(list(reversed(chunk_files))), output_file) == 2
+    assert get_segments(output_file) == get_segments(MXLIFF_FILE)
+    assert len(Mxliff.load(output_file).files) == 1
+
+
+def test_split_errors(tmp_path):
+    with pytest.raises(TranslatorToolkitError):
+        split.split(SDLXLIFF_FILE, by='pages', output_dir=str(tmp_path))
+    with pytest.raises(TranslatorToolkitError):
+        split.split(SDLXLIFF_FILE, by='units', size=0, output_dir=str(tmp_path))
+    with pytest.raises(TranslatorToolkitError):
+        split.split(os.path.join(data_dir, 'sample.xlf'), output_dir=str(tmp_path))
+    with pytest.raises(TranslatorToolkitError):
+        split.merge([], str(tmp_path / 'out.sdlxliff'))
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+import os
+
+import pytest
+
+from translator_toolkit import stats
+
+data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+SDLXLIFF_FILE = os.path.join(data_dir, 'merged.docx.sdlxliff')
+MXLIFF_FILE = os.path.join(data_dir, '01_ja-ja-en-R.mxliff')
+XLIFF_FILE = os.path.join(data_dir, 'sample.xlf')
+
+
+def test_get_score_band():
+    assert [stats.get_score_band(s) for s in [0.0, 10.0, 50.0, 99.9, 100.0, 101.0]] == ['none', '0-49', '50-74', '95-99', '100', '101']
+
+
+def test_get_stats():
+    file_stats = stats.get_stats(MXLIFF_FILE)
+    assert file_stats.to_json() == {
+        'source_file': MXLIFF_FILE,
+        'segments': 2,
+        'words': 2,
+        'locked': 1,
+        'confirmed': 1,
+        'statuses': {'2': 1, '0': 1},
+        'scores': {'none': 1, '85-94': 1}
+    }
+
+
+@pytest.mark.parametrize('source_file', [SDLXLIFF_FILE, MXLIFF_FILE, XLIFF_FILE])
+def test_scan_stats(source_file):
+    expected = stats.get_stats(source_file).to_json()
+    actual = stats.scan_stats(source_file).to_json()
+    if not source_file.endswith('.xlf'):
+        assert actual['words'] is None
+        expected['words'] = None
+    assert actual == expected
+
+
+def test_iter_files_stats():
+    source_files = [SDLXLIFF_FILE, MXLIFF_FILE]
+    assert [s.to_json() for s in stats.iter_files_stats(source_files, max_workers=2)] == [stats.scan_stats(f).to_json() for f in source_files]
+    assert [s.words for s in stats.iter_files_stats(source_files, words=True)] == [502, 2]
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+import os
+import shutil
+
+import pytest
+
+from translator_toolkit.store import ProjectStore
+from translator_toolkit.sdlxliff import Sdlxliff
+from translator_toolkit.mxliff import Mxliff
+from translator_toolkit.error import TranslatorToolkitError
+
+data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+
+def copy_data(tmp_path) -> list[str]:
+    files = []
+    for name in ['01_ja-ja-en-R.mxliff', 'merged.docx.sdlxliff']:
+        files.append(str(tmp_path / name))
+        shutil.copy(os.path.join(data_dir, name), files[-1])
+    return files
+
+
+def test_add_files(tmp_path):
+    mxliff_file, sdlxliff_file = copy_data(tmp_path)
+    with ProjectStore(str(tmp_path / 'project.db')) as store:
+        assert store.add_files([mxliff_file, sdlxliff_file]) == 2
+        assert store.add_files([mxliff_file, sdlxliff_file]) == 0
+        assert store.get_files() == sorted([mxliff_file, sdlxliff_file])
+        assert store.conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+
+        with open(mxliff_file, 'a', encoding='utf-8') as f:
+            f.write('\n')
+        assert store.add_files([mxliff_file, sdlxliff_file]) == 1
+        assert store.conn.execute('SELECT COUNT(*) FROM segments_fts').fetchone()[0] == 15
+
+        assert store.remove_file(mxliff_file)
+        assert not store.remove_file(mxliff_file)
+        assert mxliff_file not in store
+        assert store.conn.execute('SELECT COUNT(*) FROM segments_fts').fetchone()[0] == 13
+
+        with pytest.raises(TranslatorToolkitError):
+            store.add_file(os.path.join(data_dir, 'sample.xlf'))
+
+
+def test_load_sdlxliff(tmp_path):
+    _, sdlxliff_file = copy_data(tmp_path)
+    expected = Sdlxliff.load(sdlxliff_file)
+    with ProjectStore(str(tmp_path / 'project.db')) as store:
+        store.add_file(sdlxliff_file)
+        doc = store.load(sdlxliff_file)
+    assert isinstance(doc, Sdlxliff)
+    assert doc.to_json() == expected.to_json()
+    assert [(d.id, [(c.user, c.date, c.text) for c in d.comments]) for d in doc.doc_info.comment_definitions] == \
+        [(d.id, [(c.user, c.date, c.text) for c in d.comments]) for d in expected.doc_info.comment_definitions]
+    tus = list(doc.get_all_trans_units())
+    expected_tus = list(expected.get_all_trans_units())
+    assert [[(s.id, s.conf, s.origin, s.percent, s.locked) for s in tu.segment_definitions] for tu in tus] == \
+        [[(s.id, s.conf, s.origin, s.percent, s.locked) for s in tu.segment_definitions] for tu in expected_tus]
+
+
+def test_load_mxliff(tmp_path):
+    mxliff_file, _ = copy_data(tmp_path)
+    expected = Mxliff.load(mxliff_file)
+    with ProjectStore(str(tmp_path / 'project.db')) as store:
+        store.add_document(expected)
+        doc = store.load(mxliff_file)
+        with pytest.raises(TranslatorToolkitError):
+            store.load(str(tmp_path / 'missing.mxliff'))
+    assert isinstance(doc, Mxliff)
+    assert doc.to_json() == expected.to_json()
+    assert (doc.level, doc.version, doc.m_version) == (expected.level, expected.version, expected.m_version)
+    for tu, expected_tu in zip(doc.get_all_trans_units(), expected.get_all_trans_units()):
+        assert vars(tu).keys() == vars(expected_tu).keys()
+        for key, value in vars(expected_tu).items():
+            if key == 'alt_trans_units':
+                assert [vars(a) for a in tu.alt_trans_units] == [vars(a) for a in value]
+            else:
+                assert getattr(tu, key) == value
+    assert [c.context_type for g in doc.files[0].body.gruops for cg in g.context_groups for c in cg.contexts] == \
+        [c.context_type for g in expected.files[0].body.gruops for cg in g.context_groups for c in cg.contexts]
+
+
+def test_search(tmp_path):
+    mxliff_file, sdlxliff_file = copy_data(tmp_path)
+    with ProjectStore(str(tmp_path / 'project.db')) as store:
+        store.add_files([mxliff_file, sdlxliff_file])
+        hits = store.search('DDDD')
+        assert [(path, tu.id, tu.m_score) for path, tu in hits] == [(mxliff_file, '1', 90.9)]
+        assert [tu.id for _, tu in store.search('ee', field='target')] == ['1']
+        expected = [sp.mid for sp in Sdlxliff.load(sdlxliff_file).get_all_segment_pairs() if 'Online Video' in sp.target]
+        assert expected
+        assert [sp.mid for _, sp in store.search('online video', field='target')] == expected
+        with pytest.raises(TranslatorToolkitError):
+            store.search('AAAA', field='note')
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+import os
+
+from translator_toolkit.sdlxliff import Sdlxliff
+from translator_toolkit.segment import Segment, SDLXLIFF
+from translator_toolkit.terminology import AhoCorasick, Term, Termbase, TermMatcher
+
+data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+
+def test_aho_corasick():
+    automaton = AhoCorasick(['he', 'she', 'his', 'hers'])
+    assert sorted(automaton.finditer('ushers')) == [(1, 4, 1), (2, 4, 0), (2, 6, 3)]
+    assert list(AhoCorasick(['ab']).finditer('xyz')) == []
+
+
+def test_match(tmp_path):
+    termbase_file = tmp_path / 'termbase.csv'
+    termbase_file.write_text('ビデオ,video|videos\nオンライン ビデオ,Online Video\nキーワード,search term\nＷＯＲＤ,Word\nword,\n', encoding='utf-8')
+    termbase = Termbase.load_csv(str(termbase_file))
+    assert [(t.source, t.targets) for t in termbase.terms] == [
+        ('ビデオ', ['video', 'videos']), ('オンライン ビデオ', ['Online Video']), ('キーワード', ['search term']), ('ＷＯＲＤ', ['Word']), ('word', [])
+    ]
+
+    matcher = TermMatcher(termbase)
+    sxlf = Sdlxliff.load(os.path.join(data_dir, 'merged.docx.sdlxliff'))
+    hits = [(h.segment_id, h.term.source, h.start, h.end, h.target_found) for h in matcher.match_document(sxlf) if h.segment_id in ('1', '2', '3', '4 a')]
+    assert hits == [
+        ('1', 'ビデオ', 0, 3, True),
+        ('2', 'オンライン ビデオ', 1, 10, True),
+        ('2', 'ビデオ', 7, 10, True),
+        ('2', 'ビデオ', 26, 29, True),
+        ('3', 'キーワード', 0, 5, False),
+        ('3', 'ビデオ', 17, 20, True),
+        ('4 a', 'ＷＯＲＤ', 0, 4, True),
+        ('4 a', 'word', 0, 4, False),
+    ]
+
+    segment = Segment(SDLXLIFF, 'test.sdlxliff', '1', 'Wordpad と swords', 'x', 'ja-JP', 'en-US', '', 0.0, False, False)
+    assert matcher.match(segment) == []
+    assert [h.term.source for h in TermMatcher(termbase, whole_words=False).match(segment)] == ['ＷＯＲＤ', 'word', 'ＷＯＲＤ', 'word']
+
+
+def test_match_offsets():
+    # casefolding and NFKC change the length of the text, offsets still refer to the plain source
+    termbase = Termbase([Term('strasse', ['street']), Term('file', []), Term('i', [])])
+    source = 'Die Straße ﬁle file ﬁ'
+    segment = Segment(SDLXLIFF, 'test.sdlxliff', '1', source, 'The STREET', 'de-DE', 'en-US', '', 0.0, False, False)
+    hits = TermMatcher(termbase).match(segment)
+    assert [(source[h.start:h.end], h.target_found) for h in hits] == [('Straße', True), ('ﬁle', False), ('file', False)]
+    hits = TermMatcher(termbase, whole_words=False).match(segment)
+    assert [source[h.start:h.end] for h in hits] == ['i', 'Straße', 'ﬁ', 'ﬁle', 'i', 'file', 'ﬁ']
+
+
+def test_missing_targets():
+    matcher = TermMatcher(Termbase([Term('表紙', ['cover']), Term('ヘッダー', ['header'])]))
+    segment = Segment(SDLXLIFF, 'test.sdlxliff', '1', '<g id="1">表紙</g>とヘッダー', 'Cover and heading', 'ja-JP', 'en-US', '', 0.0, False, False)
+    assert [(h.term.source, h.target_found) for h in matcher.match(segment)] == [('表紙', True), ('ヘッダー', False)]
+    assert [h.term.source for h in matcher.get_missing_targets([segment])] == ['ヘッダー']
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+import os
+import shutil
+import sqlite3
+import sys
+
+import pytest
+
+from translator_toolkit import watcher
+from translator_toolkit import pipeline
+from translator_toolkit.search import SearchIndex, SearchHit
+from translator_toolkit.store import ProjectStore
+from translator_toolkit.watcher import Change, ADDED, MODIFIED, REMOVED
+
+data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+SDLXLIFF_FILE = os.path.join(data_dir, 'merged.docx.sdlxliff')
+MXLIFF_FILE = os.path.join(data_dir, '01_ja-ja-en-R.mxliff')
+
+INOTIFY_MODES = [False, pytest.param(True, marks=pytest.mark.skipif(not sys.platform.startswith('linux'), reason='inotify is linux only'))]
+
+
+def rename_target(segment):
+    return 'Zebra' if segment.id == '0' else None
+
+
+@pytest.mark.parametrize('use_inotify', INOTIFY_MODES)
+def test_watcher(tmp_path, use_inotify):
+    project_dir = tmp_path / 'project'
+    (project_dir / 'sub').mkdir(parents=True)
+    sdlxliff_file = str(project_dir / 'merged.docx.sdlxliff')
+    shutil.copy(SDLXLIFF_FILE, sdlxliff_file)
+    # inotify returns as soon as events are queued, polling sleeps for the whole timeout
+    timeout = 1 if use_inotify else 0
+    index = SearchIndex()
+    stats = watcher.StatsHandler()
+    with ProjectStore(str(tmp_path / 'project.db')) as store, \
+            watcher.Watcher([str(project_dir)], [watcher.SearchIndexHandler(index), stats, watcher.StoreHandler(store)], use_inotify=use_inotify) as w:
+        assert w.uses_inotify == use_inotify
+        assert w.refresh() == [Change(ADDED, sdlxliff_file)]
+        assert w.poll(0) == []
+        assert stats.stats[sdlxliff_file].segments == 13
+
+        # files are replaced the way the writers in this package do it
+        mxliff_file = str(project_dir / 'sub' / '01_ja-ja-en-R.mxliff')
+        pipeline.transform(MXLIFF_FILE, rename_target, mxliff_file, max_workers=1)
+        (project_dir / 'notes.txt').write_text('ignored')
+        assert w.poll(timeout) == [Change(ADDED, mxliff_file)]
+        assert index.search('Zebra', field='target') == [SearchHit(mxliff_file, '0')]
+        assert store.get_files() == [sdlxliff_file, mxliff_file]
+
+        with open(mxliff_file, 'rb') as f:
+            data = f.read()
+        # a partially written file is retried once it parses
+        with open(mxliff_file, 'wb') as f:
+            f.write(data[:len(data) // 2])
+        assert w.poll(timeout) == []
+        assert mxliff_file in w.errors
+        with open(mxliff_file, 'wb') as f:
+            f.write(data.replace(b'Zebra', b'Yak'))
+        assert w.poll(timeout) == [Change(MODIFIED, mxliff_file)]
+        assert not w.errors
+        assert index.search('Yak', field='target') == [SearchHit(mxliff_file, '0')]
+        assert index.search('Zebra', field='target') == []
+
+        os.remove(sdlxliff_file)
+        assert w.poll(timeout) == [Change(REMOVED, sdlxliff_file)]
+        assert list(stats.stats) == [mxliff_file]
+        assert store.get_files() == [mxliff_file]
+
+        new_dir = project_dir / 'new'
+        new_dir.mkdir()
+        shutil.copy(SDLXLIFF_FILE, new_dir)
+        assert w.poll(timeout) == [Change(ADDED, str(new_dir / 'merged.docx.sdlxliff'))]
+
+
+class FailingHandler(watcher.WatchHandler):
+    def __init__(self, failing_calls=(1,)):
+        self.calls = 0
+        self.failing_calls = failing_calls
+
+    def update(self, source_file, segments):
+        self.calls += 1
+        if self.calls in self.failing_calls:
+            raise sqlite3.OperationalError('handler failed')
+
+
+@pytest.mark.parametrize('use_inotify', INOTIFY_MODES)
+def test_watcher_errors(tmp_path, use_inotify):
+    source_file = str(tmp_path / 'merged.docx.sdlxliff')
+    shutil.copy(SDLXLIFF_FILE, source_file)
+    stats = watcher.StatsHandler()
+    handler = FailingHandler((1, 3))
+    with watcher.Watcher([str(tmp_path)], [stats, handler], use_inotify=use_inotify) as w:
+        # handler errors are recorded like parse errors instead of escaping from poll
+        assert w.refresh() == []
+        assert w.errors[source_file] == 'handler failed'
+        # the handlers that ran before the failing one do not keep the file
+        assert stats.stats == {}
+        assert w.states == {}
+        # failed files are only retried once they change
+        assert w.poll(0) == []
+        assert w.refresh() == []
+        assert handler.calls == 1
+        with open(source_file, 'ab') as f:
+            f.write(b'\n')
+        assert w.poll(1 if use_inotify else 0) == [Change(ADDED, source_file)]
+        assert handler.calls == 2
+        assert not w.errors
+        assert list(stats.stats) == [source_file]
+        # a failure on a modified file removes it everywhere
+        with open(source_file, 'ab') as f:
+            f.write(b'\n')
+        assert w.poll(1 if use_inotify else 0) == [Change(REMOVED, source_file)]
+        assert stats.stats == {}
+        assert w.states == {}
+        with open(source_file, 'ab') as f:
+            f.write(b'\n')
+        assert w.poll(1 if use_inotify else 0) == [Change(ADDED, source_file)]
+        assert not w.errors
+
+        broken_file = str(tmp_path / 'broken.mxliff')
+        with open(broken_file, 'w') as f:
+            f.write('<xliff')
+        assert w.poll(1 if use_inotify else 0) == []
+        assert broken_file in w.errors
+        os.remove(broken_file)
+        assert w.poll(1 if use_inotify else 0) == []
+        assert not w.errors
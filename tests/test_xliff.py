@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+import os
+import pytest
+from translator_toolkit.xliff import Xliff
+from translator_toolkit.error import TranslatorToolkitError
+
+data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+
+def test_load():
+    file = os.path.join(data_dir, 'sample.xlf')
+    xlf = Xliff.load(file)
+    assert xlf.version == '1.2'
+    assert xlf.source_language == 'en'
+    assert xlf.target_language == 'ja'
+    assert len(xlf.files) == 2
+
+    file0 = xlf.files[0]
+    assert file0.original == 'sample.html'
+    assert file0.datatype == 'html'
+    assert [tu.id for tu in file0.body.trans_units] == ['1', '2', '3']
+
+    tu0, tu1, tu2 = file0.body.trans_units
+    assert tu0.resname == 'title'
+    assert tu0.source == 'Hello <g id="1">world</g>'
+    assert tu0.target == 'こんにちは<g id="1">世界</g>'
+    assert tu0.state == 'translated'
+    assert tu0.approved
+    assert tu0.translate
+    assert tu0.notes == ['greeting']
+
+    assert tu1.source == 'Price: 1,000 &amp; tax '
+    assert tu1.target == ''
+    assert tu1.state == 'needs-translation'
+    assert not tu1.approved
+
+    assert not tu2.translate
+    assert tu2.target == ''
+
+    assert xlf.files[1].body.trans_units[0].target == '2番目のファイル'
+
+    obj = xlf.to_json()
+    assert obj['source_file'] == file
+    assert obj['files'][0]['groups'][0]['units'][0]['source'] == 'Hello <g id="1">world</g>'
+    assert obj['files'][1]['tgtlang'] == 'ja'
+
+
+def test_stream_trans_units():
+    file = os.path.join(data_dir, 'sample.xlf')
+    units = list(Xliff.stream_trans_units(file, fields=['id', 'target']))
+    assert [(f.original, tu.id) for f, tu in units] == [('sample.html', '1'), ('sample.html', '2'), ('sample.html', '3'), ('second.html', '1')]
+    assert units[0][1].source == ''
+    assert units[0][1].target == 'こんにちは<g id="1">世界</g>'
+    assert units[0][1].notes == []
+
+    with pytest.raises(TranslatorToolkitError):
+        list(Xliff.stream_trans_units(file, fields=['m_score']))
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+import os
+import pytest
+from translator_toolkit.xliff2 import Xliff2
+from translator_toolkit.error import TranslatorToolkitError
+
+data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+
+def test_load():
+    file = os.path.join(data_dir, 'sample_v2.xlf')
+    xlf = Xliff2.load(file)
+    assert xlf.version == '2.0'
+    assert xlf.source_language == 'en'
+    assert xlf.target_language == 'fr'
+    assert len(xlf.files) == 1
+
+    file0 = xlf.files[0]
+    assert file0.id == 'f1'
+    assert file0.original == 'sample.txt'
+    assert file0.source_language == 'en'
+    assert [u.id for u in file0.units] == ['u1', 'u2', 'u3']
+
+    u1, u2, u3 = file0.units
+    assert u1.name == 'intro'
+    assert u1.notes == ['first unit']
+    assert u1.translate
+    assert len(u1.segments) == 2
+    assert u1.segments[0].id == 's1'
+    assert u1.segments[0].state == 'translated'
+    assert u1.segments[0].source == 'Hello <pc id="1">world</pc>.'
+    assert u1.segments[0].target == 'Bonjour <pc id="1">le monde</pc>.'
+    assert u1.segments[1].id == ''
+    assert u1.segments[1].state == 'final'
+    assert u1.segments[1].sub_state == 'x:approved'
+
+    assert not u2.translate
+    assert u2.segments[0].state == 'initial'
+    assert u2.segments[0].target == ''
+    assert u3.translate
+
+    assert [s.target for s in xlf.get_all_segments()] == ['Bonjour <pc id="1">le monde</pc>.', 'Au revoir.', '', '3 articles']
+
+    obj = xlf.to_json()
+    assert obj['files'][0]['groups'][0]['id'] == 'u1'
+    assert obj['files'][0]['groups'][0]['units'][1]['target'] == 'Au revoir.'
+    assert obj['files'][0]['tgtlang'] == 'fr'
+
+
+def test_stream_units():
+    file = os.path.join(data_dir, 'sample_v2.xlf')
+    units = list(Xliff2.stream_units(file, fields=['id', 'source']))
+    assert [u.id for _, u in units] == ['u1', 'u2', 'u3']
+    assert units[0][1].segments[0].source == 'Hello <pc id="1">world</pc>.'
+    assert units[0][1].segments[0].target == ''
+    assert units[0][0].target_language == 'fr'
+
+    with pytest.raises(TranslatorToolkitError):
+        list(Xliff2.stream_units(file, fields=['resname']))
@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+import io
+
+from translator_toolkit.util import xmlstream
+
+XML = b'<a xmlns="u:a" xmlns:s="u:s"><b x="1"><c s:y="2"/></b><b x="2"><c/><d/></b><e/></a>'
+
+
+def test_iter_leaves_and_write():
+    leaves = [(tuple(c.attrib.get('x') for c in path), xmlstream.serialize(elem))
+              for path, elem in xmlstream.iter_leaves(io.BytesIO(XML), {'{u:a}a', '{u:a}b'})]
+    assert [path for path, _ in leaves] == [(None, '1'), (None, '2'), (None, '2'), (None,)]
+    assert leaves[0][1] == b'<c xmlns="u:a" xmlns:s="u:s" s:y="2"/>'
+
+    outfile = io.BytesIO()
+    writer = xmlstream.XmlStreamWriter(outfile)
+    for path, elem in xmlstream.iter_leaves(io.BytesIO(XML), {'{u:a}a', '{u:a}b'}):
+        if elem.tag != '{u:a}d':
+            writer.write(path, xmlstream.serialize(elem))
+    writer.close()
+    expected = xmlstream.XML_DECLARATION.strip() + b'<a xmlns="u:a" xmlns:s="u:s"><b x="1"><c s:y="2"/></b><b x="2"><c/></b><e/></a>'
+    assert outfile.getvalue().replace(b'\n', b'') == expected
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+from translator_toolkit.util import xmlutil
+
+
+def test_valid_xml_reader(tmp_path):
+    xml_file = tmp_path / 'test.xml'
+    xml_file.write_bytes(b'<root>\n<a>A&#x1;B</a>\n<b>&#X0B;</b>\n</root>\n')
+    with xmlutil.ValidXmlReader(str(xml_file)) as reader:
+        chunks = [reader.read(4) for _ in range(10)]
+    assert b''.join(chunks) == b'<root>\n<a>A B</a>\n<b> </b>\n</root>\n'
+    assert chunks[-1] == b''
+
+    xml_file.write_bytes(b'<root>&#x1;&#xA;&#xa0;&#x1F;&#x2014;&#xFFFE;</root>')
+    with xmlutil.ValidXmlReader(str(xml_file), invalid_only=True) as reader:
+        assert reader.read() == b'<root> &#xA;&#xa0; &#x2014; </root>'
+
+    # references split across chunks on a single line
+    data = b'<root>' + b'A&#x1;B&#xA0;&amp;' * 50 + b'</root>'
+    xml_file.write_bytes(data)
+    for chunk_size in (1, 3, 7, 64):
+        with xmlutil.ValidXmlReader(str(xml_file), invalid_only=True, chunk_size=chunk_size) as reader:
+            assert b''.join(iter(lambda: reader.read(5), b'')) == data.replace(b'&#x1;', b' ')
+        with xmlutil.ValidXmlReader(str(xml_file), chunk_size=chunk_size) as reader:
+            assert reader.read() == data.replace(b'&#x1;', b' ').replace(b'&#xA0;', b' ')
+
+
+def test_parse_pruned(tmp_path):
+    xml_file = tmp_path / 'test.xml'
+    xml_file.write_bytes(b'<root><a><b>B</b></a><c>C<b/></c></root>')
+    root = xmlutil.parse_pruned(str(xml_file), ['b'])
+    assert xmlutil.tostring(root) == '<a/><c>C</c>'
+    root = xmlutil.parse_pruned(str(xml_file), [])
+    assert xmlutil.tostring(root) == '<a><b>B</b></a><c>C<b/></c>'
+
+
+def test_get_parser_for_size():
+    # parsers are not thread safe, callers get their own instance
+    assert xmlutil.get_parser_for_size(0, 'utf-8') is not xmlutil.get_parser_for_size(0, 'utf-8')
@@ -1,2 +1,40 @@
 #!/usr/bin/env python3
+import importlib
+
 __version__ = '0.1'
+
+_LAZY_ATTRS = {
+    'open': 'translator_toolkit.document',
+    'Document': 'translator_toolkit.document',
+    'Sdlxliff': 'translator_toolkit.sdlxliff',
+    'Mxliff': 'translator_toolkit.mxliff',
+    'Xliff': 'translator_toolkit.xliff',
+    'Xliff2': 'translator_toolkit.xliff2',
+    'SdlPackage': 'translator_toolkit.sdlpackage',
+    'Segment': 'translator_toolkit.segment',
+    'QaEngine': 'translator_toolkit.qa',
+    'SearchIndex': 'translator_toolkit.search',
+    'Termbase': 'translator_toolkit.terminology',
+    'TermMatcher': 'translator_toolkit.terminology',
+    'TranslatorToolkitError': 'translator_toolkit.error',
+}
+
+# public names that differ from the name in their module
+_ALIASES = {
+    'open': 'open_document',
+}
+
+__all__ = ['__version__', *_LAZY_ATTRS]
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_ATTRS.get(name)
+    if module_name is None:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(importlib.import_module(module_name), _ALIASES.get(name, name))
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRS))
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import array
+import os
+from typing import Iterable, Optional
+
+from translator_toolkit import segment as segmentlib
+from translator_toolkit import writeback
+from translator_toolkit.segment import MXLIFF
+from translator_toolkit.mxliff import Mxliff, MxliffTransUnit, MxliffAltTrans
+from translator_toolkit.columnar import import_optional
+from translator_toolkit.writeback import TargetUpdate
+from translator_toolkit.util import stringutil
+
+# lower bounds of the match bands, memsource reports in-context matches as 101
+BAND_EDGES = [0.0, 50.0, 75.0, 85.0, 95.0, 100.0, 101.0]
+BAND_NAMES = ['none', '0-49', '50-74', '75-84', '85-94', '95-99', '100', '101']
+# ties on match quality go to the origin listed first, then to the earliest candidate
+ORIGIN_PRIORITY = ['memsource-tm', 'nt', 'machine-trans']
+
+
+def get_origin_rank(origin: str) -> int:
+    return ORIGIN_PRIORITY.index(origin) if origin in ORIGIN_PRIORITY else len(ORIGIN_PRIORITY)
+
+
+class AltTransAnalysis(object):
+    source_files: list[str]
+    trans_units: list[tuple[int, MxliffTransUnit]]
+    candidates: list[MxliffAltTrans]
+    words: array.array
+    translated: array.array
+
+    def __init__(self):
+        self.source_files = []
+        self.trans_units = []
+        self.candidates = []
+        self.words = array.array('q')
+        self.translated = array.array('b')
+        # one entry per candidate
+        self._unit = array.array('q')
+        self._quality = array.array('d')
+        self._rank = array.array('q')
+        self._position = array.array('q')
+        self._best = None
+
+    def add_document(self, doc: Mxliff):
+        file_index = len(self.source_files)
+        self.source_files.append(doc.source_file)
+        for tu in doc.get_all_trans_units():
+            unit = len(self.trans_units)
+            self.trans_units.append((file_index, tu))
+            self.words.append(stringutil.count_words(segmentlib.remove_tags(tu.source, MXLIFF)))
+            self.translated.append(bool(tu.target))
+            for position, alt_trans in enumerate(tu.alt_trans_units):
+                if not alt_trans.target:
+                    continue
+                self.candidates.append(alt_trans)
+                self._unit.append(unit)
+                self._quality.append(alt_trans.match_quality)
+                self._rank.append(get_origin_rank(alt_trans.origin))
+                self._position.append(position)
+        self._best = None
+
+    def add_file(self, source_file: str):
+        self.add_document(Mxliff.load(source_file, ['id', 'source', 'target', 'alt_trans_units']))
+
+    def get_best_candidates(self, origins: Optional[Iterable[str]] = None):
+        if origins is None and self._best is not None:
+            return self._best
+        np = import_optional('numpy')
+        unit = np.array(self._unit, dtype=np.int64)
+        quality = np.array(self._quality, dtype=np.float64)
+        rank = np.array(self._rank, dtype=np.int64)
+        position = np.array(self._position, dtype=np.int64)
+        candidates = np.arange(len(unit))
+        if origins is not None:
+            origins = frozenset(origins)
+            allowed = np.array([c.origin in origins for c in self.candidates], dtype=bool)
+            candidates, unit, quality, rank, position = candidates[allowed], unit[allowed], quality[allowed], rank[allowed], position[allowed]
+        # lexsort uses the last key as the primary one
+        order = np.lexsort((position, rank, -quality, unit))
+        units, first = np.unique(unit[order], return_index=True)
+        best = np.full(len(self.trans_units), -1, dtype=np.int64)
+        best[units] = candidates[order[first]]
+        if origins is None:
+            self._best = best
+        return best
+
+    def get_best_qualities(self, best=None):
+        np = import_optional('numpy')
+        best = self.get_best_candidates() if best is None else best
+        qualities = np.full(len(best), -1.0)
+        found = best >= 0
+        qualities[found] = np.array(self._quality, dtype=np.float64)[best[found]]
+        return qualities
+
+    def get_bands(self):
+        np = import_optional('numpy')
+        # units without candidates have a quality of -1 and fall into the first band
+        return np.digitize(self.get_best_qualities(), BAND_EDGES)
+
+    def get_band_counts(self) -> dict[str, dict[str, int]]:
+        np = import_optional('numpy')
+        bands = self.get_bands()
+        units = np.bincount(bands, minlength=len(BAND_NAMES))
+        words = np.bincount(bands, weights=np.array(self.words, dtype=np.int64), minlength=len(BAND_NAMES))
+        return {name: {'units': int(units[i]), 'words': int(words[i])} for i, name in enumerate(BAND_NAMES)}
+
+    def get_best(self, index: int) -> Optional[MxliffAltTrans]:
+        best = int(self.get_best_candidates()[index])
+        return self.candidates[best] if best >= 0 else None
+
+    def select(self, min_quality: float = 100.0, overwrite: bool = False, origins: Optional[Iterable[str]] = None) -> dict[int, MxliffAltTrans]:
+        np = import_optional('numpy')
+        best = self.get_best_candidates(origins)
+        mask = self.get_best_qualities(best) >= min_quality
+        if not overwrite:
+            mask &= ~np.array(self.translated, dtype=bool)
+        return {int(i): self.candidates[best[i]] for i in np.flatnonzero(mask)}
+
+    def prefill(self, min_quality: float = 100.0, overwrite: bool = False, origins: Optional[Iterable[str]] = None) -> int:
+        selected = self.select(min_quality, overwrite, origins)
+        for index, alt_trans in selected.items():
+            self.trans_units[index][1].target = alt_trans.target
+            self.translated[index] = 1
+        return len(selected)
+
+    def write_targets(self, min_quality: float = 100.0, overwrite: bool = False, origins: Optional[Iterable[str]] = None,
+                      output_dir: Optional[str] = None) -> int:
+        updates: dict[int, dict[str, TargetUpdate]] = {}
+        for index, alt_trans in self.select(min_quality, overwrite, origins).items():
+            file_index, tu = self.trans_units[index]
+            updates.setdefault(file_index, {})[tu.id] = TargetUpdate(alt_trans.target)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        count = 0
+        for file_index, file_updates in updates.items():
+            source_file = self.source_files[file_index]
+            output_file = os.path.join(output_dir, os.path.basename(source_file)) if output_dir else None
+            count += writeback.write_targets(source_file, file_updates, output_file)
+        return count
+
+
+def analyze(source_files: Iterable[str]) -> AltTransAnalysis:
+    analysis = AltTransAnalysis()
+    for source_file in source_files:
+        analysis.add_file(source_file)
+    return analysis
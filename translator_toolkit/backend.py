@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import os
+from typing import IO, TYPE_CHECKING, AbstractSet, Iterator, Optional, Union
+from xml.parsers import expat
+
+from translator_toolkit.ns import XLF, SDLXLF
+from translator_toolkit.util import xmlutil
+from translator_toolkit.error import TranslatorToolkitError
+
+if TYPE_CHECKING:
+    from translator_toolkit.mxliff import MxliffFile, MxliffAltTrans
+    from translator_toolkit.sdlxliff import SdlxliffFile, SdlxliffSegDefinition
+
+LXML = 'lxml'
+EXPAT = 'expat'
+BACKENDS = [LXML, EXPAT]
+
+READ_SIZE = 1 << 16
+
+XLF_FILE = XLF + 'file'
+XLF_TRANS_UNIT = XLF + 'trans-unit'
+XLF_SOURCE = XLF + 'source'
+XLF_SEG_SOURCE = XLF + 'seg-source'
+XLF_TARGET = XLF + 'target'
+XLF_ALT_TRANS = XLF + 'alt-trans'
+XLF_MRK = XLF + 'mrk'
+SDLXLF_SEG_DEFS = SDLXLF + 'seg-defs'
+SDLXLF_SEG = SDLXLF + 'seg'
+
+TEXT_ESCAPES = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;', '\r': '&#13;'})
+ATTR_ESCAPES = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', '\n': '&#10;', '\r': '&#13;', '\t': '&#9;'})
+
+
+def get_backend(backend: Optional[str]) -> str:
+    if backend is None:
+        return LXML
+    if backend not in BACKENDS:
+        raise TranslatorToolkitError(f'unknown parser backend: {backend}')
+    return backend
+
+
+def to_clark(name: str) -> str:
+    # expat reports namespaced names as 'uri local [prefix]'
+    parts = name.split(' ')
+    return f'{{{parts[0]}}}{parts[1]}' if len(parts) > 1 else name
+
+
+def to_qname(name: str) -> str:
+    parts = name.split(' ')
+    if len(parts) == 3:
+        return f'{parts[2]}:{parts[1]}'
+    return parts[1] if len(parts) == 2 else name
+
+
+def to_attrib(attrs: dict[str, str]) -> dict[str, str]:
+    return {to_clark(k): v for k, v in attrs.items()}
+
+
+class MarkupWriter(object):
+    # serialises events the same way lxml.etree.tostring serialises the inner content of an element
+    parts: list[str]
+
+    def __init__(self):
+        self.parts = []
+        self._open = False
+
+    def start(self, name: str, attrs: dict[str, str]):
+        self._close_start()
+        self.parts.append('<' + to_qname(name))
+        for k, v in attrs.items():
+            self.parts.append(f' {to_qname(k)}="{v.translate(ATTR_ESCAPES)}"')
+        self._open = True
+
+    def end(self, name: str):
+        if self._open:
+            self.parts.append('/>')
+            self._open = False
+        else:
+            self.parts.append(f'</{to_qname(name)}>')
+
+    def _close_start(self):
+        if self._open:
+            self.parts.append('>')
+            self._open = False
+
+    def text(self, data: str):
+        self._close_start()
+        self.parts.append(data.translate(TEXT_ESCAPES))
+
+    def comment(self, data: str):
+        self._close_start()
+        self.parts.append(f'<!--{data}-->')
+
+    def pi(self, target: str, data: str):
+        self._close_start()
+        self.parts.append(f'<?{target} {data}?>' if data else f'<?{target}?>')
+
+    def getvalue(self) -> str:
+        return ''.join(self.parts)
+
+
+class EventReader(object):
+    # the model modules import this one, so their classes are looked up when a reader is created
+    items: list
+
+    def __init__(self):
+        self.items = []
+        self.parser = expat.ParserCreate(namespace_separator=' ')
+        self.parser.namespace_prefixes = True
+        self.parser.buffer_text = True
+        self.parser.StartElementHandler = self.start
+        self.parser.EndElementHandler = self.end
+        self.parser.CharacterDataHandler = self.text
+        self.parser.CommentHandler = self.comment
+        self.parser.ProcessingInstructionHandler = self.pi
+
+    def start(self, name: str, attrs: dict[str, str]):
+        pass
+
+    def end(self, name: str):
+        pass
+
+    def text(self, data: str):
+        pass
+
+    def comment(self, data: str):
+        pass
+
+    def pi(self, target: str, data: str):
+        pass
+
+    def read(self, stream: Union[IO[bytes], xmlutil.ValidXmlReader]) -> Iterator:
+        while True:
+            data = stream.read(READ_SIZE)
+            try:
+                self.parser.Parse(data, not data)
+            except expat.ExpatError as e:
+                raise TranslatorToolkitError(f'invalid xml: {e}') from e
+            if self.items:
+                yield from self.items
+                self.items.clear()
+            if not data:
+                break
+
+
+class MxliffEventReader(EventReader):
+    file: Optional[MxliffFile]
+    tu_attrib: Optional[dict[str, str]]
+    alt_trans_units: list[MxliffAltTrans]
+    alt_trans_attrib: Optional[dict[str, str]]
+    alt_trans_target: Optional[str]
+    capture: Optional[str]
+    buffer: list[str]
+
+    def __init__(self, fields: AbstractSet[str]):
+        super().__init__()
+        from translator_toolkit import mxliff
+        self.mxliff = mxliff
+        self.fields = fields
+        self.file = None
+        self.depth = 0
+        self.tu_depth = 0
+        self.tu_attrib = None
+        self.source = ''
+        self.target = ''
+        self.alt_trans_units = []
+        self.alt_trans_attrib = None
+        self.alt_trans_target = ''
+        # text is only captured until the first child element, as with elem.text
+        self.capture = None
+        self.buffer = []
+
+    def start(self, name: str, attrs: dict[str, str]):
+        self.depth += 1
+        tag = to_clark(name)
+        if self.capture is not None:
+            self.finish_capture()
+        if self.tu_attrib is None:
+            if tag == XLF_TRANS_UNIT and self.file is not None:
+                self.tu_attrib = to_attrib(attrs)
+                self.tu_depth = self.depth
+                self.source = ''
+                self.target = ''
+                self.alt_trans_units = []
+            elif tag == XLF_FILE:
+                self.file = self.mxliff.MxliffFile.from_header(to_attrib(attrs))
+            return
+        level = self.depth - self.tu_depth
+        if level == 1:
+            if tag == XLF_SOURCE:
+                self.capture = 'source'
+            elif tag == XLF_TARGET:
+                self.capture = 'target'
+            elif tag == XLF_ALT_TRANS and 'alt_trans_units' in self.fields:
+                self.alt_trans_attrib = to_attrib(attrs)
+                self.alt_trans_target = None
+        elif level == 2 and self.alt_trans_attrib is not None and tag == XLF_TARGET and self.alt_trans_target is None:
+            self.capture = 'alt_trans_target'
+
+    def finish_capture(self):
+        value = ''.join(self.buffer)
+        if self.capture == 'source':
+            self.source = value
+        elif self.capture == 'target':
+            self.target = value
+        else:
+            self.alt_trans_target = value
+        self.capture = None
+        self.buffer.clear()
+
+    def text(self, data: str):
+        if self.capture is not None:
+            self.buffer.append(data)
+
+    def comment(self, data: str):
+        if self.capture is not None:
+            self.finish_capture()
+
+    def pi(self, target: str, data: str):
+        if self.capture is not None:
+            self.finish_capture()
+
+    def end(self, name: str):
+        if self.capture is not None:
+            self.finish_capture()
+        if self.tu_attrib is not None:
+            level = self.depth - self.tu_depth
+            if level == 0:
+                source = self.source if 'source' in self.fields else ''
+                target = self.target if 'target' in self.fields else ''
+                tu = self.mxliff.MxliffTransUnit.from_attrib(self.tu_attrib, source, target, self.alt_trans_units, self.fields)
+                self.items.append((self.file, tu))
+                self.tu_attrib = None
+            elif level == 1 and self.alt_trans_attrib is not None:
+                self.alt_trans_units.append(self.mxliff.MxliffAltTrans.from_attrib(self.alt_trans_attrib, self.alt_trans_target or ''))
+                self.alt_trans_attrib = None
+        self.depth -= 1
+
+
+class SdlxliffEventReader(EventReader):
+    file: Optional[SdlxliffFile]
+    tu_attrib: Optional[dict[str, str]]
+    container: str
+    # container tag -> (mid, content) of its seg mrks
+    mrks: dict[str, list[tuple[str, str]]]
+    mrk: str
+    writer: Optional[MarkupWriter]
+    segment_definitions: list[SdlxliffSegDefinition]
+
+    def __init__(self, fields: AbstractSet[str]):
+        super().__init__()
+        from translator_toolkit import sdlxliff
+        self.sdlxliff = sdlxliff
+        self.fields = fields
+        self.file = None
+        self.depth = 0
+        self.tu_depth = 0
+        self.tu_attrib = None
+        self.container = ''
+        self.mrks = {}
+        self.mrk = ''
+        self.writer = None
+        self.segment_definitions = []
+
+    def start(self, name: str, attrs: dict[str, str]):
+        self.depth += 1
+        if self.writer is not None:
+            self.writer.start(name, attrs)
+            return
+        tag = to_clark(name)
+        if self.tu_attrib is None:
+            if tag == XLF_TRANS_UNIT and self.file is not None:
+                self.tu_attrib = to_attrib(attrs)
+                self.tu_depth = self.depth
+                self.mrks = {XLF_SEG_SOURCE: [], XLF_TARGET: []}
+                self.segment_definitions = []
+            elif tag == XLF_FILE:
+                self.file = self.sdlxliff.SdlxliffFile.from_header(to_attrib(attrs))
+            return
+        level = self.depth - self.tu_depth
+        if level == 1:
+            self.container = tag
+        elif level == 2:
+            if self.container in self.mrks and tag == XLF_MRK and attrs.get('mtype') == 'seg':
+                self.mrk = attrs.get('mid', '')
+                self.writer = MarkupWriter()
+            elif self.container == SDLXLF_SEG_DEFS and tag == SDLXLF_SEG and 'segment_definitions' in self.fields:
+                self.segment_definitions.append(self.sdlxliff.SdlxliffSegDefinition.from_attrib(attrs))
+
+    def text(self, data: str):
+        if self.writer is not None:
+            self.writer.text(data)
+
+    def comment(self, data: str):
+        if self.writer is not None:
+            self.writer.comment(data)
+
+    def pi(self, target: str, data: str):
+        if self.writer is not None:
+            self.writer.pi(target, data)
+
+    def end(self, name: str):
+        level = self.depth - self.tu_depth if self.tu_attrib is not None else -1
+        self.depth -= 1
+        if self.writer is not None:
+            if level > 2:
+                self.writer.end(name)
+                return
+            self.mrks[self.container].append((self.mrk, self.writer.getvalue()))
+            self.writer = None
+        elif level == 1:
+            self.container = ''
+        elif level == 0 and self.tu_attrib is not None:
+            segment_pairs = []
+            src_mrks = self.mrks[XLF_SEG_SOURCE]
+            tgt_mrks = self.mrks[XLF_TARGET]
+            if src_mrks and tgt_mrks:
+                for (mid, source), (_, target) in zip(src_mrks, tgt_mrks):
+                    segment_pairs.append(self.sdlxliff.SdlxliffSegmentPair(
+                        mid.replace('_x0020_', ' ') if 'mid' in self.fields else '',
+                        source if 'source' in self.fields else '',
+                        target if 'target' in self.fields else ''
+                    ))
+            id_ = self.tu_attrib.get('id', '') if 'id' in self.fields else ''
+            self.items.append((self.file, self.sdlxliff.SdlxliffTransUnit(id_, segment_pairs, self.segment_definitions)))
+            self.tu_attrib = None
+
+
+def stream_mxliff_trans_units(source_file: str, fields: AbstractSet[str]) -> Iterator:
+    with open(source_file, 'rb') as stream:
+        yield from MxliffEventReader(fields).read(stream)
+
+
+def stream_sdlxliff_trans_units(source_file: str, fields: AbstractSet[str]) -> Iterator:
+    if not os.path.isfile(source_file):
+        raise FileNotFoundError(source_file)
+    with xmlutil.ValidXmlReader(source_file) as stream:
+        yield from SdlxliffEventReader(fields).read(stream)
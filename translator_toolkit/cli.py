@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+import argparse
+import contextlib
+import json
+import os
+import sys
+from typing import Callable, Iterator, Optional, Sequence
+
+SUPPORTED_EXTS = ['.sdlxliff', '.mxliff', '.xlf', '.xliff']
+CONVERT_FORMATS = ['xjson', 'jsonl', 'tmx', 'csv']
+
+
+def get_input_files(paths: list[str]) -> list[str]:
+    from translator_toolkit.util import fileutil
+    return fileutil.find_files(paths, SUPPORTED_EXTS)
+
+
+def map_files(func: Callable, args: Sequence[tuple], jobs: int) -> Iterator:
+    if jobs <= 1 or len(args) < 2:
+        for a in args:
+            yield func(*a)
+        return
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        yield from executor.map(func, *zip(*args))
+
+
+def open_output(output: Optional[str]):
+    if not output or output == '-':
+        return contextlib.nullcontext(sys.stdout)
+    return open(output, 'w', encoding='utf-8', newline='')
+
+
+def cmd_convert(args: argparse.Namespace) -> int:
+    from translator_toolkit import export
+    source_files = get_input_files(args.inputs)
+    jobs = []
+    for source_file in source_files:
+        output_dir = args.output_dir or os.path.dirname(source_file)
+        output_file = os.path.join(output_dir, os.path.basename(source_file) + export.FORMATS[args.format])
+        jobs.append((source_file, output_file, args.format))
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+    for (source_file, output_file, _), count in zip(jobs, map_files(export.convert_file, jobs, args.jobs)):
+        print(f'{source_file} -> {output_file} ({count})', file=sys.stderr)
+    return 0
+
+
+def cmd_stats(args: argparse.Namespace) -> int:
+    from translator_toolkit import stats
+    source_files = get_input_files(args.inputs)
+    with open_output(args.output) as outfile:
+        for file_stats in stats.iter_files_stats(source_files, max_workers=args.jobs, words=args.words):
+            outfile.write(json.dumps(file_stats.to_json(), ensure_ascii=False) + '\n')
+    return 0
+
+
+def cmd_qa(args: argparse.Namespace) -> int:
+    from translator_toolkit import qa
+    source_files = get_input_files(args.inputs)
+    engine = qa.QaEngine()
+    with open_output(args.output) as outfile:
+        count = qa.write_report(engine.run_files(source_files, max_workers=args.jobs), outfile, format_=args.format)
+    print(f'{count} issues', file=sys.stderr)
+    return 1 if count and args.strict else 0
+
+
+def cmd_comments(args: argparse.Namespace) -> int:
+    from translator_toolkit import comments
+    source_files = [f for f in get_input_files(args.inputs) if f.lower().endswith('.sdlxliff')]
+    with open_output(args.output) as outfile:
+        count = comments.write_report(comments.iter_files_comments(source_files, max_workers=args.jobs), outfile, format_=args.format)
+    print(f'{count} comments', file=sys.stderr)
+    return 0
+
+
+def cmd_consistency(args: argparse.Namespace) -> int:
+    from translator_toolkit import consistency
+    source_files = get_input_files(args.inputs)
+    index = consistency.check_files(source_files, max_workers=args.jobs, ignore_case=args.ignore_case)
+    with open_output(args.output) as outfile:
+        count = consistency.write_report(index.get_inconsistencies(args.kind), outfile, format_=args.format)
+    print(f'{count} inconsistencies in {len(index)} segments', file=sys.stderr)
+    return 1 if count and args.strict else 0
+
+
+def extract_file(source_file: str, side: str) -> list[str]:
+    from translator_toolkit import segment as segmentlib
+    lines = []
+    for segment in segmentlib.stream_segments(source_file):
+        texts = []
+        if side in ('source', 'both'):
+            texts.append(segment.plain_source)
+        if side in ('target', 'both'):
+            texts.append(segment.plain_target)
+        lines.append('\t'.join(t.replace('\t', ' ').replace('\n', ' ') for t in texts))
+    return lines
+
+
+def cmd_extract(args: argparse.Namespace) -> int:
+    source_files = get_input_files(args.inputs)
+    seen = set()
+    with open_output(args.output) as outfile:
+        for lines in map_files(extract_file, [(f, args.side) for f in source_files], args.jobs):
+            for line in lines:
+                if args.unique:
+                    if line in seen:
+                        continue
+                    seen.add(line)
+                outfile.write(line + '\n')
+    return 0
+
+
+def create_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='translator-toolkit', description='A set of utilities for translators')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    def add_common(p: argparse.ArgumentParser):
+        p.add_argument('inputs', nargs='+', help='SDLXLIFF/MXLIFF/XLIFF files or directories')
+        p.add_argument('-j', '--jobs', type=int, default=1, help='number of worker processes')
+
+    p = subparsers.add_parser('convert', help='convert files to xjson, jsonl, tmx or csv')
+    add_common(p)
+    p.add_argument('-f', '--format', choices=CONVERT_FORMATS, default='jsonl')
+    p.add_argument('-o', '--output-dir', help='output directory (default: next to each input file)')
+    p.set_defaults(func=cmd_convert)
+
+    p = subparsers.add_parser('stats', help='print segment counts per file as JSON lines')
+    add_common(p)
+    p.add_argument('-o', '--output', help='output file (default: stdout)')
+    p.add_argument('-w', '--words', action='store_true', help='also count source words (reads the segment text)')
+    p.set_defaults(func=cmd_stats)
+
+    p = subparsers.add_parser('qa', help='run QA checks')
+    add_common(p)
+    p.add_argument('-f', '--format', choices=['csv', 'jsonl'], default='csv')
+    p.add_argument('-o', '--output', help='output file (default: stdout)')
+    p.add_argument('--strict', action='store_true', help='exit with status 1 if any issue is found')
+    p.set_defaults(func=cmd_qa)
+
+    p = subparsers.add_parser('comments', help='export SDLXLIFF review comments with their segments')
+    add_common(p)
+    p.add_argument('-f', '--format', choices=['csv', 'jsonl'], default='csv')
+    p.add_argument('-o', '--output', help='output file (default: stdout)')
+    p.set_defaults(func=cmd_comments)
+
+    p = subparsers.add_parser('consistency', help='report sources translated differently and targets shared by different sources')
+    add_common(p)
+    p.add_argument('-f', '--format', choices=['csv', 'jsonl'], default='csv')
+    p.add_argument('-o', '--output', help='output file (default: stdout)')
+    p.add_argument('-k', '--kind', choices=['source', 'target'], help='only report one kind of inconsistency')
+    p.add_argument('-i', '--ignore-case', action='store_true', help='compare texts case-insensitively')
+    p.add_argument('--strict', action='store_true', help='exit with status 1 if any inconsistency is found')
+    p.set_defaults(func=cmd_consistency)
+
+    p = subparsers.add_parser('extract', help='extract plain segment text')
+    add_common(p)
+    p.add_argument('-s', '--side', choices=['source', 'target', 'both'], default='source')
+    p.add_argument('-u', '--unique', action='store_true', help='skip duplicate lines')
+    p.add_argument('-o', '--output', help='output file (default: stdout)')
+    p.set_defaults(func=cmd_extract)
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = create_parser()
+    args = parser.parse_args(argv)
+    from translator_toolkit.error import TranslatorToolkitError
+    try:
+        return args.func(args)
+    except TranslatorToolkitError as e:
+        print(f'error: {e}', file=sys.stderr)
+        return 2
+
+
+if __name__ == '__main__':
+    sys.exit(main())
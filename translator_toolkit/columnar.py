@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import array
+import importlib
+import os
+from types import ModuleType
+from typing import Union
+
+from lxml import etree
+
+from translator_toolkit import segment as segmentlib
+from translator_toolkit.segment import SDLXLIFF, MXLIFF
+from translator_toolkit.ns import XLF, SDLXLF, MXLF
+from translator_toolkit.util import xmlutil, stringutil
+from translator_toolkit.error import TranslatorToolkitError
+
+XLF_TRANS_UNIT = XLF + 'trans-unit'
+XLF_SOURCE = XLF + 'source'
+XLF_SEG_SOURCE = XLF + 'seg-source'
+XLF_TARGET = XLF + 'target'
+XLF_MRK = XLF + 'mrk'
+SDLXLF_SEG_DEFS = SDLXLF + 'seg-defs'
+SDLXLF_SEG = SDLXLF + 'seg'
+
+# column name -> array typecode ('' for string columns kept in a list)
+MXLIFF_COLUMNS = {
+    'id': '',
+    'source': '',
+    'target': '',
+    'score': 'd',
+    'gross_score': 'd',
+    'confirmed': 'b',
+    'locked': 'b',
+    'created_at': 'q',
+    'modified_at': 'q'
+}
+SDLXLIFF_COLUMNS = {
+    'id': '',
+    'source': '',
+    'target': '',
+    'status': '',
+    'origin': '',
+    'score': 'd',
+    'confirmed': 'b',
+    'locked': 'b'
+}
+NUMPY_DTYPES = {'d': 'float64', 'b': 'bool', 'q': 'int64'}
+TIMESTAMP_COLUMNS = frozenset(['created_at', 'modified_at'])
+
+
+def import_optional(name: str) -> ModuleType:
+    try:
+        return importlib.import_module(name)
+    except ImportError as e:
+        raise TranslatorToolkitError(f'{name} is required for columnar export: pip install translator_toolkit[{name.split(".")[0]}]') from e
+
+
+def to_float(value: str) -> float:
+    return float(value) if stringutil.is_float(value) else 0.0
+
+
+def to_epoch_ms(value: str) -> int:
+    return int(float(value)) if stringutil.is_float(value) else 0
+
+
+# string columns are lists, numeric and flag columns typed arrays
+Column = Union[list, array.array]
+
+
+class SegmentColumns(object):
+    source_file: str
+    format: str
+    columns: dict[str, Column]
+
+    def __init__(self, source_file: str, format_: str, columns: dict[str, Column]):
+        self.source_file = source_file
+        self.format = format_
+        self.columns = columns
+
+    @classmethod
+    def empty(cls, source_file: str, format_: str) -> SegmentColumns:
+        spec = MXLIFF_COLUMNS if format_ == MXLIFF else SDLXLIFF_COLUMNS
+        columns: dict[str, Column] = {name: array.array(typecode) if typecode else [] for name, typecode in spec.items()}
+        return SegmentColumns(source_file, format_, columns)
+
+    def __len__(self) -> int:
+        return len(self.columns['id'])
+
+    def to_numpy(self) -> dict:
+        np = import_optional('numpy')
+        arrays = {}
+        for name, values in self.columns.items():
+            if isinstance(values, array.array):
+                # float and int buffers are shared without copying, only the int8 flags are copied into a bool array
+                arrays[name] = np.frombuffer(values, dtype=values.typecode).astype(NUMPY_DTYPES[values.typecode], copy=False)
+            else:
+                arrays[name] = np.array(values, dtype=object)
+        return arrays
+
+    def to_arrow(self):
+        pa = import_optional('pyarrow')
+        arrays = []
+        for name, values in self.columns.items():
+            if not isinstance(values, array.array):
+                arrays.append(pa.array(values, type=pa.string()))
+            elif name in TIMESTAMP_COLUMNS:
+                arrays.append(pa.array(values, type=pa.int64()).cast(pa.timestamp('ms', tz='UTC')))
+            elif values.typecode == 'b':
+                arrays.append(pa.array(values, type=pa.int8()).cast(pa.bool_()))
+            else:
+                arrays.append(pa.array(values, type=pa.float64()))
+        return pa.Table.from_arrays(arrays, names=list(self.columns))
+
+    def to_pandas(self):
+        import_optional('pandas')
+        return self.to_arrow().to_pandas()
+
+    def write_parquet(self, output_file: str, compression: str = 'zstd'):
+        pq = import_optional('pyarrow.parquet')
+        pq.write_table(self.to_arrow(), output_file, compression=compression)
+
+
+def read_mxliff_columns(source_file: str) -> SegmentColumns:
+    obj = SegmentColumns.empty(source_file, MXLIFF)
+    ids, sources, targets = obj.columns['id'], obj.columns['source'], obj.columns['target']
+    scores, gross_scores = obj.columns['score'], obj.columns['gross_score']
+    confirmed, locked = obj.columns['confirmed'], obj.columns['locked']
+    created_at, modified_at = obj.columns['created_at'], obj.columns['modified_at']
+    huge_tree = xmlutil.is_huge(os.path.getsize(source_file))
+    context = etree.iterparse(source_file, events=('end',), tag=XLF_TRANS_UNIT, huge_tree=huge_tree)
+    for _, elem in context:
+        get = elem.get
+        source = None
+        target = None
+        # the first source and target win, as in MxliffTransUnit
+        for child in elem.iterchildren(XLF_SOURCE, XLF_TARGET):
+            if child.tag == XLF_SOURCE:
+                if source is None:
+                    source = child.text or ''
+            elif target is None:
+                target = child.text or ''
+        ids.append(get('id', ''))
+        sources.append(source or '')
+        targets.append(target or '')
+        scores.append(to_float(get(MXLF + 'score', '0')))
+        gross_scores.append(to_float(get(MXLF + 'gross-score', '0')))
+        confirmed.append(get(MXLF + 'confirmed', '') not in ('', '0'))
+        locked.append(get(MXLF + 'locked') != 'false')
+        created_at.append(to_epoch_ms(get(MXLF + 'created-at', '0')))
+        modified_at.append(to_epoch_ms(get(MXLF + 'modified-at', '0')))
+        xmlutil.release(elem)
+    return obj
+
+
+def read_sdlxliff_columns(source_file: str) -> SegmentColumns:
+    obj = SegmentColumns.empty(source_file, SDLXLIFF)
+    ids, sources, targets = obj.columns['id'], obj.columns['source'], obj.columns['target']
+    statuses, origins = obj.columns['status'], obj.columns['origin']
+    scores, confirmed, locked = obj.columns['score'], obj.columns['confirmed'], obj.columns['locked']
+    confirmed_statuses = segmentlib.CONFIRMED_STATUSES[SDLXLIFF]
+    huge_tree = xmlutil.is_huge(os.path.getsize(source_file))
+    with xmlutil.ValidXmlReader(source_file) as reader:
+        context = etree.iterparse(reader, events=('end',), tag=XLF_TRANS_UNIT, huge_tree=huge_tree, encoding='utf-8')
+        for _, elem in context:
+            seg_source = None
+            target = None
+            seg_defs = None
+            # the first of each child wins, as in SdlxliffTransUnit
+            for child in elem.iterchildren(XLF_SEG_SOURCE, XLF_TARGET, SDLXLF_SEG_DEFS):
+                tag = child.tag
+                if tag == XLF_SEG_SOURCE:
+                    if seg_source is None:
+                        seg_source = child
+                elif tag == XLF_TARGET:
+                    if target is None:
+                        target = child
+                elif seg_defs is None:
+                    seg_defs = {seg.get('id', '').replace('_x0020_', ' '): seg for seg in child.iterchildren(SDLXLF_SEG)}
+            if seg_source is not None and target is not None:
+                src_mrks = (e for e in seg_source.iterchildren(XLF_MRK) if e.get('mtype') == 'seg')
+                tgt_mrks = (e for e in target.iterchildren(XLF_MRK) if e.get('mtype') == 'seg')
+                for src_mrk, tgt_mrk in zip(src_mrks, tgt_mrks):
+                    mid = src_mrk.get('mid', '').replace('_x0020_', ' ')
+                    seg = seg_defs.get(mid) if seg_defs is not None else None
+                    status = seg.get('conf', '') if seg is not None else ''
+                    ids.append(mid)
+                    sources.append(xmlutil.tostring(src_mrk))
+                    targets.append(xmlutil.tostring(tgt_mrk))
+                    statuses.append(status)
+                    origins.append(seg.get('origin', '') if seg is not None else '')
+                    scores.append(to_float(seg.get('percent', '0')) if seg is not None else 0.0)
+                    confirmed.append(status in confirmed_statuses)
+                    locked.append(seg is not None and seg.get('locked', 'false') == 'true')
+            xmlutil.release(elem)
+    return obj
+
+
+def read_columns(source_file: str) -> SegmentColumns:
+    format_ = segmentlib.get_format(source_file)
+    if format_ == MXLIFF:
+        return read_mxliff_columns(source_file)
+    if format_ == SDLXLIFF:
+        return read_sdlxliff_columns(source_file)
+    raise TranslatorToolkitError(f'columnar export is not supported for {format_} files: {source_file}')
+
+
+def write_parquet(source_file: str, output_file: str, compression: str = 'zstd') -> int:
+    columns = read_columns(source_file)
+    columns.write_parquet(output_file, compression)
+    return len(columns)
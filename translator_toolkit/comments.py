@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import csv
+import json
+import os
+from typing import Iterable, Iterator, Optional, TextIO
+
+from lxml import etree
+
+from translator_toolkit import segment as segmentlib
+from translator_toolkit.segment import SDLXLIFF
+from translator_toolkit.sdlxliff import SdlxliffComment, SdlxliffDocInfo
+from translator_toolkit.ns import XLF, SDLXLF
+from translator_toolkit.util import xmlutil
+from translator_toolkit.error import TranslatorToolkitError
+
+XLF_FILE = XLF + 'file'
+XLF_TRANS_UNIT = XLF + 'trans-unit'
+XLF_SEG_SOURCE = XLF + 'seg-source'
+XLF_TARGET = XLF + 'target'
+XLF_MRK = XLF + 'mrk'
+SDLXLF_DOC_INFO = SDLXLF + 'doc-info'
+SDLXLF_CMT = SDLXLF + 'cmt'
+SDLXLF_CID = SDLXLF + 'cid'
+
+SIDE_FILE = 'file'
+SIDE_SOURCE = 'source'
+SIDE_TARGET = 'target'
+
+REPORT_COLUMNS = ['source_file', 'segment_id', 'side', 'cid', 'severity', 'user', 'date', 'version', 'comment', 'commented_text', 'source', 'target']
+
+
+class CommentRecord(object):
+    source_file: str
+    segment_id: str
+    side: str
+    cid: str
+    comment: SdlxliffComment
+    commented_text: str
+    source: str
+    target: str
+
+    def __init__(self, source_file: str, segment_id: str, side: str, cid: str, comment: SdlxliffComment, commented_text: str, source: str,
+                 target: str):
+        self.source_file = source_file
+        self.segment_id = segment_id
+        self.side = side
+        self.cid = cid
+        self.comment = comment
+        self.commented_text = commented_text
+        self.source = source
+        self.target = target
+
+    def to_json(self) -> dict:
+        return {
+            'source_file': self.source_file,
+            'segment_id': self.segment_id,
+            'side': self.side,
+            'cid': self.cid,
+            'severity': self.comment.severity,
+            'user': self.comment.user,
+            'date': self.comment.date.isoformat() if self.comment.date else '',
+            'version': self.comment.version,
+            'comment': self.comment.text,
+            'commented_text': self.commented_text,
+            'source': self.source,
+            'target': self.target
+        }
+
+
+def is_seg_mrk(elem: etree._Element) -> bool:
+    return elem.tag == XLF_MRK and elem.get('mtype') == 'seg'
+
+
+def get_plain_text(elem: etree._Element) -> str:
+    return segmentlib.remove_tags(xmlutil.tostring(elem), SDLXLIFF)
+
+
+def iter_commented_segments(container: Optional[etree._Element]) -> Iterator[tuple[etree._Element, str, etree._Element]]:
+    if container is None:
+        return
+    for elem in container.iter(XLF_MRK):
+        cid = elem.get(SDLXLF_CID)
+        if not cid:
+            continue
+        seg = next((e for e in elem.iterancestors(XLF_MRK) if is_seg_mrk(e)), None)
+        if seg is not None:
+            yield seg, cid, elem
+        else:
+            # a comment around whole segments applies to each of them
+            for seg in elem.iter(XLF_MRK):
+                if is_seg_mrk(seg):
+                    yield seg, cid, elem
+
+
+def get_trans_unit_comments(source_file: str, elem: etree._Element, comment_map: dict[str, list[SdlxliffComment]]) -> Iterator[CommentRecord]:
+    seg_source = None
+    target = None
+    # the first seg-source and target win, as in SdlxliffTransUnit
+    for child in elem.iterchildren(XLF_SEG_SOURCE, XLF_TARGET):
+        if child.tag == XLF_SEG_SOURCE:
+            if seg_source is None:
+                seg_source = child
+        elif target is None:
+            target = child
+    texts: dict[tuple[str, str], str] = {}
+    for side, container in ((SIDE_SOURCE, seg_source), (SIDE_TARGET, target)):
+        if container is None:
+            continue
+        for seg in container.iter(XLF_MRK):
+            if is_seg_mrk(seg):
+                texts[side, seg.get('mid', '')] = get_plain_text(seg)
+    for side, container in ((SIDE_SOURCE, seg_source), (SIDE_TARGET, target)):
+        for seg, cid, mrk in iter_commented_segments(container):
+            mid = seg.get('mid', '')
+            commented_text = get_plain_text(mrk)
+            for comment in comment_map.get(cid, []):
+                yield CommentRecord(source_file, mid.replace('_x0020_', ' '), side, cid, comment, commented_text,
+                                    texts.get((SIDE_SOURCE, mid), ''), texts.get((SIDE_TARGET, mid), ''))
+
+
+def iter_comments(source_file: str) -> Iterator[CommentRecord]:
+    if segmentlib.get_format(source_file) != SDLXLIFF:
+        raise TranslatorToolkitError(f'comments are only supported for SDLXLIFF files: {source_file}')
+    huge_tree = xmlutil.is_huge(os.path.getsize(source_file))
+    comment_map: dict[str, list[SdlxliffComment]] = {}
+    with xmlutil.ValidXmlReader(source_file) as reader:
+        context = etree.iterparse(reader, events=('start', 'end'), tag=[SDLXLF_DOC_INFO, XLF_FILE, XLF_TRANS_UNIT, SDLXLF_CMT], huge_tree=huge_tree,
+                                  encoding='utf-8')
+        for event, elem in context:
+            if event == 'start':
+                continue
+            tag = elem.tag
+            if tag == XLF_TRANS_UNIT:
+                if comment_map:
+                    yield from get_trans_unit_comments(source_file, elem, comment_map)
+                xmlutil.release(elem)
+            elif tag == SDLXLF_CMT:
+                # file level comments are referenced from the header
+                cid = elem.get('id', '')
+                for comment in comment_map.get(cid, []):
+                    yield CommentRecord(source_file, '', SIDE_FILE, cid, comment, '', '', '')
+            elif tag == SDLXLF_DOC_INFO:
+                comment_map = SdlxliffDocInfo.from_element(elem).get_comment_map()
+                xmlutil.release(elem)
+
+
+def get_comments(source_file: str) -> list[CommentRecord]:
+    return list(iter_comments(source_file))
+
+
+def iter_files_comments(source_files: Iterable[str], max_workers: int = 1) -> Iterator[CommentRecord]:
+    source_files = list(source_files)
+    if max_workers <= 1 or len(source_files) < 2:
+        for source_file in source_files:
+            yield from iter_comments(source_file)
+        return
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for records in executor.map(get_comments, source_files, chunksize=max(1, len(source_files) // (max_workers * 4))):
+            yield from records
+
+
+def write_report(records: Iterable[CommentRecord], outfile: TextIO, format_: str = 'csv') -> int:
+    count = 0
+    if format_ == 'jsonl':
+        for record in records:
+            outfile.write(json.dumps(record.to_json(), ensure_ascii=False) + '\n')
+            count += 1
+    else:
+        writer = csv.writer(outfile)
+        writer.writerow(REPORT_COLUMNS)
+        for record in records:
+            obj = record.to_json()
+            writer.writerow([obj[c] for c in REPORT_COLUMNS])
+            count += 1
+    return count
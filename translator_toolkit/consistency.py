@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import array
+import csv
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, Optional, TextIO, Union
+
+from translator_toolkit import segment as segmentlib
+from translator_toolkit.segment import Segment
+from translator_toolkit.sdlxliff import Sdlxliff
+from translator_toolkit.mxliff import Mxliff
+from translator_toolkit.util import stringutil
+
+# same source translated differently / same target used for different sources
+KIND_SOURCE = 'source'
+KIND_TARGET = 'target'
+
+REPORT_COLUMNS = ['kind', 'group', 'text', 'variant', 'variant_text', 'source_file', 'segment_id']
+
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+
+def normalize_text(text: str, ignore_case: bool = False) -> str:
+    text = WHITESPACE_PATTERN.sub(' ', text).strip()
+    return text.casefold() if ignore_case else text
+
+
+class ConsistencyVariant(object):
+    text: str
+    locations: list[tuple[str, str]]
+
+    def __init__(self, text: str, locations: list[tuple[str, str]]):
+        self.text = text
+        self.locations = locations
+
+
+class Inconsistency(object):
+    kind: str
+    text: str
+    variants: list[ConsistencyVariant]
+
+    def __init__(self, kind: str, text: str, variants: list[ConsistencyVariant]):
+        self.kind = kind
+        self.text = text
+        self.variants = variants
+
+    def to_json(self) -> dict:
+        return {
+            'kind': self.kind,
+            'text': self.text,
+            'variants': [{'text': v.text, 'locations': [list(loc) for loc in v.locations]} for v in self.variants]
+        }
+
+
+class ConsistencyIndex(object):
+    ignore_case: bool
+    files: list[str]
+    segment_ids: list[str]
+    file_ids: array.array
+    texts: dict[int, str]
+    targets: dict[int, dict[int, array.array]]
+    sources: dict[int, set[int]]
+
+    def __init__(self, ignore_case: bool = False):
+        self.ignore_case = ignore_case
+        self.files = []
+        # one entry per indexed segment
+        self.segment_ids = []
+        self.file_ids = array.array('q')
+        # hash -> first seen text, shared by sources and targets
+        self.texts = {}
+        # source hash -> target hash -> segment indices
+        self.targets = {}
+        # target hash -> source hashes
+        self.sources = {}
+        self._file_ids: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.segment_ids)
+
+    def add(self, segment: Segment):
+        source = normalize_text(segment.plain_source, self.ignore_case)
+        target = normalize_text(segment.plain_target, self.ignore_case)
+        if not source or not target:
+            return
+        file_id = self._file_ids.get(segment.source_file)
+        if file_id is None:
+            file_id = self._file_ids[segment.source_file] = len(self.files)
+            self.files.append(segment.source_file)
+        index = len(self.segment_ids)
+        self.segment_ids.append(segment.id)
+        self.file_ids.append(file_id)
+        source_hash = stringutil.hash_text(source)
+        target_hash = stringutil.hash_text(target)
+        self.texts.setdefault(source_hash, source)
+        self.texts.setdefault(target_hash, target)
+        targets = self.targets.get(source_hash)
+        if targets is None:
+            targets = self.targets[source_hash] = {}
+        indices = targets.get(target_hash)
+        if indices is None:
+            indices = targets[target_hash] = array.array('q')
+        indices.append(index)
+        self.sources.setdefault(target_hash, set()).add(source_hash)
+
+    def add_segments(self, segments: Iterable[Segment]):
+        for segment in segments:
+            self.add(segment)
+
+    def add_document(self, doc: Union[Sdlxliff, Mxliff]):
+        self.add_segments(segmentlib.iter_segments(doc))
+
+    def add_file(self, source_file: str):
+        self.add_segments(segmentlib.stream_segments(source_file))
+
+    def merge(self, other: ConsistencyIndex):
+        file_map = array.array('q')
+        for source_file in other.files:
+            file_id = self._file_ids.get(source_file)
+            if file_id is None:
+                file_id = self._file_ids[source_file] = len(self.files)
+                self.files.append(source_file)
+            file_map.append(file_id)
+        offset = len(self.segment_ids)
+        self.segment_ids.extend(other.segment_ids)
+        self.file_ids.extend(file_map[i] for i in other.file_ids)
+        for key, text in other.texts.items():
+            self.texts.setdefault(key, text)
+        for source_hash, other_targets in other.targets.items():
+            targets = self.targets.setdefault(source_hash, {})
+            for target_hash, other_indices in other_targets.items():
+                indices = targets.get(target_hash)
+                if indices is None:
+                    indices = targets[target_hash] = array.array('q')
+                indices.extend(i + offset for i in other_indices)
+        for target_hash, source_hashes in other.sources.items():
+            self.sources.setdefault(target_hash, set()).update(source_hashes)
+
+    def get_locations(self, indices: Iterable[int]) -> list[tuple[str, str]]:
+        return [(self.files[self.file_ids[i]], self.segment_ids[i]) for i in indices]
+
+    def get_inconsistencies(self, kind: Optional[str] = None) -> Iterator[Inconsistency]:
+        if kind in (None, KIND_SOURCE):
+            for source_hash, targets in self.targets.items():
+                if len(targets) < 2:
+                    continue
+                variants = [ConsistencyVariant(self.texts[t], self.get_locations(indices)) for t, indices in targets.items()]
+                yield Inconsistency(KIND_SOURCE, self.texts[source_hash], variants)
+        if kind in (None, KIND_TARGET):
+            for target_hash, source_hashes in self.sources.items():
+                if len(source_hashes) < 2:
+                    continue
+                # keep the order in which the sources were first seen
+                ordered = sorted(source_hashes, key=lambda s: self.targets[s][target_hash][0])
+                variants = [ConsistencyVariant(self.texts[s], self.get_locations(self.targets[s][target_hash])) for s in ordered]
+                yield Inconsistency(KIND_TARGET, self.texts[target_hash], variants)
+
+
+def _index_files(source_files: list[str], ignore_case: bool) -> ConsistencyIndex:
+    index = ConsistencyIndex(ignore_case)
+    for source_file in source_files:
+        index.add_file(source_file)
+    return index
+
+
+def check_files(source_files: Iterable[str], max_workers: Optional[int] = None, ignore_case: bool = False) -> ConsistencyIndex:
+    source_files = list(source_files)
+    if max_workers == 1 or len(source_files) < 2:
+        return _index_files(source_files, ignore_case)
+    max_workers = max_workers or os.cpu_count() or 1
+    # several shards per worker keep the workers busy when file sizes differ, merging them in order gives the sequential result
+    shard_size = -(-len(source_files) // min(len(source_files), max_workers * 4))
+    shards = [source_files[i:i + shard_size] for i in range(0, len(source_files), shard_size)]
+    index = ConsistencyIndex(ignore_case)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        for shard in executor.map(_index_files, shards, [ignore_case] * len(shards)):
+            index.merge(shard)
+    return index
+
+
+def write_report(inconsistencies: Iterable[Inconsistency], outfile: TextIO, format_: str = 'csv') -> int:
+    count = 0
+    if format_ == 'jsonl':
+        for inconsistency in inconsistencies:
+            outfile.write(json.dumps(inconsistency.to_json(), ensure_ascii=False) + '\n')
+            count += 1
+    else:
+        writer = csv.writer(outfile)
+        writer.writerow(REPORT_COLUMNS)
+        for inconsistency in inconsistencies:
+            count += 1
+            for variant_index, variant in enumerate(inconsistency.variants, 1):
+                for source_file, segment_id in variant.locations:
+                    writer.writerow([inconsistency.kind, count, inconsistency.text, variant_index, variant.text, source_file, segment_id])
+    return count
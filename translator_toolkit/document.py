@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+from typing import Iterable, Iterator, Optional, Union
+
+from translator_toolkit import segment as segmentlib
+from translator_toolkit.segment import Segment
+from translator_toolkit.sdlxliff import Sdlxliff
+from translator_toolkit.mxliff import Mxliff
+from translator_toolkit.xliff import Xliff
+from translator_toolkit.xliff2 import Xliff2
+
+
+class Document(object):
+    source_file: str
+    format: str
+
+    def __init__(self, source_file: str, format_: str):
+        self.source_file = source_file
+        self.format = format_
+
+    def __iter__(self) -> Iterator[Segment]:
+        return self.segments()
+
+    def __repr__(self) -> str:
+        return f'Document({self.source_file!r}, {self.format!r})'
+
+    def segments(self) -> Iterator[Segment]:
+        return segmentlib.stream_segments(self.source_file, self.format)
+
+    def load(self) -> Union[Sdlxliff, Mxliff, Xliff, Xliff2]:
+        return segmentlib.load(self.source_file, self.format)
+
+
+def open_document(source_file: str, format_: Optional[str] = None) -> Document:
+    return Document(source_file, format_ or segmentlib.get_format(source_file))
+
+
+def stream_segments(source_files: Iterable[str]) -> Iterator[Segment]:
+    for source_file in source_files:
+        yield from open_document(source_file)
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import csv
+import itertools
+import json
+from typing import BinaryIO, Iterable, TextIO
+
+from lxml import etree
+
+from translator_toolkit import __version__
+from translator_toolkit import segment as segmentlib
+from translator_toolkit.segment import Segment
+from translator_toolkit.ns import XML
+from translator_toolkit.error import TranslatorToolkitError
+
+FORMATS = {
+    'xjson': '.json',
+    'jsonl': '.jsonl',
+    'tmx': '.tmx',
+    'csv': '.csv'
+}
+
+
+def write_xjson(source_file: str, outfile: TextIO):
+    doc = segmentlib.load(source_file)
+    json.dump(doc.to_json(), outfile, ensure_ascii=False, indent=2)
+
+
+def write_jsonl(segments: Iterable[Segment], outfile: TextIO) -> int:
+    count = 0
+    for segment in segments:
+        outfile.write(json.dumps(segment.to_json(), ensure_ascii=False) + '\n')
+        count += 1
+    return count
+
+
+def write_csv(segments: Iterable[Segment], outfile: TextIO) -> int:
+    writer = csv.writer(outfile)
+    writer.writerow(['id', 'source', 'target', 'srclang', 'tgtlang', 'status', 'score', 'locked'])
+    count = 0
+    for s in segments:
+        writer.writerow([s.id, s.source, s.target, s.srclang, s.tgtlang, s.status, s.score, s.locked])
+        count += 1
+    return count
+
+
+def write_tmx(segments: Iterable[Segment], outfile: BinaryIO) -> int:
+    segments = iter(segments)
+    first = next(segments, None)
+    count = 0
+    with etree.xmlfile(outfile, encoding='UTF-8') as xf:
+        xf.write_declaration()
+        with xf.element('tmx', version='1.4'):
+            xf.write(etree.Element('header', {
+                'creationtool': 'translator-toolkit',
+                'creationtoolversion': __version__,
+                'segtype': 'sentence',
+                'o-tmf': 'translator-toolkit',
+                'adminlang': 'en-US',
+                'srclang': first.srclang if first else '*all*',
+                'datatype': 'plaintext'
+            }))
+            with xf.element('body'):
+                xf.write('\n')
+                for segment in itertools.chain([first] if first else [], segments):
+                    target = segment.plain_target
+                    if not target:
+                        continue
+                    tu = etree.Element('tu', tuid=segment.id)
+                    for lang, text in ((segment.srclang, segment.plain_source), (segment.tgtlang, target)):
+                        tuv = etree.SubElement(tu, 'tuv', {XML + 'lang': lang})
+                        etree.SubElement(tuv, 'seg').text = text
+                    xf.write(tu, '\n')
+                    count += 1
+    return count
+
+
+def convert_file(source_file: str, output_file: str, format_: str) -> int:
+    if format_ not in FORMATS:
+        raise TranslatorToolkitError(f'unsupported format: {format_}')
+    if format_ == 'tmx':
+        with open(output_file, 'wb') as outfile:
+            return write_tmx(segmentlib.stream_segments(source_file), outfile)
+    with open(output_file, 'w', encoding='utf-8', newline='' if format_ == 'csv' else None) as outfile:
+        if format_ == 'xjson':
+            write_xjson(source_file, outfile)
+            return 1
+        if format_ == 'csv':
+            return write_csv(segmentlib.stream_segments(source_file), outfile)
+        return write_jsonl(segmentlib.stream_segments(source_file), outfile)
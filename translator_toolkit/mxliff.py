@@ -1,14 +1,52 @@
 #!/usr/bin/env python3
 from __future__ import annotations
-from typing import Iterator
-from datetime import datetime
+import os
+import sys
+from typing import Iterator, Iterable, Optional, AbstractSet, Mapping
+from datetime import datetime, timezone
 from lxml import etree
 
+from translator_toolkit import backend as backendlib
 from translator_toolkit.error import TranslatorToolkitError
 from translator_toolkit.ns import XLF, MXLF
 from translator_toolkit.util import xmlutil, stringutil
 from translator_toolkit.xjson import XUnit, XGroup, XFile, XDocument
 
+MXLIFF_FIELDS = frozenset(['id', 'source', 'target', 'm_trans_origin', 'm_score', 'm_gross_score', 'm_confirmed', 'm_locked',
+                           'm_para_id', 'm_created_at', 'm_created_by', 'm_modified_at', 'm_modified_by', 'm_level_edited',
+                           'alt_trans_units', 'context_groups'])
+
+EPOCH = datetime.fromtimestamp(0, timezone.utc)
+
+XLF_SOURCE = XLF + 'source'
+XLF_TARGET = XLF + 'target'
+XLF_ALT_TRANS = XLF + 'alt-trans'
+XLF_FILE = XLF + 'file'
+XLF_TRANS_UNIT = XLF + 'trans-unit'
+
+
+def get_fields(fields: Optional[Iterable[str]]) -> AbstractSet[str]:
+    if fields is None:
+        return MXLIFF_FIELDS
+    fields = frozenset(fields)
+    unknown = fields - MXLIFF_FIELDS
+    if unknown:
+        raise TranslatorToolkitError(f'unknown fields: {", ".join(sorted(unknown))}')
+    return fields
+
+
+def get_prune_tags(fields: AbstractSet[str]) -> list[str]:
+    tags = [XLF + 'header', MXLF + 'editing-stats']
+    if 'alt_trans_units' not in fields:
+        tags.append(XLF + 'alt-trans')
+    if 'context_groups' not in fields:
+        tags.append(XLF + 'context-group')
+    if 'source' not in fields:
+        tags.append(XLF + 'source')
+    if 'target' not in fields and 'alt_trans_units' not in fields:
+        tags.append(XLF + 'target')
+    return tags
+
 
 class MxliffAltTrans(object):
     match_quality: float
@@ -22,11 +60,18 @@ class MxliffAltTrans(object):
 
     @classmethod
     def from_element(cls, elem: etree._Element) -> MxliffAltTrans:
-        origin = elem.get('origin', '')
-        v = elem.get('match-quality', '0')
+        target = ''
+        for child in elem.iterchildren():
+            if child.tag == XLF_TARGET:
+                target = child.text or ''
+                break
+        return MxliffAltTrans.from_attrib(elem.attrib, target)
+
+    @classmethod
+    def from_attrib(cls, attrib: Mapping[str, str], target: str) -> MxliffAltTrans:
+        origin = sys.intern(attrib.get('origin', ''))
+        v = attrib.get('match-quality', '0')
         match_quality = float(v) if stringutil.is_float(v) else 0
-        target_elem = elem.find(f'./{XLF}target')
-        target = target_elem.text or '' if target_elem is not None else ''
         obj = MxliffAltTrans(origin, match_quality, target)
         return obj
 
@@ -68,34 +113,58 @@ class MxliffTransUnit(object):
         self.alt_trans_units = alt_trans_units
 
     @classmethod
-    def from_element(cls, elem: etree._Element) -> MxliffTransUnit:
-        id_ = elem.get('id', '')
-        m_trans_origin = elem.get(MXLF + 'trans-origin', '')
-        m_confirmed = elem.get(MXLF + 'confirmed', '')
-        m_locked = True if elem.get(MXLF + 'locked') != 'false' else False
-        v = elem.get(MXLF + 'score', '0')
-        m_score = float(v) if stringutil.is_float(v) else 0
-        v = elem.get(MXLF + 'gross-score', '0')
-        m_gross_score = float(v) if stringutil.is_float(v) else 0
-        m_para_id = elem.get(MXLF + 'para-id', '')
-
-        v = elem.get(MXLF + 'created-at', '0')
-        m_created_at = stringutil.unixtime_to_datetime(v)
-
-        m_created_by = elem.get(MXLF + 'created-by', '')
-
-        v = elem.get(MXLF + 'modified-at', '0')
-        m_modified_at = stringutil.unixtime_to_datetime(v)
-
-        m_modified_by = elem.get(MXLF + 'modified-by', '')
-        m_level_edited = elem.get(MXLF + 'level-edited') == 'true'
-
-        source_elem = elem.find(f'./{XLF}source')
-        target_elem = elem.find(f'./{XLF}target')
-        source = source_elem.text or '' if source_elem is not None else ''
-        target = target_elem.text or '' if target_elem is not None else ''
+    def from_element(cls, elem: etree._Element, fields: AbstractSet[str] = MXLIFF_FIELDS) -> MxliffTransUnit:
+        source = None
+        target = None
+        alt_trans_units = []
+        with_source = 'source' in fields
+        with_target = 'target' in fields
+        with_alt_trans = 'alt_trans_units' in fields
+        # the first source and target win, as with find()
+        for child in elem.iterchildren():
+            tag = child.tag
+            if tag == XLF_SOURCE:
+                if with_source and source is None:
+                    source = child.text or ''
+            elif tag == XLF_TARGET:
+                if with_target and target is None:
+                    target = child.text or ''
+            elif tag == XLF_ALT_TRANS:
+                if with_alt_trans:
+                    alt_trans_units.append(MxliffAltTrans.from_element(child))
+        return MxliffTransUnit.from_attrib(elem.attrib, source or '', target or '', alt_trans_units, fields)
 
-        alt_trans_units = [MxliffAltTrans.from_element(e) for e in elem.iterchildren(XLF + 'alt-trans')]
+    @classmethod
+    def from_attrib(cls, attrib: Mapping[str, str], source: str, target: str, alt_trans_units: list[MxliffAltTrans],
+                    fields: AbstractSet[str] = MXLIFF_FIELDS) -> MxliffTransUnit:
+        id_ = attrib.get('id', '') if 'id' in fields else ''
+        m_trans_origin = sys.intern(attrib.get(MXLF + 'trans-origin', '')) if 'm_trans_origin' in fields else ''
+        m_confirmed = sys.intern(attrib.get(MXLF + 'confirmed', '')) if 'm_confirmed' in fields else ''
+        m_locked = attrib.get(MXLF + 'locked') != 'false' if 'm_locked' in fields else False
+        m_score = 0.0
+        if 'm_score' in fields:
+            v = attrib.get(MXLF + 'score', '0')
+            m_score = float(v) if stringutil.is_float(v) else 0
+        m_gross_score = 0.0
+        if 'm_gross_score' in fields:
+            v = attrib.get(MXLF + 'gross-score', '0')
+            m_gross_score = float(v) if stringutil.is_float(v) else 0
+        m_para_id = attrib.get(MXLF + 'para-id', '') if 'm_para_id' in fields else ''
+
+        m_created_at = EPOCH
+        if 'm_created_at' in fields:
+            v = attrib.get(MXLF + 'created-at', '0')
+            m_created_at = stringutil.unixtime_to_datetime(v)
+
+        m_created_by = sys.intern(attrib.get(MXLF + 'created-by', '')) if 'm_created_by' in fields else ''
+
+        m_modified_at = EPOCH
+        if 'm_modified_at' in fields:
+            v = attrib.get(MXLF + 'modified-at', '0')
+            m_modified_at = stringutil.unixtime_to_datetime(v)
+
+        m_modified_by = sys.intern(attrib.get(MXLF + 'modified-by', '')) if 'm_modified_by' in fields else ''
+        m_level_edited = attrib.get(MXLF + 'level-edited') == 'true' if 'm_level_edited' in fields else False
 
         obj = MxliffTransUnit(id_, source, target, m_trans_origin, m_score, m_gross_score, m_confirmed, m_locked,
                               m_para_id, m_created_at, m_created_by, m_modified_at, m_modified_by, m_level_edited,
@@ -124,7 +193,7 @@ class MxliffContext(object):
 
     @classmethod
     def from_element(cls, elem: etree._Element) -> MxliffContext:
-        context_type = elem.get('context_type', '')
+        context_type = sys.intern(elem.get('context-type', ''))
         value = elem.text or ''
         obj = MxliffContext(context_type, value)
         return obj
@@ -157,11 +226,13 @@ class MxliffGroup(object):
         self.trans_units = trans_units
 
     @classmethod
-    def from_element(cls, elem: etree._Element) -> MxliffGroup:
+    def from_element(cls, elem: etree._Element, fields: AbstractSet[str] = MXLIFF_FIELDS) -> MxliffGroup:
         id_ = elem.get('id', '')
         m_para_id = elem.get(MXLF + 'para-id', '')
-        context_groups = [MxliffContextGroup.from_element(e) for e in elem.iterchildren(XLF + 'context-group')]
-        trans_units = [MxliffTransUnit.from_element(e) for e in elem.iterchildren(XLF + 'trans-unit')]
+        context_groups = []
+        if 'context_groups' in fields:
+            context_groups = [MxliffContextGroup.from_element(e) for e in elem.iterchildren(XLF + 'context-group')]
+        trans_units = [MxliffTransUnit.from_element(e, fields) for e in elem.iterchildren(XLF + 'trans-unit')]
         obj = MxliffGroup(id_, m_para_id, context_groups, trans_units)
         return obj
 
@@ -182,8 +253,14 @@ class MxliffBody(object):
         self.gruops = groups
 
     @classmethod
-    def from_element(cls, elem: etree._Element) -> MxliffBody:
-        groups = [MxliffGroup.from_element(e) for e in elem.iterchildren(XLF + 'group')]
+    def from_element(cls, elem: etree._Element, fields: AbstractSet[str] = MXLIFF_FIELDS,
+                     context_index: Optional[MxliffContextIndex] = None, file_index: int = 0) -> MxliffBody:
+        groups = []
+        for e in elem.iterchildren(XLF + 'group'):
+            group = MxliffGroup.from_element(e, fields)
+            if context_index is not None:
+                context_index.add_group(file_index, group)
+            groups.append(group)
         obj = MxliffBody(groups)
         return obj
 
@@ -208,20 +285,24 @@ class MxliffFile(object):
         self.body = body
 
     @classmethod
-    def from_element(cls, elem: etree._Element) -> MxliffFile:
-        original = elem.get('original', '')
-        datatype = elem.get('datatype', '')
-        source_language = elem.get('source-language', '')
-        target_language = elem.get('target-language', '')
-        m_file_format = elem.get(MXLF + 'file-format', '')
-        m_task_id = elem.get(MXLF + 'task-id', '')
-
+    def from_element(cls, elem: etree._Element, fields: AbstractSet[str] = MXLIFF_FIELDS,
+                     context_index: Optional[MxliffContextIndex] = None, file_index: int = 0) -> MxliffFile:
         body_elem = elem.find(f'./{XLF}body')
         if body_elem is None:
             raise TranslatorToolkitError('body element not found')
-        body = MxliffBody.from_element(body_elem)
+        obj = MxliffFile.from_header(elem.attrib)
+        obj.body = MxliffBody.from_element(body_elem, fields, context_index, file_index)
+        return obj
 
-        obj = MxliffFile(source_language, target_language, original, datatype, m_file_format, m_task_id, body)
+    @classmethod
+    def from_header(cls, attrib: Mapping[str, str]) -> MxliffFile:
+        original = attrib.get('original', '')
+        datatype = sys.intern(attrib.get('datatype', ''))
+        source_language = sys.intern(attrib.get('source-language', ''))
+        target_language = sys.intern(attrib.get('target-language', ''))
+        m_file_format = sys.intern(attrib.get(MXLF + 'file-format', ''))
+        m_task_id = attrib.get(MXLF + 'task-id', '')
+        obj = MxliffFile(source_language, target_language, original, datatype, m_file_format, m_task_id, MxliffBody([]))
         return obj
 
     def to_json(self) -> XFile:
@@ -237,6 +318,87 @@ class MxliffFile(object):
         return obj
 
 
+class MxliffContextIndex(object):
+    trans_units: list[MxliffTransUnit]
+    groups: list[MxliffGroup]
+    file_indices: list[int]
+
+    def __init__(self):
+        # one entry per trans-unit in document order
+        self.trans_units = []
+        self.groups = []
+        self.file_indices = []
+        self._positions: dict[str, int] = {}
+        self._paragraphs: dict[tuple[int, str], list[int]] = {}
+        # context-type -> first value, shared by the trans-units of a group
+        self._contexts: list[dict[str, str]] = []
+
+    @classmethod
+    def from_files(cls, files: list[MxliffFile]) -> MxliffContextIndex:
+        obj = MxliffContextIndex()
+        for file_index, file in enumerate(files):
+            for group in file.body.gruops:
+                obj.add_group(file_index, group)
+        return obj
+
+    def add_group(self, file_index: int, group: MxliffGroup):
+        contexts: dict[str, str] = {}
+        for context_group in group.context_groups:
+            for context in context_group.contexts:
+                contexts.setdefault(context.context_type, context.value)
+        for tu in group.trans_units:
+            position = len(self.trans_units)
+            self.trans_units.append(tu)
+            self.groups.append(group)
+            self.file_indices.append(file_index)
+            self._contexts.append(contexts)
+            # a duplicate id refers to the last trans-unit, as in MxliffSnapshot
+            self._positions[tu.id] = position
+            para_id = tu.m_para_id or group.m_para_id
+            self._paragraphs.setdefault((file_index, para_id), []).append(position)
+
+    def get_position(self, id_: str) -> int:
+        position = self._positions.get(id_)
+        if position is None:
+            raise TranslatorToolkitError(f'trans-unit not found: {id_}')
+        return position
+
+    def get(self, id_: str) -> Optional[MxliffTransUnit]:
+        position = self._positions.get(id_)
+        return self.trans_units[position] if position is not None else None
+
+    def get_group(self, id_: str) -> MxliffGroup:
+        return self.groups[self.get_position(id_)]
+
+    def get_neighbours(self, id_: str, before: int = 1, after: int = 1) -> tuple[list[MxliffTransUnit], list[MxliffTransUnit]]:
+        # neighbours never cross a file boundary
+        position = self.get_position(id_)
+        file_index = self.file_indices[position]
+        start = position
+        while start > 0 and position - start < before and self.file_indices[start - 1] == file_index:
+            start -= 1
+        end = position + 1
+        while end < len(self.trans_units) and end - position - 1 < after and self.file_indices[end] == file_index:
+            end += 1
+        return self.trans_units[start:position], self.trans_units[position + 1:end]
+
+    def get_previous(self, id_: str) -> Optional[MxliffTransUnit]:
+        previous, _ = self.get_neighbours(id_, 1, 0)
+        return previous[0] if previous else None
+
+    def get_next(self, id_: str) -> Optional[MxliffTransUnit]:
+        _, next_ = self.get_neighbours(id_, 0, 1)
+        return next_[0] if next_ else None
+
+    def get_paragraph(self, id_: str) -> list[MxliffTransUnit]:
+        position = self.get_position(id_)
+        para_id = self.trans_units[position].m_para_id or self.groups[position].m_para_id
+        return [self.trans_units[i] for i in self._paragraphs[self.file_indices[position], para_id]]
+
+    def get_contexts(self, id_: str) -> dict[str, str]:
+        return self._contexts[self.get_position(id_)]
+
+
 class Mxliff(object):
     source_file: str
     level: int
@@ -250,19 +412,41 @@ class Mxliff(object):
         self.version = version
         self.m_version = m_version
         self.files = files
+        self._context_index: Optional[MxliffContextIndex] = None
 
     @classmethod
-    def load(cls, source_file: str) -> Mxliff:
-        parser = xmlutil.get_parser(source_file)
-        root = etree.parse(source_file, parser=parser).getroot()
+    def load(cls, source_file: str, fields: Optional[Iterable[str]] = None) -> Mxliff:
+        fields = get_fields(fields)
+        huge_tree = xmlutil.is_huge(os.path.getsize(source_file))
+        root = xmlutil.parse_pruned(source_file, get_prune_tags(fields), huge_tree=huge_tree)
         level = int(root.get(MXLF + 'level', 1))
         version = root.get('version', '')
         m_version = root.get(MXLF + 'version', '')
-        files = [MxliffFile.from_element(e) for e in root.iterchildren(XLF + 'file')]
+        # the context index is filled while the groups are parsed
+        context_index = MxliffContextIndex()
+        files = [MxliffFile.from_element(e, fields, context_index, i) for i, e in enumerate(root.iterchildren(XLF + 'file'))]
         obj = Mxliff(source_file, level, version, m_version, files)
-
+        obj._context_index = context_index
         return obj
 
+    @classmethod
+    def stream_trans_units(cls, source_file: str, fields: Optional[Iterable[str]] = None,
+                           backend: Optional[str] = None) -> Iterator[tuple[MxliffFile, MxliffTransUnit]]:
+        fields = get_fields(fields)
+        if backendlib.get_backend(backend) == backendlib.EXPAT:
+            yield from backendlib.stream_mxliff_trans_units(source_file, fields)
+            return
+        huge_tree = xmlutil.is_huge(os.path.getsize(source_file))
+        file = None
+        context = etree.iterparse(source_file, events=('start', 'end'), tag=[XLF_FILE, XLF_TRANS_UNIT], huge_tree=huge_tree)
+        for event, elem in context:
+            if elem.tag == XLF_FILE:
+                if event == 'start':
+                    file = MxliffFile.from_header(elem.attrib)
+            elif event == 'end' and file is not None:
+                yield file, MxliffTransUnit.from_element(elem, fields)
+                xmlutil.release(elem)
+
     def to_json(self) -> XDocument:
         obj: XDocument = {
             'source_file': self.source_file,
@@ -271,6 +455,12 @@ class Mxliff(object):
         }
         return obj
 
+    def get_context_index(self) -> MxliffContextIndex:
+        # documents that were not loaded from a file index their files on first use
+        if self._context_index is None:
+            self._context_index = MxliffContextIndex.from_files(self.files)
+        return self._context_index
+
     def get_all_trans_units(self) -> Iterator[MxliffTransUnit]:
         for file in self.files:
             for group in file.body.gruops:
@@ -4,9 +4,11 @@ XMLNS = 'http://www.w3.org/XML/1998/namespace'
 XML = '{%s}' % XMLNS
 
 XLFNS = 'urn:oasis:names:tc:xliff:document:1.2'
+XLF2NS = 'urn:oasis:names:tc:xliff:document:2.0'
 MXLFNS = 'http://www.memsource.com/mxlf/2.0'
 SDLXLFNS = 'http://sdl.com/FileTypes/SdlXliff/1.0'
 XLF = '{%s}' % XLFNS
+XLF2 = '{%s}' % XLF2NS
 MXLF = '{%s}' % MXLFNS
 SDLXLF = '{%s}' % SDLXLFNS
 
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import collections
+import os
+import shutil
+import tempfile
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Optional, Union
+
+from lxml import etree
+
+from translator_toolkit import segment as segmentlib
+from translator_toolkit import writeback
+from translator_toolkit.segment import Segment, SDLXLIFF, MXLIFF
+from translator_toolkit.sdlxliff import SdlxliffFile, SdlxliffTransUnit
+from translator_toolkit.mxliff import MxliffFile, MxliffTransUnit
+from translator_toolkit.split import iter_leaves, is_unit
+from translator_toolkit.ns import XLF
+from translator_toolkit.writeback import TargetUpdate
+from translator_toolkit.util import xmlstream
+from translator_toolkit.util.xmlstream import Container
+from translator_toolkit.error import TranslatorToolkitError
+
+XLF_TRANS_UNIT = XLF + 'trans-unit'
+
+BATCH_SIZE = 500
+
+TransformResult = Union[str, TargetUpdate, None]
+Transform = Callable[[Segment], TransformResult]
+
+
+class PendingLeaf(object):
+    path: tuple[Container, ...]
+    data: bytes
+    ids: list[str]
+
+    def __init__(self, path: tuple[Container, ...], data: bytes, ids: list[str]):
+        self.path = path
+        self.data = data
+        self.ids = ids
+
+
+class Batch(object):
+    leaves: list[PendingLeaf]
+    segments: list[Segment]
+
+    def __init__(self):
+        self.leaves = []
+        self.segments = []
+
+
+def get_leaf_segments(source_file: str, format_: str, path: tuple[Container, ...], elem: etree._Element) -> list[Segment]:
+    file_attrib = path[-2].attrib
+    if format_ == SDLXLIFF:
+        sdlxliff_file = SdlxliffFile.from_header(file_attrib)
+        return [s for tu in elem.iter(XLF_TRANS_UNIT) for s in segmentlib.get_sdlxliff_segments(source_file, sdlxliff_file, SdlxliffTransUnit.from_element(tu))]
+    mxliff_file = MxliffFile.from_header(file_attrib)
+    return [segmentlib.get_mxliff_segment(source_file, mxliff_file, MxliffTransUnit.from_element(tu)) for tu in elem.iter(XLF_TRANS_UNIT)]
+
+
+def transform_batch(func: Transform, segments: list[Segment]) -> list[Optional[TargetUpdate]]:
+    updates = []
+    for segment in segments:
+        result = func(segment)
+        if isinstance(result, str):
+            result = TargetUpdate(result)
+        if result is not None and result.target == segment.target and result.status is None:
+            result = None
+        updates.append(result)
+    return updates
+
+
+class CompletedFuture(Future):
+    def __init__(self, result):
+        super().__init__()
+        self.set_result(result)
+
+
+def transform(source_file: str, func: Transform, output_file: Optional[str] = None, max_workers: Optional[int] = None,
+              batch_size: int = BATCH_SIZE, max_pending: Optional[int] = None) -> int:
+    format_ = segmentlib.get_format(source_file)
+    if format_ == SDLXLIFF:
+        update_unit = writeback.update_sdlxliff_unit
+    elif format_ == MXLIFF:
+        update_unit = writeback.update_mxliff_unit
+    else:
+        raise TranslatorToolkitError(f'transform is not supported for {format_} files: {source_file}')
+    if batch_size < 1:
+        raise TranslatorToolkitError(f'invalid batch size: {batch_size}')
+    max_workers = max_workers or os.cpu_count() or 1
+    executor = ProcessPoolExecutor(max_workers=max_workers) if max_workers > 1 else None
+    # batches waiting for their results, bounded so that reading blocks instead of buffering the whole file
+    max_pending = max_pending or 2 * max_workers
+    pending: collections.deque[tuple[Future, Batch]] = collections.deque()
+    output_file = output_file or source_file
+    fd, temp_file = tempfile.mkstemp(suffix='.tmp', dir=os.path.dirname(os.path.abspath(output_file)))
+    count = 0
+
+    def submit(batch: Batch):
+        if executor is not None and batch.segments:
+            future = executor.submit(transform_batch, func, batch.segments)
+        else:
+            future = CompletedFuture(transform_batch(func, batch.segments))
+        pending.append((future, batch))
+
+    def write_next() -> int:
+        future, batch = pending.popleft()
+        updates = dict(zip((s.id for s in batch.segments), future.result()))
+        written = 0
+        for leaf in batch.leaves:
+            leaf_updates = {id_: updates[id_] for id_ in leaf.ids if updates.get(id_) is not None}
+            data = leaf.data
+            if leaf_updates:
+                elem = etree.fromstring(data)
+                for tu in elem.iter(XLF_TRANS_UNIT):
+                    written += update_unit(tu, leaf_updates)
+                data = xmlstream.serialize(elem)
+            writer.write(leaf.path, data)
+        return written
+
+    try:
+        with os.fdopen(fd, 'wb') as outfile:
+            writer = xmlstream.XmlStreamWriter(outfile)
+            batch = Batch()
+            for path, elem in iter_leaves(source_file, format_):
+                segments = get_leaf_segments(source_file, format_, path, elem) if is_unit(path) else []
+                batch.leaves.append(PendingLeaf(path, xmlstream.serialize(elem), [s.id for s in segments]))
+                batch.segments.extend(segments)
+                if len(batch.segments) >= batch_size:
+                    submit(batch)
+                    batch = Batch()
+                    while len(pending) >= max_pending:
+                        count += write_next()
+            submit(batch)
+            while pending:
+                count += write_next()
+            writer.close()
+        shutil.copymode(source_file, temp_file)
+        os.replace(temp_file, output_file)
+    except BaseException:
+        for future, _ in pending:
+            future.cancel()
+        os.remove(temp_file)
+        raise
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+    return count
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import csv
+import json
+import re
+import unicodedata
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from functools import cached_property
+from typing import Iterable, Iterator, Optional, TextIO
+
+from translator_toolkit import segment as segmentlib
+from translator_toolkit.segment import Segment, MXLIFF
+from translator_toolkit.util import stringutil
+
+XML_TAG_PATTERN = re.compile(r'<(?:g|x|bx|ex|bpt|ept|ph|it|pc|sc|ec)\b[^>]*?\bid="([^"]*)"[^>]*>')
+NUMBER_PATTERN = re.compile(r'\d+(?:[.,]\d+)*')
+DOUBLE_SPACE_PATTERN = re.compile(r'\S {2,}\S')
+LETTER_PATTERN = re.compile(r'[^\W\d_]')
+
+
+class QaIssue(object):
+    source_file: str
+    segment_id: str
+    check: str
+    message: str
+
+    def __init__(self, source_file: str, segment_id: str, check: str, message: str):
+        self.source_file = source_file
+        self.segment_id = segment_id
+        self.check = check
+        self.message = message
+
+    def to_json(self) -> dict:
+        return {
+            'source_file': self.source_file,
+            'segment_id': self.segment_id,
+            'check': self.check,
+            'message': self.message
+        }
+
+
+class QaSegment(object):
+    segment: Segment
+
+    def __init__(self, segment: Segment):
+        self.segment = segment
+
+    @cached_property
+    def source_text(self) -> str:
+        return self.segment.plain_source
+
+    @cached_property
+    def target_text(self) -> str:
+        return self.segment.plain_target
+
+    @cached_property
+    def source_tags(self) -> Counter:
+        return self._get_tags(self.segment.source)
+
+    @cached_property
+    def target_tags(self) -> Counter:
+        return self._get_tags(self.segment.target)
+
+    @cached_property
+    def source_numbers(self) -> Counter:
+        return self._get_numbers(self.source_text)
+
+    @cached_property
+    def target_numbers(self) -> Counter:
+        return self._get_numbers(self.target_text)
+
+    def _get_tags(self, text: str) -> Counter:
+        if self.segment.format == MXLIFF:
+            return Counter(segmentlib.MXLIFF_TAG_PATTERN.findall(text))
+        return Counter(XML_TAG_PATTERN.findall(text))
+
+    @staticmethod
+    def _get_numbers(text: str) -> Counter:
+        text = unicodedata.normalize('NFKC', text)
+        return Counter(re.sub(r'[.,]', '', m) for m in NUMBER_PATTERN.findall(text))
+
+    def issue(self, check: str, message: str) -> QaIssue:
+        return QaIssue(self.segment.source_file, self.segment.id, check, message)
+
+
+class QaCheck(object):
+    name = ''
+
+    def check(self, seg: QaSegment) -> Iterable[QaIssue]:
+        return ()
+
+    def finish(self) -> Iterable[QaIssue]:
+        return ()
+
+    def merge(self, other: QaCheck):
+        pass
+
+
+class EmptyTargetCheck(QaCheck):
+    name = 'empty-target'
+
+    def check(self, seg: QaSegment) -> Iterable[QaIssue]:
+        if seg.source_text.strip() and not seg.target_text.strip():
+            yield seg.issue(self.name, 'target is empty')
+
+
+class IdenticalTargetCheck(QaCheck):
+    name = 'identical-target'
+
+    def check(self, seg: QaSegment) -> Iterable[QaIssue]:
+        if seg.target_text == seg.source_text and LETTER_PATTERN.search(seg.source_text):
+            yield seg.issue(self.name, 'target is identical to source')
+
+
+class TagMismatchCheck(QaCheck):
+    name = 'tag-mismatch'
+
+    def check(self, seg: QaSegment) -> Iterable[QaIssue]:
+        if not seg.target_text.strip() or seg.source_tags == seg.target_tags:
+            return
+        missing = sorted((seg.source_tags - seg.target_tags).elements())
+        extra = sorted((seg.target_tags - seg.source_tags).elements())
+        yield seg.issue(self.name, f'missing tags: {missing}, extra tags: {extra}')
+
+
+class NumberMismatchCheck(QaCheck):
+    name = 'number-mismatch'
+
+    def check(self, seg: QaSegment) -> Iterable[QaIssue]:
+        if not seg.target_text.strip() or seg.source_numbers == seg.target_numbers:
+            return
+        missing = sorted((seg.source_numbers - seg.target_numbers).elements())
+        extra = sorted((seg.target_numbers - seg.source_numbers).elements())
+        yield seg.issue(self.name, f'missing numbers: {missing}, extra numbers: {extra}')
+
+
+class DoubleSpaceCheck(QaCheck):
+    name = 'double-space'
+
+    def check(self, seg: QaSegment) -> Iterable[QaIssue]:
+        if DOUBLE_SPACE_PATTERN.search(seg.target_text):
+            yield seg.issue(self.name, 'target contains double spaces')
+
+
+class LengthRatioCheck(QaCheck):
+    name = 'length-ratio'
+    min_ratio: float
+    max_ratio: float
+
+    def __init__(self, min_ratio: float = 0.2, max_ratio: float = 5.0):
+        self.min_ratio = min_ratio
+        self.max_ratio = max_ratio
+
+    def check(self, seg: QaSegment) -> Iterable[QaIssue]:
+        if not seg.source_text or not seg.target_text:
+            return
+        ratio = len(seg.target_text) / len(seg.source_text)
+        if ratio < self.min_ratio or ratio > self.max_ratio:
+            yield seg.issue(self.name, f'target/source length ratio is {ratio:.2f}')
+
+
+class LockedEditedCheck(QaCheck):
+    name = 'locked-edited'
+
+    def check(self, seg: QaSegment) -> Iterable[QaIssue]:
+        if seg.segment.locked and seg.segment.edited:
+            yield seg.issue(self.name, 'locked segment has been edited')
+
+
+class InconsistentTranslationCheck(QaCheck):
+    name = 'inconsistent-translation'
+    translations: dict[int, dict[int, tuple[str, str]]]
+
+    def __init__(self):
+        self.translations = {}
+
+    def check(self, seg: QaSegment) -> Iterable[QaIssue]:
+        if not seg.target_text.strip():
+            return ()
+        targets = self.translations.setdefault(stringutil.hash_text(seg.source_text), {})
+        targets.setdefault(stringutil.hash_text(seg.target_text), (seg.segment.source_file, seg.segment.id))
+        return ()
+
+    def merge(self, other: QaCheck):
+        if not isinstance(other, InconsistentTranslationCheck):
+            return
+        for source_hash, other_targets in other.translations.items():
+            targets = self.translations.setdefault(source_hash, {})
+            for target_hash, location in other_targets.items():
+                targets.setdefault(target_hash, location)
+
+    def finish(self) -> Iterable[QaIssue]:
+        for targets in self.translations.values():
+            if len(targets) < 2:
+                continue
+            for source_file, segment_id in targets.values():
+                yield QaIssue(source_file, segment_id, self.name, f'source has {len(targets)} different translations')
+
+
+def get_default_checks() -> list[QaCheck]:
+    return [EmptyTargetCheck(), IdenticalTargetCheck(), TagMismatchCheck(), NumberMismatchCheck(), DoubleSpaceCheck(),
+            LengthRatioCheck(), LockedEditedCheck(), InconsistentTranslationCheck()]
+
+
+def _check_file(engine: QaEngine, source_file: str) -> tuple[list[QaIssue], list[QaCheck]]:
+    issues = list(engine.check(segmentlib.stream_segments(source_file)))
+    return issues, engine.checks
+
+
+class QaEngine(object):
+    checks: list[QaCheck]
+
+    def __init__(self, checks: Optional[list[QaCheck]] = None):
+        self.checks = checks if checks is not None else get_default_checks()
+
+    def check(self, segments: Iterable[Segment]) -> Iterator[QaIssue]:
+        checks = self.checks
+        for segment in segments:
+            seg = QaSegment(segment)
+            for check in checks:
+                yield from check.check(seg)
+
+    def finish(self) -> Iterator[QaIssue]:
+        for check in self.checks:
+            yield from check.finish()
+
+    def run(self, segments: Iterable[Segment]) -> Iterator[QaIssue]:
+        yield from self.check(segments)
+        yield from self.finish()
+
+    def run_files(self, source_files: list[str], max_workers: Optional[int] = None) -> Iterator[QaIssue]:
+        if max_workers == 1 or len(source_files) < 2:
+            for source_file in source_files:
+                yield from self.check(segmentlib.stream_segments(source_file))
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                for issues, checks in executor.map(_check_file, [self] * len(source_files), source_files):
+                    yield from issues
+                    for check, other in zip(self.checks, checks):
+                        check.merge(other)
+        yield from self.finish()
+
+
+def write_report(issues: Iterable[QaIssue], outfile: TextIO, format_: str = 'csv') -> int:
+    count = 0
+    if format_ == 'jsonl':
+        for issue in issues:
+            outfile.write(json.dumps(issue.to_json(), ensure_ascii=False) + '\n')
+            count += 1
+    else:
+        writer = csv.writer(outfile)
+        writer.writerow(['source_file', 'segment_id', 'check', 'message'])
+        for issue in issues:
+            writer.writerow([issue.source_file, issue.segment_id, issue.check, issue.message])
+            count += 1
+    return count
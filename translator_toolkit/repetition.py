@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import os
+import re
+from typing import Iterable, Iterator, Optional, Union
+
+from translator_toolkit import segment as segmentlib
+from translator_toolkit import writeback
+from translator_toolkit.segment import Segment
+from translator_toolkit.sdlxliff import Sdlxliff
+from translator_toolkit.mxliff import Mxliff
+from translator_toolkit.writeback import TargetUpdate
+from translator_toolkit.error import TranslatorToolkitError
+from translator_toolkit.util import stringutil
+
+STRIP_TAGS = 'strip'
+PLACEHOLDER_TAGS = 'placeholder'
+PLACEHOLDER = '\ufffc'
+
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+
+def normalize_source(segment: Segment, mode: str = STRIP_TAGS) -> str:
+    if mode == STRIP_TAGS:
+        text = segmentlib.remove_tags(segment.source, segment.format)
+    elif mode == PLACEHOLDER_TAGS:
+        text = segmentlib.remove_tags(segment.source, segment.format, PLACEHOLDER)
+    else:
+        raise TranslatorToolkitError(f'unknown normalization mode: {mode}')
+    return WHITESPACE_PATTERN.sub(' ', text).strip()
+
+
+def get_exact_key(segment: Segment) -> int:
+    return stringutil.hash_text(f'{segment.format}\0{segment.source}')
+
+
+class RepetitionIndex(object):
+    mode: str
+    files: list[str]
+    ids: list[tuple[int, str]]
+    groups: dict[int, list[int]]
+
+    def __init__(self, mode: str = STRIP_TAGS):
+        self.mode = mode
+        self.files = []
+        self.ids = []
+        self.groups = {}
+        self._file_ids: dict[str, int] = {}
+        # normalized source hash -> (exact source hash, target, status) of the first confirmed segment
+        self._translations: dict[int, tuple[int, str, str]] = {}
+        # segment index -> (normalized source hash, exact source hash) of unconfirmed segments
+        self._pending: dict[int, tuple[int, int]] = {}
+
+    def add(self, segment: Segment):
+        normalized = normalize_source(segment, self.mode)
+        if not normalized:
+            return
+        file_id = self._file_ids.get(segment.source_file)
+        if file_id is None:
+            file_id = self._file_ids[segment.source_file] = len(self.files)
+            self.files.append(segment.source_file)
+        index = len(self.ids)
+        self.ids.append((file_id, segment.id))
+        key = stringutil.hash_text(normalized)
+        self.groups.setdefault(key, []).append(index)
+        if segment.confirmed and segment.target:
+            if key not in self._translations:
+                self._translations[key] = (get_exact_key(segment), segment.target, segment.status)
+        elif not segment.locked:
+            self._pending[index] = (key, get_exact_key(segment))
+
+    def add_segments(self, segments: Iterable[Segment]):
+        for segment in segments:
+            self.add(segment)
+
+    def add_document(self, doc: Union[Sdlxliff, Mxliff]):
+        self.add_segments(segmentlib.iter_segments(doc))
+
+    def add_file(self, source_file: str):
+        self.add_segments(segmentlib.stream_segments(source_file))
+
+    def get_repetitions(self) -> Iterator[list[tuple[str, str]]]:
+        for indices in self.groups.values():
+            if len(indices) > 1:
+                yield [(self.files[self.ids[i][0]], self.ids[i][1]) for i in indices]
+
+    @property
+    def repeated_count(self) -> int:
+        return sum(len(indices) - 1 for indices in self.groups.values())
+
+    def get_propagations(self) -> dict[str, dict[str, TargetUpdate]]:
+        propagations: dict[str, dict[str, TargetUpdate]] = {}
+        for index, (key, exact_key) in self._pending.items():
+            translation = self._translations.get(key)
+            # targets are copied verbatim, so the tagged sources must match exactly
+            if translation is None or translation[0] != exact_key:
+                continue
+            file_id, segment_id = self.ids[index]
+            propagations.setdefault(self.files[file_id], {})[segment_id] = TargetUpdate(translation[1], translation[2])
+        return propagations
+
+    def propagate(self, output_dir: Optional[str] = None, in_place: bool = False) -> int:
+        # rewriting drops whitespace and comments between units, so the source files are only replaced on request
+        if bool(output_dir) == in_place:
+            raise TranslatorToolkitError('either an output directory or in_place is required')
+        propagations = self.get_propagations()
+        # files keep their path below the common directory, so that equal names in different directories do not collide
+        root = os.path.commonpath([os.path.dirname(os.path.abspath(f)) for f in propagations]) if propagations else ''
+        count = 0
+        for source_file, updates in propagations.items():
+            output_file = source_file
+            if output_dir:
+                output_file = os.path.join(output_dir, os.path.relpath(os.path.abspath(source_file), root))
+                os.makedirs(os.path.dirname(output_file), exist_ok=True)
+            count += writeback.write_targets(source_file, updates, output_file)
+        return count
+
+
+def find_repetitions(source_files: Iterable[str], mode: str = STRIP_TAGS) -> RepetitionIndex:
+    index = RepetitionIndex(mode)
+    for source_file in source_files:
+        index.add_file(source_file)
+    return index
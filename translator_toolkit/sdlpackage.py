@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import posixpath
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, Optional
+
+from translator_toolkit.sdlxliff import Sdlxliff
+from translator_toolkit.error import TranslatorToolkitError
+
+SDLXLIFF_EXT = '.sdlxliff'
+
+
+def _load_member(package_file: str, member: str) -> Sdlxliff:
+    with zipfile.ZipFile(package_file) as zf:
+        data = zf.read(member)
+    return Sdlxliff.load_bytes(data, member)
+
+
+class SdlPackage(object):
+    package_file: str
+    files: dict[str, list[str]]
+
+    def __init__(self, package_file: str, files: dict[str, list[str]]):
+        self.package_file = package_file
+        self.files = files
+        self._documents: dict[str, Sdlxliff] = {}
+
+    @classmethod
+    def open(cls, package_file: str, lazy: bool = True, max_workers: Optional[int] = None) -> SdlPackage:
+        if not zipfile.is_zipfile(package_file):
+            raise TranslatorToolkitError(f'not a package file: {package_file}')
+        files: dict[str, list[str]] = {}
+        with zipfile.ZipFile(package_file) as zf:
+            for info in zf.infolist():
+                if info.is_dir() or not info.filename.lower().endswith(SDLXLIFF_EXT):
+                    continue
+                files.setdefault(SdlPackage.get_language(info.filename), []).append(info.filename)
+        package = SdlPackage(package_file, files)
+        if not lazy:
+            package.load_all(max_workers=max_workers)
+        return package
+
+    @property
+    def languages(self) -> list[str]:
+        return [lang for lang in self.files if lang]
+
+    @property
+    def members(self) -> list[str]:
+        return [member for members in self.files.values() for member in members]
+
+    def is_loaded(self, member: str) -> bool:
+        return member in self._documents
+
+    def get(self, member: str) -> Sdlxliff:
+        doc = self._documents.get(member)
+        if doc is None:
+            if member not in self.members:
+                raise TranslatorToolkitError(f'member not found in package: {member}')
+            doc = _load_member(self.package_file, member)
+            self._documents[member] = doc
+        return doc
+
+    def get_documents(self, language: str) -> Iterator[Sdlxliff]:
+        for member in self.files.get(language, []):
+            yield self.get(member)
+
+    def load_all(self, max_workers: Optional[int] = None) -> dict[str, Sdlxliff]:
+        pending = [member for member in self.members if member not in self._documents]
+        if max_workers == 1 or len(pending) < 2:
+            for member in pending:
+                self.get(member)
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                docs = executor.map(_load_member, [self.package_file] * len(pending), pending)
+                for member, doc in zip(pending, docs):
+                    self._documents[member] = doc
+        return {member: self._documents[member] for member in self.members}
+
+    @staticmethod
+    def get_language(member: str) -> str:
+        parts = posixpath.normpath(member).split('/')
+        return parts[0] if len(parts) > 1 else ''
@@ -1,17 +1,52 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
+import io
+import os
 import re
+import sys
 from datetime import datetime
-from typing import Iterator, Optional
+from typing import Iterator, Iterable, Optional, AbstractSet, IO, Mapping, Union
 
 from lxml import etree
 
+from translator_toolkit import backend as backendlib
 from translator_toolkit.ns import XLF, SDLXLF
 from translator_toolkit.util import xmlutil, stringutil
 from translator_toolkit.error import TranslatorToolkitError
 from translator_toolkit.xjson import XUnit, XGroup, XFile, XDocument
 
+XLF_FILE = XLF + 'file'
+XLF_TRANS_UNIT = XLF + 'trans-unit'
+XLF_SEG_SOURCE = XLF + 'seg-source'
+XLF_TARGET = XLF + 'target'
+XLF_MRK = XLF + 'mrk'
+SDLXLF_SEG_DEFS = SDLXLF + 'seg-defs'
+SDLXLF_SEG = SDLXLF + 'seg'
+
+SDLXLIFF_FIELDS = frozenset(['id', 'mid', 'source', 'target', 'segment_definitions', 'comment_definitions'])
+
+
+def get_fields(fields: Optional[Iterable[str]]) -> AbstractSet[str]:
+    if fields is None:
+        return SDLXLIFF_FIELDS
+    fields = frozenset(fields)
+    unknown = fields - SDLXLIFF_FIELDS
+    if unknown:
+        raise TranslatorToolkitError(f'unknown fields: {", ".join(sorted(unknown))}')
+    return fields
+
+
+def get_prune_tags(fields: AbstractSet[str]) -> list[str]:
+    tags = [XLF + 'header', XLF + 'source', SDLXLF + 'rep-defs']
+    if 'comment_definitions' not in fields:
+        tags.append(SDLXLF + 'cmt-defs')
+    if 'segment_definitions' not in fields:
+        tags.append(SDLXLF + 'seg-defs')
+    if fields.isdisjoint(['mid', 'source', 'target']):
+        tags.extend([XLF + 'seg-source', XLF + 'target'])
+    return tags
+
 
 class SdlxliffComment(object):
     severity: str
@@ -29,10 +64,10 @@ class SdlxliffComment(object):
 
     @classmethod
     def from_element(cls, elem: etree._Element) -> SdlxliffComment:
-        severity = elem.get('severity', '')
-        user = elem.get('user', '')
+        severity = sys.intern(elem.get('severity', ''))
+        user = sys.intern(elem.get('user', ''))
         date = stringutil.isoformat_to_datetime(elem.get('date', ''))
-        version = elem.get('version', '')
+        version = sys.intern(elem.get('version', ''))
         text = elem.text or ''
         comment = SdlxliffComment(severity, user, date, version, text)
         return comment
@@ -65,10 +100,10 @@ class SdlxliffSegmentPair(object):
         self.target = target
 
     @staticmethod
-    def from_element(src_mrk: etree._Element, tgt_mrk: etree._Element) -> SdlxliffSegmentPair:
-        mid = src_mrk.get('mid', '').replace('_x0020_', ' ')
-        source = xmlutil.tostring(src_mrk)
-        target = xmlutil.tostring(tgt_mrk)
+    def from_element(src_mrk: etree._Element, tgt_mrk: etree._Element, fields: AbstractSet[str] = SDLXLIFF_FIELDS) -> SdlxliffSegmentPair:
+        mid = src_mrk.get('mid', '').replace('_x0020_', ' ') if 'mid' in fields else ''
+        source = xmlutil.tostring(src_mrk) if 'source' in fields else ''
+        target = xmlutil.tostring(tgt_mrk) if 'target' in fields else ''
         pair = SdlxliffSegmentPair(mid, source, target)
         return pair
 
@@ -108,13 +143,17 @@ class SdlxliffSegDefinition(object):
 
     @classmethod
     def from_element(cls, elem: etree._Element) -> SdlxliffSegDefinition:
-        id_ = elem.get('id', '')
-        conf = elem.get('conf', '')
-        origin = elem.get('origin', '')
-        origin_system = elem.get('origin-system', '')
-        v = elem.get('percent', '0')
+        return SdlxliffSegDefinition.from_attrib(elem.attrib)
+
+    @classmethod
+    def from_attrib(cls, attrib: Mapping[str, str]) -> SdlxliffSegDefinition:
+        id_ = attrib.get('id', '')
+        conf = sys.intern(attrib.get('conf', ''))
+        origin = sys.intern(attrib.get('origin', ''))
+        origin_system = sys.intern(attrib.get('origin-system', ''))
+        v = attrib.get('percent', '0')
         percent = float(v) if stringutil.is_float(v) else 0.0
-        locked = elem.get('locked', 'false') == 'true'
+        locked = attrib.get('locked', 'false') == 'true'
         seg_def = SdlxliffSegDefinition(id_, conf, origin, origin_system, percent, locked)
         return seg_def
 
@@ -130,21 +169,33 @@ class SdlxliffTransUnit(object):
         self.segment_definitions = segment_definitions
 
     @classmethod
-    def from_element(cls, elem: etree._Element) -> SdlxliffTransUnit:
-        id_ = elem.get('id', '')
+    def from_element(cls, elem: etree._Element, fields: AbstractSet[str] = SDLXLIFF_FIELDS) -> SdlxliffTransUnit:
+        id_ = elem.get('id', '') if 'id' in fields else ''
         segment_pairs = []
         segment_definitions = []
-        seg_source = elem.find(f'./{XLF}seg-source')
-        target = elem.find(f'./{XLF}target')
+        seg_source = None
+        target = None
+        seg_defs = None
+        # the first occurrence of each child wins, as with find()
+        for child in elem.iterchildren():
+            tag = child.tag
+            if tag == XLF_SEG_SOURCE:
+                if seg_source is None:
+                    seg_source = child
+            elif tag == XLF_TARGET:
+                if target is None:
+                    target = child
+            elif tag == SDLXLF_SEG_DEFS:
+                if seg_defs is None:
+                    seg_defs = child
         if seg_source is not None and target is not None:
-            src_mrks = (e for e in seg_source.iterchildren(XLF + 'mrk') if e.get('mtype') == 'seg')
-            tgt_mrks = (e for e in target.iterchildren(XLF + 'mrk') if e.get('mtype') == 'seg')
+            src_mrks = (e for e in seg_source.iterchildren(XLF_MRK) if e.get('mtype') == 'seg')
+            tgt_mrks = (e for e in target.iterchildren(XLF_MRK) if e.get('mtype') == 'seg')
             for src_mrk, tgt_mrk in zip(src_mrks, tgt_mrks):
-                pair = SdlxliffSegmentPair.from_element(src_mrk, tgt_mrk)
+                pair = SdlxliffSegmentPair.from_element(src_mrk, tgt_mrk, fields)
                 segment_pairs.append(pair)
-        seg_defs = elem.find(f'./{SDLXLF}seg-defs')
-        if seg_defs is not None:
-            for seg in seg_defs.iterchildren(SDLXLF + 'seg'):
+        if seg_defs is not None and 'segment_definitions' in fields:
+            for seg in seg_defs.iterchildren(SDLXLF_SEG):
                 seg_def = SdlxliffSegDefinition.from_element(seg)
                 segment_definitions.append(seg_def)
         tu = SdlxliffTransUnit(id_, segment_pairs, segment_definitions)
@@ -171,8 +222,8 @@ class SdlxliffBody(object):
         self.trans_units = trans_units
 
     @classmethod
-    def from_element(cls, elem: etree._Element) -> SdlxliffBody:
-        trans_units = [SdlxliffTransUnit.from_element(e) for e in elem.iterdescendants(XLF + 'trans-unit')]
+    def from_element(cls, elem: etree._Element, fields: AbstractSet[str] = SDLXLIFF_FIELDS) -> SdlxliffBody:
+        trans_units = [SdlxliffTransUnit.from_element(e, fields) for e in elem.iterdescendants(XLF + 'trans-unit')]
         obj = SdlxliffBody(trans_units)
         return obj
 
@@ -192,16 +243,21 @@ class SdlxliffFile(object):
         self.body = body
 
     @classmethod
-    def from_element(cls, elem: etree._Element) -> SdlxliffFile:
-        original = elem.get('original', '')
-        datatype = elem.get('datatype', '')
-        source_language = elem.get('source-language', '')
-        target_language = elem.get('target-language', '')
+    def from_element(cls, elem: etree._Element, fields: AbstractSet[str] = SDLXLIFF_FIELDS) -> SdlxliffFile:
         body_elem = elem.find(f'./{XLF}body')
         if body_elem is None:
             raise TranslatorToolkitError('body element not found')
-        body = SdlxliffBody.from_element(body_elem)
-        obj = SdlxliffFile(source_language, target_language, original, datatype, body)
+        obj = SdlxliffFile.from_header(elem.attrib)
+        obj.body = SdlxliffBody.from_element(body_elem, fields)
+        return obj
+
+    @classmethod
+    def from_header(cls, attrib: Mapping[str, str]) -> SdlxliffFile:
+        original = attrib.get('original', '')
+        datatype = sys.intern(attrib.get('datatype', ''))
+        source_language = sys.intern(attrib.get('source-language', ''))
+        target_language = sys.intern(attrib.get('target-language', ''))
+        obj = SdlxliffFile(source_language, target_language, original, datatype, SdlxliffBody([]))
         return obj
 
     def to_json(self) -> XFile:
@@ -222,6 +278,7 @@ class SdlxliffDocInfo(object):
 
     def __init__(self, comment_definitions: list[SdlxliffCommentDefinition]):
         self.comment_definitions = comment_definitions
+        self._comment_map: Optional[dict[str, list[SdlxliffComment]]] = None
 
     @classmethod
     def from_element(cls, elem: etree._Element) -> SdlxliffDocInfo:
@@ -234,10 +291,16 @@ class SdlxliffDocInfo(object):
         doc_info = SdlxliffDocInfo(comment_definitions)
         return doc_info
 
+    def get_comment_map(self) -> dict[str, list[SdlxliffComment]]:
+        if self._comment_map is None:
+            comment_map: dict[str, list[SdlxliffComment]] = {}
+            for comment_def in self.comment_definitions:
+                comment_map.setdefault(comment_def.id, []).extend(comment_def.comments)
+            self._comment_map = comment_map
+        return self._comment_map
+
     def get_comments(self, cid: str) -> Iterator[SdlxliffComment]:
-        for comment_def in [comment_def for comment_def in self.comment_definitions if comment_def.id == cid]:
-            for comment in comment_def.comments:
-                yield comment
+        yield from self.get_comment_map().get(cid, [])
 
 
 class Sdlxliff(object):
@@ -261,20 +324,55 @@ class Sdlxliff(object):
         return xml_string
 
     @classmethod
-    def load(cls, source_file: str) -> Sdlxliff:
-        xml_string = Sdlxliff.load_valid_xml_string(source_file)
-        parser = xmlutil.get_parser(source_file, encoding='utf-8')
-        root = etree.fromstring(xml_string.encode('utf-8'), parser=parser)
+    def load(cls, source_file: str, fields: Optional[Iterable[str]] = None) -> Sdlxliff:
+        huge_tree = xmlutil.is_huge(os.path.getsize(source_file))
+        with xmlutil.ValidXmlReader(source_file) as reader:
+            return Sdlxliff.load_stream(reader, source_file, huge_tree=huge_tree, fields=fields)
+
+    @classmethod
+    def load_bytes(cls, data: bytes, source_file: str, fields: Optional[Iterable[str]] = None) -> Sdlxliff:
+        xml_string = xmlutil.remove_invalid_chars(data.decode('utf-8-sig'))
+        return Sdlxliff.load_string(xml_string, source_file, fields=fields)
+
+    @classmethod
+    def load_string(cls, xml_string: str, source_file: str, fields: Optional[Iterable[str]] = None) -> Sdlxliff:
+        xml_bytes = xml_string.encode('utf-8')
+        return Sdlxliff.load_stream(io.BytesIO(xml_bytes), source_file, huge_tree=xmlutil.is_huge(len(xml_bytes)), fields=fields)
+
+    @classmethod
+    def load_stream(cls, stream: Union[IO[bytes], xmlutil.ValidXmlReader], source_file: str, huge_tree: bool = False,
+                    fields: Optional[Iterable[str]] = None) -> Sdlxliff:
+        fields = get_fields(fields)
+        root = xmlutil.parse_pruned(stream, get_prune_tags(fields), huge_tree=huge_tree, encoding='utf-8')
 
         doc_info_elem = root.find(f'./{SDLXLF}doc-info')
         if doc_info_elem is None:
             raise TranslatorToolkitError('doc-info element not found')
         doc_info = SdlxliffDocInfo.from_element(doc_info_elem)
 
-        files = [SdlxliffFile.from_element(e) for e in root.iterchildren(XLF + 'file')]
+        files = [SdlxliffFile.from_element(e, fields) for e in root.iterchildren(XLF + 'file')]
         sdlxliff = Sdlxliff(source_file, doc_info, files)
         return sdlxliff
 
+    @classmethod
+    def stream_trans_units(cls, source_file: str, fields: Optional[Iterable[str]] = None,
+                           backend: Optional[str] = None) -> Iterator[tuple[SdlxliffFile, SdlxliffTransUnit]]:
+        fields = get_fields(fields)
+        if backendlib.get_backend(backend) == backendlib.EXPAT:
+            yield from backendlib.stream_sdlxliff_trans_units(source_file, fields)
+            return
+        huge_tree = xmlutil.is_huge(os.path.getsize(source_file))
+        file = None
+        with xmlutil.ValidXmlReader(source_file) as reader:
+            context = etree.iterparse(reader, events=('start', 'end'), tag=[XLF_FILE, XLF_TRANS_UNIT], huge_tree=huge_tree, encoding='utf-8')
+            for event, elem in context:
+                if elem.tag == XLF_FILE:
+                    if event == 'start':
+                        file = SdlxliffFile.from_header(elem.attrib)
+                elif event == 'end' and file is not None:
+                    yield file, SdlxliffTransUnit.from_element(elem, fields)
+                    xmlutil.release(elem)
+
     def to_json(self) -> XDocument:
         obj: XDocument = {
             'source_file': self.source_file,
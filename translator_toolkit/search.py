@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import gzip
+import json
+import re
+import unicodedata
+from typing import Iterable, Optional, Union
+
+from translator_toolkit import segment as segmentlib
+from translator_toolkit.segment import Segment
+from translator_toolkit.sdlxliff import Sdlxliff
+from translator_toolkit.mxliff import Mxliff
+from translator_toolkit.error import TranslatorToolkitError
+from translator_toolkit.util.stringutil import CJK_CHARS
+
+FIELDS = ('source', 'target')
+INDEX_VERSION = 1
+
+CJK_PATTERN = re.compile(f'[{CJK_CHARS}]')
+TOKEN_PATTERN = re.compile(f'[{CJK_CHARS}]+|(?:(?![{CJK_CHARS}])[^\\W_])+')
+QUERY_PATTERN = re.compile(r'(-?)"([^"]*)"|(-?)(\S+)')
+
+
+def normalize(text: str) -> str:
+    return unicodedata.normalize('NFKC', text).casefold()
+
+
+def tokenize(text: str) -> list[str]:
+    tokens: list[str] = []
+    for m in TOKEN_PATTERN.finditer(normalize(text)):
+        word = m.group()
+        if CJK_PATTERN.match(word) and len(word) > 1:
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+        else:
+            tokens.append(word)
+    return tokens
+
+
+class SearchHit(object):
+    source_file: str
+    unit_id: str
+
+    def __init__(self, source_file: str, unit_id: str):
+        self.source_file = source_file
+        self.unit_id = unit_id
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, SearchHit) and (self.source_file, self.unit_id) == (other.source_file, other.unit_id)
+
+    def __hash__(self) -> int:
+        return hash((self.source_file, self.unit_id))
+
+    def __repr__(self) -> str:
+        return f'SearchHit({self.source_file!r}, {self.unit_id!r})'
+
+
+class SearchIndex(object):
+    files: dict[int, str]
+    units: dict[int, list[str]]
+    postings: dict[str, dict[str, dict[int, dict[int, list[int]]]]]
+
+    def __init__(self):
+        self.files = {}
+        self.units = {}
+        self.postings = {field: {} for field in FIELDS}
+        self._file_ids: dict[str, int] = {}
+        self._file_tokens: dict[int, dict[str, set[str]]] = {}
+        self._next_file_id = 0
+
+    def __contains__(self, source_file: str) -> bool:
+        return source_file in self._file_ids
+
+    def add_segments(self, source_file: str, segments: Iterable[Segment]):
+        if source_file in self._file_ids:
+            self.remove_file(source_file)
+        file_id = self._next_file_id
+        self._next_file_id += 1
+        self.files[file_id] = source_file
+        self._file_ids[source_file] = file_id
+        unit_ids = self.units[file_id] = []
+        file_tokens = self._file_tokens[file_id] = {field: set() for field in FIELDS}
+        for unit, segment in enumerate(segments):
+            unit_ids.append(segment.id)
+            for field, text in (('source', segment.plain_source), ('target', segment.plain_target)):
+                postings = self.postings[field]
+                tokens = tokenize(text)
+                file_tokens[field].update(tokens)
+                for position, token in enumerate(tokens):
+                    postings.setdefault(token, {}).setdefault(file_id, {}).setdefault(unit, []).append(position)
+
+    def add_document(self, doc: Union[Sdlxliff, Mxliff]):
+        self.add_segments(doc.source_file, segmentlib.iter_segments(doc))
+
+    def add_file(self, source_file: str):
+        self.add_segments(source_file, segmentlib.stream_segments(source_file))
+
+    def remove_file(self, source_file: str) -> bool:
+        file_id = self._file_ids.pop(source_file, None)
+        if file_id is None:
+            return False
+        del self.files[file_id]
+        del self.units[file_id]
+        for field, tokens in self._file_tokens.pop(file_id).items():
+            postings = self.postings[field]
+            for token in tokens:
+                del postings[token][file_id]
+                if not postings[token]:
+                    del postings[token]
+        return True
+
+    def _find_tokens(self, tokens: list[str], field: str) -> set[tuple[int, int]]:
+        postings = self.postings[field]
+        hits: set[tuple[int, int]] = set()
+        if not tokens:
+            return hits
+        if len(tokens) == 1 and len(tokens[0]) == 1 and CJK_PATTERN.match(tokens[0]):
+            # single CJK characters are only indexed as part of bigrams
+            for token, by_file in postings.items():
+                if tokens[0] in token:
+                    hits.update((file_id, unit) for file_id, by_unit in by_file.items() for unit in by_unit)
+            return hits
+        found = [postings.get(token) for token in tokens]
+        token_postings = [p for p in found if p is not None]
+        if len(token_postings) < len(found):
+            return hits
+        first = token_postings[0]
+        for file_id in set(first).intersection(*token_postings[1:]):
+            for unit in set(first[file_id]).intersection(*(p[file_id] for p in token_postings[1:])):
+                positions = [set(p[file_id][unit]) for p in token_postings[1:]]
+                if any(all(start + i + 1 in ps for i, ps in enumerate(positions)) for start in first[file_id][unit]):
+                    hits.add((file_id, unit))
+        return hits
+
+    def search(self, query: str, field: str = 'source') -> list[SearchHit]:
+        if field not in self.postings:
+            raise TranslatorToolkitError(f'unknown field: {field}')
+        results: set[tuple[int, int]] = set()
+        for clause in re.split(r'\s+OR\s+', query.strip()):
+            included: Optional[set[tuple[int, int]]] = None
+            excluded: set[tuple[int, int]] = set()
+            for m in QUERY_PATTERN.finditer(clause):
+                negated = bool(m.group(1) or m.group(3))
+                hits = self._find_tokens(tokenize(m.group(2) if m.group(2) is not None else m.group(4)), field)
+                if negated:
+                    excluded |= hits
+                else:
+                    included = hits if included is None else included & hits
+            if included:
+                results |= included - excluded
+        return [SearchHit(self.files[file_id], self.units[file_id][unit]) for file_id, unit in sorted(results)]
+
+    def save(self, index_file: str):
+        postings: dict[str, dict[str, dict[int, list[int]]]] = {}
+        for field, by_token in self.postings.items():
+            postings[field] = {}
+            for token, by_file in by_token.items():
+                encoded: dict[int, list[int]] = {}
+                for file_id, by_unit in by_file.items():
+                    values: list[int] = []
+                    for unit, positions in by_unit.items():
+                        values.extend((unit, len(positions)))
+                        values.extend(p - q for p, q in zip(positions, [0] + positions[:-1]))
+                    encoded[file_id] = values
+                postings[field][token] = encoded
+        obj = {
+            'version': INDEX_VERSION,
+            'files': self.files,
+            'units': self.units,
+            'postings': postings
+        }
+        with gzip.open(index_file, 'wt', encoding='utf-8') as outfile:
+            json.dump(obj, outfile, ensure_ascii=False, separators=(',', ':'))
+
+    @classmethod
+    def load(cls, index_file: str) -> SearchIndex:
+        with gzip.open(index_file, 'rt', encoding='utf-8') as infile:
+            obj = json.load(infile)
+        if obj.get('version') != INDEX_VERSION:
+            raise TranslatorToolkitError(f'unsupported index version: {obj.get("version")}')
+        index = SearchIndex()
+        index.files = {int(k): v for k, v in obj['files'].items()}
+        index.units = {int(k): v for k, v in obj['units'].items()}
+        index._file_ids = {v: k for k, v in index.files.items()}
+        index._file_tokens = {file_id: {field: set() for field in FIELDS} for file_id in index.files}
+        index._next_file_id = max(index.files, default=-1) + 1
+        for field, by_token in obj['postings'].items():
+            postings = index.postings[field]
+            for token, encoded in by_token.items():
+                by_file = postings[token] = {}
+                for file_id, values in encoded.items():
+                    index._file_tokens[int(file_id)][field].add(token)
+                    by_unit = by_file[int(file_id)] = {}
+                    i = 0
+                    while i < len(values):
+                        unit, count = values[i], values[i + 1]
+                        positions = []
+                        position = 0
+                        for delta in values[i + 2:i + 2 + count]:
+                            position += delta
+                            positions.append(position)
+                        by_unit[unit] = positions
+                        i += 2 + count
+        return index
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import codecs
+import os
+import re
+from typing import Iterator, Optional, Union
+from xml.sax.saxutils import unescape
+
+from translator_toolkit.sdlxliff import Sdlxliff, SdlxliffFile, SdlxliffTransUnit
+from translator_toolkit.mxliff import Mxliff, MxliffFile, MxliffTransUnit
+from translator_toolkit.xliff import Xliff, XliffFile, XliffTransUnit
+from translator_toolkit.xliff2 import Xliff2, Xliff2File, Xliff2Unit
+from translator_toolkit.error import TranslatorToolkitError
+from translator_toolkit.ns import MXLFNS, SDLXLFNS, XLFNS, XLF2NS
+from translator_toolkit.xjson import XUnit
+
+SDLXLIFF = 'sdlxliff'
+MXLIFF = 'mxliff'
+XLIFF = 'xliff'
+XLIFF2 = 'xliff2'
+
+SEGMENT_FIELDS = {
+    SDLXLIFF: ['mid', 'source', 'target', 'segment_definitions'],
+    MXLIFF: ['id', 'source', 'target', 'm_confirmed', 'm_score', 'm_locked', 'm_level_edited'],
+    XLIFF: ['id', 'source', 'target', 'state', 'translate'],
+    XLIFF2: ['id', 'source', 'target', 'state', 'translate']
+}
+
+CONFIRMED_STATUSES = {
+    SDLXLIFF: frozenset(['Translated', 'ApprovedTranslation', 'ApprovedSignOff']),
+    XLIFF: frozenset(['translated', 'signed-off', 'final']),
+    XLIFF2: frozenset(['translated', 'reviewed', 'final'])
+}
+
+EXTENSIONS = {
+    '.sdlxliff': SDLXLIFF,
+    '.mxliff': MXLIFF,
+    '.xlf': XLIFF,
+    '.xliff': XLIFF
+}
+SNIFF_SIZE = 8192
+
+XML_TAG_PATTERN = re.compile(r'<[^<>]+>')
+MXLIFF_TAG_PATTERN = re.compile(r'\{[^{}<>\s]{1,16}[}>]|<[^{}<>\s]{1,16}\}')
+ROOT_TAG_PATTERN = re.compile(r'<(?![?!])[^>]*>')
+
+
+def remove_tags(text: str, format_: str, replacement: str = '') -> str:
+    if format_ == MXLIFF:
+        return MXLIFF_TAG_PATTERN.sub(replacement, text)
+    return unescape(XML_TAG_PATTERN.sub(replacement, text), {'&quot;': '"', '&apos;': "'"})
+
+
+class Segment(object):
+    format: str
+    source_file: str
+    id: str
+    source: str
+    target: str
+    srclang: str
+    tgtlang: str
+    status: str
+    score: float
+    locked: bool
+    edited: bool
+
+    def __init__(self, format_: str, source_file: str, id_: str, source: str, target: str, srclang: str, tgtlang: str,
+                 status: str, score: float, locked: bool, edited: bool):
+        self.format = format_
+        self.source_file = source_file
+        self.id = id_
+        self.source = source
+        self.target = target
+        self.srclang = srclang
+        self.tgtlang = tgtlang
+        self.status = status
+        self.score = score
+        self.locked = locked
+        self.edited = edited
+
+    @property
+    def confirmed(self) -> bool:
+        if self.format == MXLIFF:
+            # m:confirmed holds the workflow level the segment was confirmed at
+            return self.status not in ('', '0')
+        return self.status in CONFIRMED_STATUSES[self.format]
+
+    @property
+    def plain_source(self) -> str:
+        return remove_tags(self.source, self.format)
+
+    @property
+    def plain_target(self) -> str:
+        return remove_tags(self.target, self.format)
+
+    def to_json(self) -> XUnit:
+        obj: XUnit = {
+            'id': self.id,
+            'source': self.source,
+            'target': self.target,
+            'srclang': self.srclang,
+            'tgtlang': self.tgtlang,
+            'properties': {
+                'status': self.status,
+                'score': self.score,
+                'locked': self.locked
+            }
+        }
+        return obj
+
+
+def get_sdlxliff_segments(source_file: str, file: SdlxliffFile, tu: SdlxliffTransUnit) -> Iterator[Segment]:
+    seg_defs = {seg_def.id: seg_def for seg_def in tu.segment_definitions}
+    for pair in tu.segment_pairs:
+        seg_def = seg_defs.get(pair.mid)
+        status = seg_def.conf if seg_def is not None else ''
+        score = seg_def.percent if seg_def is not None else 0.0
+        locked = seg_def.locked if seg_def is not None else False
+        yield Segment(SDLXLIFF, source_file, pair.mid, pair.source, pair.target, file.source_language,
+                      file.target_language, status, score, locked, False)
+
+
+def get_mxliff_segment(source_file: str, file: MxliffFile, tu: MxliffTransUnit) -> Segment:
+    return Segment(MXLIFF, source_file, tu.id, tu.source, tu.target, file.source_language, file.target_language,
+                   tu.m_confirmed, tu.m_score, tu.m_locked, tu.m_level_edited)
+
+
+def get_xliff_segment(source_file: str, file: XliffFile, tu: XliffTransUnit) -> Segment:
+    return Segment(XLIFF, source_file, tu.id, tu.source, tu.target, file.source_language, file.target_language,
+                   tu.state, 0.0, not tu.translate, False)
+
+
+def get_xliff2_segments(source_file: str, file: Xliff2File, unit: Xliff2Unit) -> Iterator[Segment]:
+    for i, seg in enumerate(unit.segments, 1):
+        id_ = seg.id or (unit.id if len(unit.segments) == 1 else f'{unit.id}_{i}')
+        yield Segment(XLIFF2, source_file, id_, seg.source, seg.target, file.source_language, file.target_language,
+                      seg.state, 0.0, not unit.translate, False)
+
+
+def iter_sdlxliff_segments(doc: Sdlxliff) -> Iterator[Segment]:
+    for file in doc.files:
+        for tu in file.body.trans_units:
+            yield from get_sdlxliff_segments(doc.source_file, file, tu)
+
+
+def iter_mxliff_segments(doc: Mxliff) -> Iterator[Segment]:
+    for file in doc.files:
+        for group in file.body.gruops:
+            for tu in group.trans_units:
+                yield get_mxliff_segment(doc.source_file, file, tu)
+
+
+def iter_xliff_segments(doc: Xliff) -> Iterator[Segment]:
+    for file in doc.files:
+        for tu in file.body.trans_units:
+            yield get_xliff_segment(doc.source_file, file, tu)
+
+
+def iter_xliff2_segments(doc: Xliff2) -> Iterator[Segment]:
+    for file in doc.files:
+        for unit in file.units:
+            yield from get_xliff2_segments(doc.source_file, file, unit)
+
+
+def iter_segments(doc: Union[Sdlxliff, Mxliff, Xliff, Xliff2]) -> Iterator[Segment]:
+    if isinstance(doc, Sdlxliff):
+        return iter_sdlxliff_segments(doc)
+    if isinstance(doc, Mxliff):
+        return iter_mxliff_segments(doc)
+    if isinstance(doc, Xliff):
+        return iter_xliff_segments(doc)
+    if isinstance(doc, Xliff2):
+        return iter_xliff2_segments(doc)
+    raise TranslatorToolkitError(f'unsupported document: {type(doc).__name__}')
+
+
+def sniff_format(source_file: str) -> Optional[str]:
+    with open(source_file, 'rb') as infile:
+        head = infile.read(SNIFF_SIZE)
+    if head.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        text = head.decode('utf-16', errors='ignore')
+    else:
+        text = head.decode('utf-8', errors='ignore')
+    m = ROOT_TAG_PATTERN.search(text)
+    root = m.group() if m else text
+    if SDLXLFNS in root:
+        return SDLXLIFF
+    if MXLFNS in root:
+        return MXLIFF
+    if XLF2NS in root:
+        return XLIFF2
+    if XLFNS in root:
+        return XLIFF
+    return None
+
+
+def get_format(source_file: str) -> str:
+    format_ = sniff_format(source_file) or EXTENSIONS.get(os.path.splitext(source_file)[1].lower())
+    if format_ is None:
+        raise TranslatorToolkitError(f'unsupported file: {source_file}')
+    return format_
+
+
+def load(source_file: str, format_: Optional[str] = None) -> Union[Sdlxliff, Mxliff, Xliff, Xliff2]:
+    format_ = format_ or get_format(source_file)
+    if format_ == SDLXLIFF:
+        return Sdlxliff.load(source_file)
+    if format_ == MXLIFF:
+        return Mxliff.load(source_file)
+    if format_ == XLIFF:
+        return Xliff.load(source_file)
+    return Xliff2.load(source_file)
+
+
+def stream_segments(source_file: str, format_: Optional[str] = None, backend: Optional[str] = None) -> Iterator[Segment]:
+    format_ = format_ or get_format(source_file)
+    fields = SEGMENT_FIELDS[format_]
+    if backend is not None and format_ not in (SDLXLIFF, MXLIFF):
+        raise TranslatorToolkitError(f'parser backends are not supported for {format_} files: {source_file}')
+    if format_ == SDLXLIFF:
+        for sdlxliff_file, sdlxliff_tu in Sdlxliff.stream_trans_units(source_file, fields=fields, backend=backend):
+            yield from get_sdlxliff_segments(source_file, sdlxliff_file, sdlxliff_tu)
+    elif format_ == MXLIFF:
+        for mxliff_file, mxliff_tu in Mxliff.stream_trans_units(source_file, fields=fields, backend=backend):
+            yield get_mxliff_segment(source_file, mxliff_file, mxliff_tu)
+    elif format_ == XLIFF:
+        for xliff_file, xliff_tu in Xliff.stream_trans_units(source_file, fields=fields):
+            yield get_xliff_segment(source_file, xliff_file, xliff_tu)
+    else:
+        for xliff2_file, xliff2_unit in Xliff2.stream_units(source_file, fields=fields):
+            yield from get_xliff2_segments(source_file, xliff2_file, xliff2_unit)
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import collections
+import json
+import os
+import socket
+import socketserver
+import struct
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+from translator_toolkit import segment as segmentlib
+from translator_toolkit import stats as statslib
+from translator_toolkit import comments as commentslib
+from translator_toolkit.error import TranslatorToolkitError
+
+SEGMENT_COLUMNS = ['id', 'source', 'target', 'status', 'score', 'locked']
+
+FRAME_HEADER = struct.Struct('>I')
+MAX_FRAME_SIZE = 1 << 30
+LATENCY_WINDOW = 4096
+SOCKET_MODE = 0o600
+
+
+def get_segments(source_file: str, backend: Optional[str] = None) -> dict:
+    # rows instead of one object per segment keep the keys out of every record
+    rows = [[s.id, s.source, s.target, s.status, s.score, s.locked] for s in segmentlib.stream_segments(source_file, backend=backend)]
+    return {'columns': SEGMENT_COLUMNS, 'rows': rows}
+
+
+def get_stats(source_file: str, words: bool = False) -> dict:
+    return (statslib.get_stats(source_file) if words else statslib.scan_stats(source_file)).to_json()
+
+
+def get_comments(source_file: str) -> list[dict]:
+    return [r.to_json() for r in commentslib.iter_comments(source_file)]
+
+
+OPERATIONS: dict[str, Callable[..., Any]] = {
+    'segments': get_segments,
+    'stats': get_stats,
+    'comments': get_comments
+}
+
+
+def ping() -> int:
+    return os.getpid()
+
+
+def run_job(operation: str, source_file: str, options: dict) -> Any:
+    return OPERATIONS[operation](source_file, **options)
+
+
+def get_percentile(values: list[float], percentile: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * percentile / 100))]
+
+
+def get_error_response(id_: Any, e: Exception) -> dict:
+    return {'id': id_, 'ok': False, 'error': f'{type(e).__name__}: {e}'}
+
+
+class ServiceMetrics(object):
+    submitted: int
+    completed: int
+    failed: int
+    pending: int
+    max_pending: int
+    restarts: int
+    latencies: collections.deque[float]
+
+    def __init__(self):
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.pending = 0
+        self.max_pending = 0
+        self.restarts = 0
+        # seconds from submission to result of the most recent jobs
+        self.latencies = collections.deque(maxlen=LATENCY_WINDOW)
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            self.submitted += 1
+            self.pending += 1
+            self.max_pending = max(self.max_pending, self.pending)
+
+    def finish(self, latency: float, failed: bool):
+        with self._lock:
+            self.pending -= 1
+            if failed:
+                self.failed += 1
+            else:
+                self.completed += 1
+            self.latencies.append(latency)
+
+    def restart(self):
+        with self._lock:
+            self.restarts += 1
+
+    def to_json(self) -> dict:
+        with self._lock:
+            latencies = list(self.latencies)
+            return {
+                'submitted': self.submitted,
+                'completed': self.completed,
+                'failed': self.failed,
+                'queue_depth': self.pending,
+                'max_queue_depth': self.max_pending,
+                'restarts': self.restarts,
+                'latency_ms': {
+                    'p50': get_percentile(latencies, 50) * 1000,
+                    'p90': get_percentile(latencies, 90) * 1000,
+                    'p99': get_percentile(latencies, 99) * 1000,
+                    'max': max(latencies, default=0.0) * 1000
+                }
+            }
+
+
+class ParsingService(object):
+    max_workers: int
+    metrics: ServiceMetrics
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.metrics = ServiceMetrics()
+        self.executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        self.worker_pids = self._start_workers()
+        self._server: Optional[socketserver.BaseServer] = None
+        self._lock = threading.Lock()
+
+    def _start_workers(self) -> list[int]:
+        # workers are otherwise started lazily by the first jobs, which would then pay for the start-up
+        return sorted({f.result() for f in [self.executor.submit(ping) for _ in range(self.max_workers)]})
+
+    def _restart(self, broken: ProcessPoolExecutor) -> ProcessPoolExecutor:
+        # a worker died and took the pool with it, the jobs it was running have already failed
+        with self._lock:
+            if self.executor is broken:
+                broken.shutdown(cancel_futures=True)
+                self.executor = ProcessPoolExecutor(max_workers=self.max_workers)
+                self.worker_pids = self._start_workers()
+                self.metrics.restart()
+            return self.executor
+
+    def __enter__(self) -> ParsingService:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        self.shutdown_server()
+        self.executor.shutdown(cancel_futures=True)
+
+    def submit(self, operation: str, source_file: str, **options) -> Future:
+        if operation not in OPERATIONS:
+            raise TranslatorToolkitError(f'unknown operation: {operation}')
+        self.metrics.start()
+        start = time.perf_counter()
+        try:
+            executor = self.executor
+            try:
+                job = executor.submit(run_job, operation, source_file, options)
+            except BrokenProcessPool:
+                job = self._restart(executor).submit(run_job, operation, source_file, options)
+        except BaseException:
+            self.metrics.finish(time.perf_counter() - start, True)
+            raise
+        # the metrics are updated before callers waiting on the result wake up
+        future: Future = Future()
+
+        def done(f: Future):
+            exception = f.exception() if not f.cancelled() else None
+            self.metrics.finish(time.perf_counter() - start, f.cancelled() or exception is not None)
+            if f.cancelled():
+                future.cancel()
+            elif exception is not None:
+                future.set_exception(exception)
+            else:
+                future.set_result(f.result())
+
+        job.add_done_callback(done)
+        return future
+
+    def run(self, operation: str, source_file: str, **options) -> Any:
+        return self.submit(operation, source_file, **options).result()
+
+    def handle(self, request: dict) -> dict:
+        response = {'id': request.get('id')}
+        try:
+            if request.get('op') == 'metrics':
+                response['result'] = self.metrics.to_json()
+            else:
+                response['result'] = self.run(request.get('op', ''), request.get('file', ''), **request.get('options', {}))
+            response['ok'] = True
+        except Exception as e:
+            response = get_error_response(response['id'], e)
+        return response
+
+    def serve(self, socket_path: str) -> socketserver.BaseServer:
+        if self._server is not None:
+            raise TranslatorToolkitError('service is already listening')
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        self._server = ServiceServer(socket_path, self)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self._server
+
+    def shutdown_server(self):
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        if os.path.exists(self._server.server_address):
+            os.remove(self._server.server_address)
+        self._server = None
+
+
+def read_frame(sock: socket.socket) -> Optional[bytes]:
+    header = recv_exact(sock, FRAME_HEADER.size)
+    if header is None:
+        return None
+    size, = FRAME_HEADER.unpack(header)
+    if size > MAX_FRAME_SIZE:
+        raise TranslatorToolkitError(f'frame too large: {size}')
+    data = recv_exact(sock, size)
+    if data is None:
+        raise TranslatorToolkitError('connection closed in the middle of a frame')
+    return data
+
+
+def recv_exact(sock: socket.socket, size: int) -> Optional[bytes]:
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1 << 20))
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+
+def write_frame(sock: socket.socket, obj: Any):
+    data = json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    sock.sendall(FRAME_HEADER.pack(len(data)) + data)
+
+
+class ServiceRequestHandler(socketserver.BaseRequestHandler):
+    server: ServiceServer
+
+    def handle(self):
+        # a connection can send any number of requests, each is answered before the next one is read
+        while True:
+            try:
+                data = read_frame(self.request)
+            except TranslatorToolkitError as e:
+                # the stream cannot be resynchronised after a bad header, the error is sent before closing
+                write_frame(self.request, get_error_response(None, e))
+                return
+            if data is None:
+                return
+            try:
+                request = json.loads(data)
+                if not isinstance(request, dict):
+                    raise TranslatorToolkitError(f'request is not an object: {type(request).__name__}')
+            except (ValueError, TranslatorToolkitError) as e:
+                write_frame(self.request, get_error_response(None, e))
+                continue
+            write_frame(self.request, self.server.service.handle(request))
+
+
+class ServiceServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, service: ParsingService):
+        self.service = service
+        super().__init__(socket_path, ServiceRequestHandler)
+
+    def server_bind(self):
+        super().server_bind()
+        # the socket is created with the umask, restrict it before it starts listening
+        os.chmod(self.server_address, SOCKET_MODE)
+
+
+class ServiceClient(object):
+    socket_path: str
+
+    def __init__(self, socket_path: str):
+        self.socket_path = socket_path
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(socket_path)
+        self._next_id = 0
+
+    def __enter__(self) -> ServiceClient:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        self.sock.close()
+
+    def request(self, operation: str, source_file: str = '', **options) -> Any:
+        self._next_id += 1
+        write_frame(self.sock, {'id': self._next_id, 'op': operation, 'file': source_file, 'options': options})
+        data = read_frame(self.sock)
+        if data is None:
+            raise TranslatorToolkitError('connection closed by the service')
+        response = json.loads(data)
+        if not response['ok']:
+            raise TranslatorToolkitError(response['error'])
+        return response['result']
+
+    def get_metrics(self) -> dict:
+        return self.request('metrics')
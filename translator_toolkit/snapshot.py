@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import sys
+from datetime import datetime
+from types import MappingProxyType
+from typing import Iterator, Mapping, NamedTuple, Optional, Union
+
+from translator_toolkit.sdlxliff import Sdlxliff, SdlxliffComment, SdlxliffSegDefinition, SdlxliffTransUnit, SdlxliffFile
+from translator_toolkit.mxliff import Mxliff, MxliffAltTrans, MxliffTransUnit, MxliffGroup, MxliffFile
+from translator_toolkit.error import TranslatorToolkitError
+
+
+class SdlxliffCommentSnapshot(NamedTuple):
+    severity: str
+    user: str
+    date: Optional[datetime]
+    version: str
+    text: str
+
+    @classmethod
+    def from_comment(cls, comment: SdlxliffComment) -> SdlxliffCommentSnapshot:
+        return SdlxliffCommentSnapshot(sys.intern(comment.severity), sys.intern(comment.user), comment.date,
+                                       sys.intern(comment.version), comment.text)
+
+
+class SdlxliffSegDefinitionSnapshot(NamedTuple):
+    id: str
+    conf: str
+    origin: str
+    origin_system: str
+    percent: float
+    locked: bool
+
+    @classmethod
+    def from_seg_def(cls, seg_def: SdlxliffSegDefinition) -> SdlxliffSegDefinitionSnapshot:
+        return SdlxliffSegDefinitionSnapshot(seg_def.id, sys.intern(seg_def.conf), sys.intern(seg_def.origin),
+                                             sys.intern(seg_def.origin_system), seg_def.percent, seg_def.locked)
+
+
+class SdlxliffSegmentPairSnapshot(NamedTuple):
+    mid: str
+    source: str
+    target: str
+    definition: Optional[SdlxliffSegDefinitionSnapshot]
+
+
+class SdlxliffTransUnitSnapshot(NamedTuple):
+    id: str
+    segment_pairs: tuple[SdlxliffSegmentPairSnapshot, ...]
+
+    @classmethod
+    def from_trans_unit(cls, tu: SdlxliffTransUnit) -> SdlxliffTransUnitSnapshot:
+        seg_defs = {seg_def.id: SdlxliffSegDefinitionSnapshot.from_seg_def(seg_def) for seg_def in tu.segment_definitions}
+        pairs = tuple(SdlxliffSegmentPairSnapshot(sp.mid, sp.source, sp.target, seg_defs.get(sp.mid)) for sp in tu.segment_pairs)
+        return SdlxliffTransUnitSnapshot(tu.id, pairs)
+
+
+class SdlxliffFileSnapshot(NamedTuple):
+    source_language: str
+    target_language: str
+    original: str
+    datatype: str
+    trans_units: tuple[SdlxliffTransUnitSnapshot, ...]
+
+    @classmethod
+    def from_file(cls, file: SdlxliffFile) -> SdlxliffFileSnapshot:
+        trans_units = tuple(SdlxliffTransUnitSnapshot.from_trans_unit(tu) for tu in file.body.trans_units)
+        return SdlxliffFileSnapshot(sys.intern(file.source_language), sys.intern(file.target_language), file.original,
+                                    sys.intern(file.datatype), trans_units)
+
+
+class SdlxliffSnapshot(NamedTuple):
+    source_file: str
+    files: tuple[SdlxliffFileSnapshot, ...]
+    comment_definitions: Mapping[str, tuple[SdlxliffCommentSnapshot, ...]]
+    segment_pairs: Mapping[str, SdlxliffSegmentPairSnapshot]
+
+    @classmethod
+    def build(cls, source_file: str, files: tuple[SdlxliffFileSnapshot, ...],
+              comment_definitions: tuple[tuple[str, tuple[SdlxliffCommentSnapshot, ...]], ...]) -> SdlxliffSnapshot:
+        segment_pairs = {sp.mid: sp for file in files for tu in file.trans_units for sp in tu.segment_pairs}
+        return SdlxliffSnapshot(source_file, files, MappingProxyType(dict(comment_definitions)), MappingProxyType(segment_pairs))
+
+    @classmethod
+    def from_document(cls, doc: Sdlxliff) -> SdlxliffSnapshot:
+        files = tuple(SdlxliffFileSnapshot.from_file(file) for file in doc.files)
+        comment_definitions: dict[str, tuple[SdlxliffCommentSnapshot, ...]] = {}
+        for cmt_def in doc.doc_info.comment_definitions:
+            comments = tuple(SdlxliffCommentSnapshot.from_comment(c) for c in cmt_def.comments)
+            comment_definitions[cmt_def.id] = comment_definitions.get(cmt_def.id, ()) + comments
+        return SdlxliffSnapshot.build(doc.source_file, files, tuple(comment_definitions.items()))
+
+    def __reduce__(self):
+        # mapping proxies cannot be pickled, so rebuild them from the plain tuples
+        return SdlxliffSnapshot.build, (self.source_file, self.files, tuple(self.comment_definitions.items()))
+
+    def get_comments(self, cid: str) -> tuple[SdlxliffCommentSnapshot, ...]:
+        return self.comment_definitions.get(cid, ())
+
+    def get_segment_pair(self, mid: str) -> Optional[SdlxliffSegmentPairSnapshot]:
+        return self.segment_pairs.get(mid)
+
+    def get_all_segment_pairs(self) -> Iterator[SdlxliffSegmentPairSnapshot]:
+        for file in self.files:
+            for tu in file.trans_units:
+                yield from tu.segment_pairs
+
+    @property
+    def source_language(self) -> str:
+        return self.files[0].source_language if self.files else ''
+
+    @property
+    def target_language(self) -> str:
+        return self.files[0].target_language if self.files else ''
+
+
+class MxliffAltTransSnapshot(NamedTuple):
+    origin: str
+    match_quality: float
+    target: str
+
+    @classmethod
+    def from_alt_trans(cls, alt_trans: MxliffAltTrans) -> MxliffAltTransSnapshot:
+        return MxliffAltTransSnapshot(sys.intern(alt_trans.origin), alt_trans.match_quality, alt_trans.target)
+
+
+class MxliffTransUnitSnapshot(NamedTuple):
+    id: str
+    source: str
+    target: str
+    m_trans_origin: str
+    m_score: float
+    m_gross_score: float
+    m_confirmed: str
+    m_locked: bool
+    m_para_id: str
+    m_created_at: datetime
+    m_created_by: str
+    m_modified_at: datetime
+    m_modified_by: str
+    m_level_edited: bool
+    alt_trans_units: tuple[MxliffAltTransSnapshot, ...]
+
+    @classmethod
+    def from_trans_unit(cls, tu: MxliffTransUnit) -> MxliffTransUnitSnapshot:
+        alt_trans_units = tuple(MxliffAltTransSnapshot.from_alt_trans(a) for a in tu.alt_trans_units)
+        return MxliffTransUnitSnapshot(tu.id, tu.source, tu.target, sys.intern(tu.m_trans_origin), tu.m_score, tu.m_gross_score,
+                                       sys.intern(tu.m_confirmed), tu.m_locked, tu.m_para_id, tu.m_created_at,
+                                       sys.intern(tu.m_created_by), tu.m_modified_at, sys.intern(tu.m_modified_by),
+                                       tu.m_level_edited, alt_trans_units)
+
+
+class MxliffGroupSnapshot(NamedTuple):
+    id: str
+    m_para_id: str
+    contexts: tuple[tuple[str, str], ...]
+    trans_units: tuple[MxliffTransUnitSnapshot, ...]
+
+    @classmethod
+    def from_group(cls, group: MxliffGroup) -> MxliffGroupSnapshot:
+        contexts = tuple((sys.intern(c.context_type), c.value) for cg in group.context_groups for c in cg.contexts)
+        trans_units = tuple(MxliffTransUnitSnapshot.from_trans_unit(tu) for tu in group.trans_units)
+        return MxliffGroupSnapshot(group.id, group.m_para_id, contexts, trans_units)
+
+
+class MxliffFileSnapshot(NamedTuple):
+    source_language: str
+    target_language: str
+    original: str
+    datatype: str
+    m_file_format: str
+    m_task_id: str
+    groups: tuple[MxliffGroupSnapshot, ...]
+
+    @classmethod
+    def from_file(cls, file: MxliffFile) -> MxliffFileSnapshot:
+        groups = tuple(MxliffGroupSnapshot.from_group(g) for g in file.body.gruops)
+        return MxliffFileSnapshot(sys.intern(file.source_language), sys.intern(file.target_language), file.original,
+                                  sys.intern(file.datatype), sys.intern(file.m_file_format), file.m_task_id, groups)
+
+
+class MxliffSnapshot(NamedTuple):
+    source_file: str
+    level: int
+    version: str
+    m_version: str
+    files: tuple[MxliffFileSnapshot, ...]
+    trans_units: Mapping[str, MxliffTransUnitSnapshot]
+
+    @classmethod
+    def build(cls, source_file: str, level: int, version: str, m_version: str, files: tuple[MxliffFileSnapshot, ...]) -> MxliffSnapshot:
+        trans_units = {tu.id: tu for file in files for group in file.groups for tu in group.trans_units}
+        return MxliffSnapshot(source_file, level, version, m_version, files, MappingProxyType(trans_units))
+
+    @classmethod
+    def from_document(cls, doc: Mxliff) -> MxliffSnapshot:
+        files = tuple(MxliffFileSnapshot.from_file(file) for file in doc.files)
+        return MxliffSnapshot.build(doc.source_file, doc.level, sys.intern(doc.version), sys.intern(doc.m_version), files)
+
+    def __reduce__(self):
+        return MxliffSnapshot.build, (self.source_file, self.level, self.version, self.m_version, self.files)
+
+    def get_trans_unit(self, id_: str) -> Optional[MxliffTransUnitSnapshot]:
+        return self.trans_units.get(id_)
+
+    def get_all_trans_units(self) -> Iterator[MxliffTransUnitSnapshot]:
+        for file in self.files:
+            for group in file.groups:
+                yield from group.trans_units
+
+    @property
+    def source_language(self) -> str:
+        return self.files[0].source_language if self.files else ''
+
+    @property
+    def target_language(self) -> str:
+        return self.files[0].target_language if self.files else ''
+
+
+def snapshot(doc: Union[Sdlxliff, Mxliff]) -> Union[SdlxliffSnapshot, MxliffSnapshot]:
+    if isinstance(doc, Sdlxliff):
+        return SdlxliffSnapshot.from_document(doc)
+    if isinstance(doc, Mxliff):
+        return MxliffSnapshot.from_document(doc)
+    raise TranslatorToolkitError(f'unsupported document: {type(doc).__name__}')
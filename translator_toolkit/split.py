@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import glob
+import os
+import re
+from typing import Iterator, Optional
+
+from lxml import etree
+
+from translator_toolkit import segment as segmentlib
+from translator_toolkit.segment import SDLXLIFF, MXLIFF
+from translator_toolkit.ns import XLF, SDLXLF
+from translator_toolkit.util import xmlutil, xmlstream, stringutil
+from translator_toolkit.util.xmlstream import Container
+from translator_toolkit.error import TranslatorToolkitError
+
+SPLIT_BY_UNITS = 'units'
+SPLIT_BY_WORDS = 'words'
+SPLIT_BY_FILES = 'files'
+SPLIT_MODES = [SPLIT_BY_UNITS, SPLIT_BY_WORDS, SPLIT_BY_FILES]
+
+XLF_FILE = XLF + 'file'
+XLF_BODY = XLF + 'body'
+XLF_TRANS_UNIT = XLF + 'trans-unit'
+XLF_SOURCE = XLF + 'source'
+XLF_SEG_SOURCE = XLF + 'seg-source'
+SDLXLF_DOC_INFO = SDLXLF + 'doc-info'
+SDLXLF_CMT_DEFS = SDLXLF + 'cmt-defs'
+SDLXLF_CMT_DEF = SDLXLF + 'cmt-def'
+SDLXLF_CID = SDLXLF + 'cid'
+SDLXLF_CMT = SDLXLF + 'cmt'
+
+CONTAINER_TAGS = frozenset([XLF + 'xliff', XLF_FILE, XLF_BODY])
+CHUNK_PATTERN = re.compile(r'\.part(\d+)(\.[^.]+)$')
+
+
+def get_chunk_file(source_file: str, index: int, output_dir: Optional[str] = None) -> str:
+    root, ext = os.path.splitext(os.path.basename(source_file))
+    return os.path.join(output_dir or os.path.dirname(source_file), f'{root}.part{index + 1:03d}{ext}')
+
+
+def find_chunk_files(source_file: str, output_dir: Optional[str] = None) -> list[str]:
+    root, ext = os.path.splitext(os.path.basename(source_file))
+    pattern = os.path.join(output_dir or os.path.dirname(source_file), f'{glob.escape(root)}.part*{ext}')
+    return sort_chunk_files(glob.glob(pattern))
+
+
+def sort_chunk_files(chunk_files: list[str]) -> list[str]:
+    def get_index(chunk_file: str) -> int:
+        m = CHUNK_PATTERN.search(chunk_file)
+        if not m:
+            raise TranslatorToolkitError(f'not a chunk file: {chunk_file}')
+        return int(m.group(1))
+
+    return sorted(chunk_files, key=get_index)
+
+
+def iter_leaves(source_file: str, format_: str) -> Iterator[tuple[tuple[Container, ...], etree._Element]]:
+    huge_tree = xmlutil.is_huge(os.path.getsize(source_file))
+    if format_ == SDLXLIFF:
+        # valid character references such as &#xA0; are part of the content and must survive a rewrite
+        with xmlutil.ValidXmlReader(source_file, invalid_only=True) as reader:
+            yield from xmlstream.iter_leaves(reader, CONTAINER_TAGS, huge_tree=huge_tree, encoding='utf-8')
+    elif format_ == MXLIFF:
+        yield from xmlstream.iter_leaves(source_file, CONTAINER_TAGS, huge_tree=huge_tree)
+    else:
+        raise TranslatorToolkitError(f'split is not supported for {format_} files: {source_file}')
+
+
+def is_unit(path: tuple[Container, ...]) -> bool:
+    return path[-1].tag == XLF_BODY
+
+
+def count_units(elem: etree._Element) -> int:
+    return sum(1 for _ in elem.iter(XLF_TRANS_UNIT))
+
+
+def count_words(elem: etree._Element, format_: str) -> int:
+    words = 0
+    for tu in elem.iter(XLF_TRANS_UNIT):
+        source = None
+        for child in tu.iterchildren(XLF_SEG_SOURCE, XLF_SOURCE):
+            if source is None or child.tag == XLF_SEG_SOURCE:
+                source = child
+        if source is not None:
+            text = ''.join(source.itertext())
+            words += stringutil.count_words(segmentlib.remove_tags(text, MXLIFF) if format_ == MXLIFF else text)
+    return words
+
+
+def get_comment_ids(elem: etree._Element) -> set[str]:
+    cids = {cid for e in elem.iter() if (cid := e.get(SDLXLF_CID))}
+    cids.update(e.get('id', '') for e in elem.iter(SDLXLF_CMT))
+    return cids
+
+
+def filter_comment_definitions(data: bytes, cids: set[str]) -> bytes:
+    elem = etree.fromstring(data)
+    if elem.tag != SDLXLF_DOC_INFO:
+        return data
+    for cmt_def in list(elem.iter(SDLXLF_CMT_DEF)):
+        if cmt_def.get('id') not in cids:
+            cmt_def.getparent().remove(cmt_def)
+    return xmlstream.serialize(elem)
+
+
+def plan_chunks(source_file: str, format_: str, by: str = SPLIT_BY_UNITS, size: int = 1000) -> tuple[list[int], list[set[str]]]:
+    if by not in SPLIT_MODES:
+        raise TranslatorToolkitError(f'unknown split mode: {by}')
+    if by != SPLIT_BY_FILES and size < 1:
+        raise TranslatorToolkitError(f'invalid chunk size: {size}')
+    starts: list[int] = []
+    cids: list[set[str]] = []
+    current = 0
+    last_file = None
+    file_cids: dict[Container, set[str]] = {}
+    index = 0
+    for path, elem in iter_leaves(source_file, format_):
+        if not is_unit(path):
+            # file level comments (sdl:cmt in the header) are needed by every chunk of the file
+            if format_ == SDLXLIFF and path[-1].tag == XLF_FILE:
+                file_cids.setdefault(path[-1], set()).update(get_comment_ids(elem))
+            continue
+        file = path[-2]
+        if by == SPLIT_BY_FILES:
+            amount = 0
+            new_chunk = file is not last_file
+        else:
+            amount = count_units(elem) if by == SPLIT_BY_UNITS else count_words(elem, format_)
+            new_chunk = not starts or (current > 0 and current + amount > size)
+        if new_chunk:
+            starts.append(index)
+            cids.append(set())
+            current = 0
+        current += amount
+        last_file = file
+        if format_ == SDLXLIFF:
+            cids[-1].update(get_comment_ids(elem))
+            cids[-1].update(file_cids.get(file, ()))
+        index += 1
+    return starts, cids
+
+
+def split(source_file: str, by: str = SPLIT_BY_UNITS, size: int = 1000, output_dir: Optional[str] = None) -> list[str]:
+    format_ = segmentlib.get_format(source_file)
+    starts, cids = plan_chunks(source_file, format_, by, size)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    chunk_files = [get_chunk_file(source_file, i, output_dir) for i in range(len(starts))]
+    root_leaves: list[bytes] = []
+    chunk = -1
+    index = 0
+    outfile = None
+    writer = None
+    try:
+        for path, elem in iter_leaves(source_file, format_):
+            data = xmlstream.serialize(elem)
+            if not is_unit(path):
+                # leaves outside the body are repeated in every chunk that opens their container
+                if len(path) == 1:
+                    root_leaves.append(data)
+                else:
+                    path[-1].prologue.append(data)
+                continue
+            if chunk + 1 < len(starts) and starts[chunk + 1] == index:
+                if writer is not None:
+                    writer.close()
+                    outfile.close()
+                chunk += 1
+                path[0].prologue = [filter_comment_definitions(d, cids[chunk]) if format_ == SDLXLIFF else d for d in root_leaves]
+                outfile = open(chunk_files[chunk], 'wb')
+                writer = xmlstream.XmlStreamWriter(outfile)
+            if writer is None:
+                # the file changed between planning and writing the chunks
+                raise TranslatorToolkitError(f'unit outside of the planned chunks: {source_file}')
+            writer.write(path, data)
+            index += 1
+        if writer is not None:
+            writer.close()
+    finally:
+        if outfile is not None:
+            outfile.close()
+    return chunk_files
+
+
+def collect_comment_definitions(chunk_files: list[str], format_: str) -> dict[str, bytes]:
+    cmt_defs: dict[str, bytes] = {}
+    if format_ != SDLXLIFF:
+        return cmt_defs
+    for chunk_file in chunk_files:
+        for path, elem in iter_leaves(chunk_file, format_):
+            if is_unit(path):
+                break
+            if elem.tag == SDLXLF_DOC_INFO:
+                for cmt_def in elem.iter(SDLXLF_CMT_DEF):
+                    cmt_defs.setdefault(cmt_def.get('id', ''), xmlstream.serialize(cmt_def))
+    return cmt_defs
+
+
+def merge_comment_definitions(data: bytes, cmt_defs: dict[str, bytes]) -> bytes:
+    elem = etree.fromstring(data)
+    cmt_defs_elem = elem.find(SDLXLF_CMT_DEFS)
+    if cmt_defs_elem is None:
+        if not cmt_defs:
+            return data
+        cmt_defs_elem = etree.SubElement(elem, SDLXLF_CMT_DEFS)
+    cmt_defs_elem[:] = [etree.fromstring(d) for d in cmt_defs.values()]
+    return xmlstream.serialize(elem)
+
+
+def merge(chunk_files: list[str], output_file: str) -> int:
+    # leaves are written one per line, so whitespace and comments between them are not kept, and a file element of a chunk
+    # is continued from the previous chunk whenever their attributes match, which also joins adjacent files with identical
+    # attributes of the original document
+    if not chunk_files:
+        raise TranslatorToolkitError('no chunk files to merge')
+    format_ = segmentlib.get_format(chunk_files[0])
+    cmt_defs = collect_comment_definitions(chunk_files, format_)
+    count = 0
+    with open(output_file, 'wb') as outfile:
+        writer = xmlstream.XmlStreamWriter(outfile)
+        for i, chunk_file in enumerate(chunk_files):
+            joining = i > 0
+            for path, elem in iter_leaves(chunk_file, format_):
+                if joining:
+                    writer.join(path)
+                    joining = not is_unit(path)
+                if is_unit(path):
+                    writer.write(path, xmlstream.serialize(elem))
+                    count += count_units(elem)
+                elif not path[-1].joined:
+                    data = xmlstream.serialize(elem)
+                    if elem.tag == SDLXLF_DOC_INFO:
+                        data = merge_comment_definitions(data, cmt_defs)
+                    writer.write(path, data)
+        writer.close()
+    return count
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import bisect
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, Optional
+
+from lxml import etree
+
+from translator_toolkit import segment as segmentlib
+from translator_toolkit.segment import Segment, SDLXLIFF, MXLIFF, CONFIRMED_STATUSES
+from translator_toolkit.sdlxliff import SdlxliffSegDefinition
+from translator_toolkit.mxliff import MxliffTransUnit
+from translator_toolkit.alttrans import BAND_EDGES, BAND_NAMES
+from translator_toolkit.ns import XLF, SDLXLF
+from translator_toolkit.util import xmlutil, stringutil
+
+XLF_TRANS_UNIT = XLF + 'trans-unit'
+SDLXLF_SEG_PATH = f'{SDLXLF}seg-defs/{SDLXLF}seg'
+
+MXLIFF_SCAN_FIELDS = frozenset(['m_confirmed', 'm_score', 'm_locked'])
+
+
+def get_score_band(score: float) -> str:
+    # segments without a match score are reported separately from low fuzzy matches
+    return BAND_NAMES[bisect.bisect_right(BAND_EDGES, score)] if score > 0 else BAND_NAMES[0]
+
+
+class FileStats(object):
+    source_file: str
+    segments: int
+    words: Optional[int]
+    locked: int
+    confirmed: int
+    statuses: dict[str, int]
+    scores: dict[str, int]
+
+    def __init__(self, source_file: str, segments: int = 0, words: Optional[int] = 0, locked: int = 0, statuses: dict[str, int] = None,
+                 confirmed: int = 0, scores: dict[str, int] = None):
+        self.source_file = source_file
+        self.segments = segments
+        self.words = words
+        self.locked = locked
+        self.statuses = statuses if statuses is not None else {}
+        self.confirmed = confirmed
+        self.scores = scores if scores is not None else {}
+
+    def add(self, status: str, score: float, locked: bool, confirmed: bool):
+        self.segments += 1
+        self.locked += locked
+        self.confirmed += confirmed
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        band = get_score_band(score)
+        self.scores[band] = self.scores.get(band, 0) + 1
+
+    def to_json(self) -> dict:
+        return {
+            'source_file': self.source_file,
+            'segments': self.segments,
+            'words': self.words,
+            'locked': self.locked,
+            'confirmed': self.confirmed,
+            'statuses': self.statuses,
+            'scores': self.scores
+        }
+
+
+def get_segment_stats(source_file: str, segments: Iterable[Segment]) -> FileStats:
+    stats = FileStats(source_file)
+    words = 0
+    for segment in segments:
+        stats.add(segment.status, segment.score, segment.locked, segment.confirmed)
+        words += stringutil.count_words(segment.plain_source)
+    stats.words = words
+    return stats
+
+
+def get_stats(source_file: str) -> FileStats:
+    return get_segment_stats(source_file, segmentlib.stream_segments(source_file))
+
+
+def scan_sdlxliff_stats(source_file: str) -> FileStats:
+    stats = FileStats(source_file, words=None)
+    confirmed_statuses = CONFIRMED_STATUSES[SDLXLIFF]
+    huge_tree = xmlutil.is_huge(os.path.getsize(source_file))
+    with xmlutil.ValidXmlReader(source_file) as reader:
+        for _, elem in etree.iterparse(reader, tag=XLF_TRANS_UNIT, huge_tree=huge_tree, encoding='utf-8'):
+            for seg in elem.iterfind(SDLXLF_SEG_PATH):
+                seg_def = SdlxliffSegDefinition.from_attrib(seg.attrib)
+                stats.add(seg_def.conf, seg_def.percent, seg_def.locked, seg_def.conf in confirmed_statuses)
+            xmlutil.release(elem)
+    return stats
+
+
+def scan_mxliff_stats(source_file: str) -> FileStats:
+    stats = FileStats(source_file, words=None)
+    huge_tree = xmlutil.is_huge(os.path.getsize(source_file))
+    for _, elem in etree.iterparse(source_file, tag=XLF_TRANS_UNIT, huge_tree=huge_tree):
+        tu = MxliffTransUnit.from_attrib(elem.attrib, '', '', [], MXLIFF_SCAN_FIELDS)
+        stats.add(tu.m_confirmed, tu.m_score, tu.m_locked, tu.m_confirmed not in ('', '0'))
+        xmlutil.release(elem)
+    return stats
+
+
+def scan_stats(source_file: str) -> FileStats:
+    # only reads segment attributes, so words are not counted
+    format_ = segmentlib.get_format(source_file)
+    if format_ == SDLXLIFF:
+        return scan_sdlxliff_stats(source_file)
+    if format_ == MXLIFF:
+        return scan_mxliff_stats(source_file)
+    return get_stats(source_file)
+
+
+def iter_files_stats(source_files: Iterable[str], max_workers: int = 1, words: bool = False) -> Iterator[FileStats]:
+    source_files = list(source_files)
+    func = get_stats if words else scan_stats
+    if max_workers <= 1 or len(source_files) < 2:
+        for source_file in source_files:
+            yield func(source_file)
+        return
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        yield from executor.map(func, source_files, chunksize=max(1, len(source_files) // (max_workers * 4)))
@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import os
+import sqlite3
+from datetime import datetime, timezone
+from typing import Iterable, Optional, Union
+
+from translator_toolkit import segment as segmentlib
+from translator_toolkit.segment import SDLXLIFF, MXLIFF
+from translator_toolkit.sdlxliff import (Sdlxliff, SdlxliffDocInfo, SdlxliffCommentDefinition, SdlxliffComment, SdlxliffFile, SdlxliffBody,
+                                         SdlxliffTransUnit, SdlxliffSegmentPair, SdlxliffSegDefinition)
+from translator_toolkit.mxliff import (Mxliff, MxliffFile, MxliffBody, MxliffGroup, MxliffContextGroup, MxliffContext, MxliffTransUnit,
+                                       MxliffAltTrans)
+from translator_toolkit.error import TranslatorToolkitError
+from translator_toolkit.util import fileutil
+
+SCHEMA_VERSION = 1
+BATCH_SIZE = 5000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    format TEXT NOT NULL,
+    hash TEXT NOT NULL,
+    level INTEGER,
+    version TEXT,
+    m_version TEXT
+);
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    document_id INTEGER NOT NULL REFERENCES documents(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    source_language TEXT,
+    target_language TEXT,
+    original TEXT,
+    datatype TEXT,
+    m_file_format TEXT,
+    m_task_id TEXT
+);
+CREATE TABLE IF NOT EXISTS unit_groups (
+    id INTEGER PRIMARY KEY,
+    file_id INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    group_id TEXT,
+    m_para_id TEXT
+);
+CREATE TABLE IF NOT EXISTS contexts (
+    group_id INTEGER NOT NULL REFERENCES unit_groups(id) ON DELETE CASCADE,
+    context_group INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    context_type TEXT,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS units (
+    id INTEGER PRIMARY KEY,
+    file_id INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+    group_id INTEGER REFERENCES unit_groups(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    unit_id TEXT,
+    m_trans_origin TEXT,
+    m_score REAL,
+    m_gross_score REAL,
+    m_confirmed TEXT,
+    m_locked INTEGER,
+    m_para_id TEXT,
+    m_created_at INTEGER,
+    m_created_by TEXT,
+    m_modified_at INTEGER,
+    m_modified_by TEXT,
+    m_level_edited INTEGER
+);
+CREATE TABLE IF NOT EXISTS segments (
+    id INTEGER PRIMARY KEY,
+    unit_id INTEGER NOT NULL REFERENCES units(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    mid TEXT,
+    source TEXT,
+    target TEXT
+);
+CREATE TABLE IF NOT EXISTS seg_defs (
+    unit_id INTEGER NOT NULL REFERENCES units(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    seg_id TEXT,
+    conf TEXT,
+    origin TEXT,
+    origin_system TEXT,
+    percent REAL,
+    locked INTEGER
+);
+CREATE TABLE IF NOT EXISTS alt_trans (
+    unit_id INTEGER NOT NULL REFERENCES units(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    origin TEXT,
+    match_quality REAL,
+    target TEXT
+);
+CREATE TABLE IF NOT EXISTS comments (
+    document_id INTEGER NOT NULL REFERENCES documents(id) ON DELETE CASCADE,
+    cid TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    severity TEXT,
+    user TEXT,
+    date TEXT,
+    version TEXT,
+    text TEXT
+);
+CREATE INDEX IF NOT EXISTS files_document ON files(document_id);
+CREATE INDEX IF NOT EXISTS unit_groups_file ON unit_groups(file_id);
+CREATE INDEX IF NOT EXISTS contexts_group ON contexts(group_id);
+CREATE INDEX IF NOT EXISTS units_file ON units(file_id);
+CREATE INDEX IF NOT EXISTS segments_unit ON segments(unit_id);
+CREATE INDEX IF NOT EXISTS seg_defs_unit ON seg_defs(unit_id);
+CREATE INDEX IF NOT EXISTS alt_trans_unit ON alt_trans(unit_id);
+CREATE INDEX IF NOT EXISTS comments_document ON comments(document_id, cid);
+CREATE VIRTUAL TABLE IF NOT EXISTS segments_fts USING fts5(source, target, tokenize='trigram');
+"""
+
+INSERT_SQL = {
+    'files': 'INSERT INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+    'unit_groups': 'INSERT INTO unit_groups VALUES (?, ?, ?, ?, ?)',
+    'contexts': 'INSERT INTO contexts VALUES (?, ?, ?, ?, ?)',
+    'units': 'INSERT INTO units VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+    'segments': 'INSERT INTO segments VALUES (?, ?, ?, ?, ?, ?)',
+    'segments_fts': 'INSERT INTO segments_fts (rowid, source, target) VALUES (?, ?, ?)',
+    'seg_defs': 'INSERT INTO seg_defs VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+    'alt_trans': 'INSERT INTO alt_trans VALUES (?, ?, ?, ?, ?)',
+    'comments': 'INSERT INTO comments VALUES (?, ?, ?, ?, ?, ?, ?, ?)'
+}
+
+
+def to_epoch_ms(value: datetime) -> int:
+    return round(value.timestamp() * 1000)
+
+
+def from_epoch_ms(value: int) -> datetime:
+    return datetime.fromtimestamp(value / 1000, timezone.utc)
+
+
+class BatchWriter(object):
+    conn: sqlite3.Connection
+    batch_size: int
+    rows: dict[str, list[tuple]]
+    next_ids: dict[str, int]
+
+    def __init__(self, conn: sqlite3.Connection, batch_size: int = BATCH_SIZE):
+        self.conn = conn
+        self.batch_size = batch_size
+        self.rows = {table: [] for table in INSERT_SQL}
+        # row ids are assigned here so that child rows can be batched together with their parents
+        self.next_ids = {table: conn.execute(f'SELECT COALESCE(MAX(id), 0) + 1 FROM {table}').fetchone()[0] for table in ['files', 'unit_groups', 'units', 'segments']}
+
+    def next_id(self, table: str) -> int:
+        id_ = self.next_ids[table]
+        self.next_ids[table] += 1
+        return id_
+
+    def add(self, table: str, row: tuple):
+        rows = self.rows[table]
+        rows.append(row)
+        if len(rows) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        # parents are written before children to satisfy the foreign keys
+        for table, rows in self.rows.items():
+            if rows:
+                self.conn.executemany(INSERT_SQL[table], rows)
+                rows.clear()
+
+
+class ProjectStore(object):
+    db_file: str
+    conn: sqlite3.Connection
+
+    def __init__(self, db_file: str):
+        self.db_file = db_file
+        self.conn = sqlite3.connect(db_file, isolation_level=None)
+        self.conn.execute('PRAGMA journal_mode = WAL')
+        self.conn.execute('PRAGMA synchronous = NORMAL')
+        self.conn.execute('PRAGMA foreign_keys = ON')
+        version = self.conn.execute('PRAGMA user_version').fetchone()[0]
+        if version not in (0, SCHEMA_VERSION):
+            raise TranslatorToolkitError(f'unsupported store version: {version}')
+        self.conn.executescript(SCHEMA)
+        self.conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+
+    def __enter__(self) -> ProjectStore:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def __contains__(self, source_file: str) -> bool:
+        return self._get_document_id(os.path.abspath(source_file)) is not None
+
+    def _get_document_id(self, path: str) -> Optional[int]:
+        row = self.conn.execute('SELECT id FROM documents WHERE path = ?', (path,)).fetchone()
+        return row[0] if row else None
+
+    def _delete_document(self, document_id: int):
+        self.conn.execute('DELETE FROM segments_fts WHERE rowid IN (SELECT s.id FROM segments s JOIN units u ON s.unit_id = u.id '
+                          'JOIN files f ON u.file_id = f.id WHERE f.document_id = ?)', (document_id,))
+        self.conn.execute('DELETE FROM documents WHERE id = ?', (document_id,))
+
+    def add_file(self, source_file: str) -> bool:
+        path = os.path.abspath(source_file)
+        hash_ = fileutil.hash_file(path)
+        format_ = segmentlib.get_format(path)
+        if format_ not in (SDLXLIFF, MXLIFF):
+            raise TranslatorToolkitError(f'unsupported document: {path}')
+        row = self.conn.execute('SELECT hash FROM documents WHERE path = ?', (path,)).fetchone()
+        if row and row[0] == hash_:
+            return False
+        self.add_document(Sdlxliff.load(path) if format_ == SDLXLIFF else Mxliff.load(path), hash_)
+        return True
+
+    def add_files(self, source_files: Iterable[str]) -> int:
+        return sum(1 for source_file in source_files if self.add_file(source_file))
+
+    def add_document(self, doc: Union[Sdlxliff, Mxliff], hash_: Optional[str] = None):
+        path = os.path.abspath(doc.source_file)
+        if hash_ is None:
+            hash_ = fileutil.hash_file(path) if os.path.isfile(path) else ''
+        self.conn.execute('BEGIN IMMEDIATE')
+        try:
+            document_id = self._get_document_id(path)
+            if document_id is not None:
+                self._delete_document(document_id)
+            writer = BatchWriter(self.conn)
+            if isinstance(doc, Sdlxliff):
+                cursor = self.conn.execute('INSERT INTO documents (path, format, hash) VALUES (?, ?, ?)', (path, SDLXLIFF, hash_))
+                self._add_sdlxliff(writer, cursor.lastrowid, doc)
+            elif isinstance(doc, Mxliff):
+                cursor = self.conn.execute('INSERT INTO documents (path, format, hash, level, version, m_version) VALUES (?, ?, ?, ?, ?, ?)',
+                                           (path, MXLIFF, hash_, doc.level, doc.version, doc.m_version))
+                self._add_mxliff(writer, cursor.lastrowid, doc)
+            else:
+                raise TranslatorToolkitError(f'unsupported document: {type(doc).__name__}')
+            writer.flush()
+        except BaseException:
+            self.conn.execute('ROLLBACK')
+            raise
+        self.conn.execute('COMMIT')
+
+    def _add_sdlxliff(self, writer: BatchWriter, document_id: int, doc: Sdlxliff):
+        for cmt_def in doc.doc_info.comment_definitions:
+            for i, c in enumerate(cmt_def.comments):
+                writer.add('comments', (document_id, cmt_def.id, i, c.severity, c.user, c.date.isoformat() if c.date else None, c.version, c.text))
+        for i, file in enumerate(doc.files):
+            file_id = writer.next_id('files')
+            writer.add('files', (file_id, document_id, i, file.source_language, file.target_language, file.original, file.datatype, None, None))
+            for j, tu in enumerate(file.body.trans_units):
+                unit_id = writer.next_id('units')
+                writer.add('units', (unit_id, file_id, None, j, tu.id) + (None,) * 11)
+                for k, sp in enumerate(tu.segment_pairs):
+                    segment_id = writer.next_id('segments')
+                    writer.add('segments', (segment_id, unit_id, k, sp.mid, sp.source, sp.target))
+                    writer.add('segments_fts', (segment_id, segmentlib.remove_tags(sp.source, SDLXLIFF), segmentlib.remove_tags(sp.target, SDLXLIFF)))
+                for k, s in enumerate(tu.segment_definitions):
+                    writer.add('seg_defs', (unit_id, k, s.id, s.conf, s.origin, s.origin_system, s.percent, s.locked))
+
+    def _add_mxliff(self, writer: BatchWriter, document_id: int, doc: Mxliff):
+        for i, file in enumerate(doc.files):
+            file_id = writer.next_id('files')
+            writer.add('files', (file_id, document_id, i, file.source_language, file.target_language, file.original, file.datatype,
+                                 file.m_file_format, file.m_task_id))
+            position = 0
+            for j, group in enumerate(file.body.gruops):
+                group_id = writer.next_id('unit_groups')
+                writer.add('unit_groups', (group_id, file_id, j, group.id, group.m_para_id))
+                for k, cg in enumerate(group.context_groups):
+                    for m, c in enumerate(cg.contexts):
+                        writer.add('contexts', (group_id, k, m, c.context_type, c.value))
+                for tu in group.trans_units:
+                    unit_id = writer.next_id('units')
+                    writer.add('units', (unit_id, file_id, group_id, position, tu.id, tu.m_trans_origin, tu.m_score, tu.m_gross_score, tu.m_confirmed,
+                                         tu.m_locked, tu.m_para_id, to_epoch_ms(tu.m_created_at), tu.m_created_by, to_epoch_ms(tu.m_modified_at),
+                                         tu.m_modified_by, tu.m_level_edited))
+                    segment_id = writer.next_id('segments')
+                    writer.add('segments', (segment_id, unit_id, 0, tu.id, tu.source, tu.target))
+                    writer.add('segments_fts', (segment_id, segmentlib.remove_tags(tu.source, MXLIFF), segmentlib.remove_tags(tu.target, MXLIFF)))
+                    for k, a in enumerate(tu.alt_trans_units):
+                        writer.add('alt_trans', (unit_id, k, a.origin, a.match_quality, a.target))
+                    position += 1
+
+    def remove_file(self, source_file: str) -> bool:
+        document_id = self._get_document_id(os.path.abspath(source_file))
+        if document_id is None:
+            return False
+        self.conn.execute('BEGIN IMMEDIATE')
+        self._delete_document(document_id)
+        self.conn.execute('COMMIT')
+        return True
+
+    def get_files(self) -> list[str]:
+        return [row[0] for row in self.conn.execute('SELECT path FROM documents ORDER BY path')]
+
+    def load(self, source_file: str) -> Union[Sdlxliff, Mxliff]:
+        path = os.path.abspath(source_file)
+        row = self.conn.execute('SELECT id, format, level, version, m_version FROM documents WHERE path = ?', (path,)).fetchone()
+        if row is None:
+            raise TranslatorToolkitError(f'file not found in store: {source_file}')
+        document_id, format_, level, version, m_version = row
+        if format_ == SDLXLIFF:
+            return self._load_sdlxliff(document_id, path)
+        return Mxliff(path, level, version, m_version, self._load_mxliff_files(document_id))
+
+    def _get_children(self, sql: str, document_id: int) -> dict[int, list[tuple]]:
+        children: dict[int, list[tuple]] = {}
+        for row in self.conn.execute(sql, (document_id,)):
+            children.setdefault(row[0], []).append(row[1:])
+        return children
+
+    def _load_sdlxliff(self, document_id: int, path: str) -> Sdlxliff:
+        comment_definitions: dict[str, SdlxliffCommentDefinition] = {}
+        for cid, severity, user, date, version, text in self.conn.execute(
+                'SELECT cid, severity, user, date, version, text FROM comments WHERE document_id = ? ORDER BY rowid', (document_id,)):
+            cmt_def = comment_definitions.setdefault(cid, SdlxliffCommentDefinition(cid, []))
+            cmt_def.comments.append(SdlxliffComment(severity, user, datetime.fromisoformat(date) if date else None, version, text))
+        segments = self._get_children('SELECT u.id, s.mid, s.source, s.target FROM segments s JOIN units u ON s.unit_id = u.id '
+                                      'JOIN files f ON u.file_id = f.id WHERE f.document_id = ? ORDER BY s.unit_id, s.position', document_id)
+        seg_defs = self._get_children('SELECT u.id, d.seg_id, d.conf, d.origin, d.origin_system, d.percent, d.locked FROM seg_defs d '
+                                      'JOIN units u ON d.unit_id = u.id JOIN files f ON u.file_id = f.id WHERE f.document_id = ? '
+                                      'ORDER BY d.unit_id, d.position', document_id)
+        files: dict[int, SdlxliffFile] = {}
+        for file_id, source_language, target_language, original, datatype in self.conn.execute(
+                'SELECT id, source_language, target_language, original, datatype FROM files WHERE document_id = ? ORDER BY position', (document_id,)):
+            files[file_id] = SdlxliffFile(source_language, target_language, original, datatype, SdlxliffBody([]))
+        for unit_id, file_id, tu_id in self.conn.execute('SELECT u.id, u.file_id, u.unit_id FROM units u JOIN files f ON u.file_id = f.id '
+                                                         'WHERE f.document_id = ? ORDER BY u.file_id, u.position', (document_id,)):
+            segment_pairs = [SdlxliffSegmentPair(*r) for r in segments.get(unit_id, [])]
+            segment_definitions = [SdlxliffSegDefinition(id_, conf, origin, origin_system, percent, bool(locked))
+                                   for id_, conf, origin, origin_system, percent, locked in seg_defs.get(unit_id, [])]
+            files[file_id].body.trans_units.append(SdlxliffTransUnit(tu_id, segment_pairs, segment_definitions))
+        return Sdlxliff(path, SdlxliffDocInfo(list(comment_definitions.values())), list(files.values()))
+
+    def _load_mxliff_files(self, document_id: int) -> list[MxliffFile]:
+        alt_trans = self._get_children('SELECT u.id, a.origin, a.match_quality, a.target FROM alt_trans a JOIN units u ON a.unit_id = u.id '
+                                       'JOIN files f ON u.file_id = f.id WHERE f.document_id = ? ORDER BY a.unit_id, a.position', document_id)
+        contexts = self._get_children('SELECT g.id, c.context_group, c.context_type, c.value FROM contexts c JOIN unit_groups g ON c.group_id = g.id '
+                                      'JOIN files f ON g.file_id = f.id WHERE f.document_id = ? ORDER BY c.group_id, c.context_group, c.position',
+                                      document_id)
+        files: dict[int, MxliffFile] = {}
+        for file_id, source_language, target_language, original, datatype, m_file_format, m_task_id in self.conn.execute(
+                'SELECT id, source_language, target_language, original, datatype, m_file_format, m_task_id FROM files '
+                'WHERE document_id = ? ORDER BY position', (document_id,)):
+            files[file_id] = MxliffFile(source_language, target_language, original, datatype, m_file_format, m_task_id, MxliffBody([]))
+        groups: dict[int, MxliffGroup] = {}
+        for group_id, file_id, id_, m_para_id in self.conn.execute('SELECT g.id, g.file_id, g.group_id, g.m_para_id FROM unit_groups g '
+                                                                   'JOIN files f ON g.file_id = f.id WHERE f.document_id = ? '
+                                                                   'ORDER BY g.file_id, g.position', (document_id,)):
+            context_groups: dict[int, MxliffContextGroup] = {}
+            for context_group, context_type, value in contexts.get(group_id, []):
+                context_groups.setdefault(context_group, MxliffContextGroup([])).contexts.append(MxliffContext(context_type, value))
+            group = groups[group_id] = MxliffGroup(id_, m_para_id, list(context_groups.values()), [])
+            files[file_id].body.gruops.append(group)
+        for row in self.conn.execute('SELECT u.id, u.group_id, u.unit_id, s.source, s.target, u.m_trans_origin, u.m_score, u.m_gross_score, '
+                                     'u.m_confirmed, u.m_locked, u.m_para_id, u.m_created_at, u.m_created_by, u.m_modified_at, u.m_modified_by, '
+                                     'u.m_level_edited FROM units u JOIN segments s ON s.unit_id = u.id JOIN files f ON u.file_id = f.id '
+                                     'WHERE f.document_id = ? ORDER BY u.file_id, u.position', (document_id,)):
+            groups[row[1]].trans_units.append(self._to_mxliff_trans_unit(row[2:], alt_trans.get(row[0], [])))
+        return list(files.values())
+
+    @staticmethod
+    def _to_mxliff_trans_unit(row: tuple, alt_trans: list[tuple]) -> MxliffTransUnit:
+        (id_, source, target, m_trans_origin, m_score, m_gross_score, m_confirmed, m_locked, m_para_id, m_created_at, m_created_by,
+         m_modified_at, m_modified_by, m_level_edited) = row
+        alt_trans_units = [MxliffAltTrans(origin, match_quality, alt_target) for origin, match_quality, alt_target in alt_trans]
+        return MxliffTransUnit(id_, source, target, m_trans_origin, m_score, m_gross_score, m_confirmed, bool(m_locked), m_para_id,
+                               from_epoch_ms(m_created_at), m_created_by, from_epoch_ms(m_modified_at), m_modified_by, bool(m_level_edited),
+                               alt_trans_units)
+
+    def search(self, query: str, field: str = 'source', limit: Optional[int] = None) -> list[tuple[str, Union[SdlxliffSegmentPair, MxliffTransUnit]]]:
+        if field not in ('source', 'target'):
+            raise TranslatorToolkitError(f'unknown field: {field}')
+        if len(query) < 3:
+            # the trigram tokenizer cannot match shorter queries, so fall back to a scan
+            condition = f'segments_fts.{field} LIKE ?'
+            pattern = '%' + query.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+            condition += " ESCAPE '\\'"
+        else:
+            condition = 'segments_fts MATCH ?'
+            # quote the query so that it is matched as a phrase rather than parsed as fts5 syntax
+            pattern = f'{field}: "' + query.replace('"', '""') + '"'
+        sql = ('SELECT d.path, d.format, u.id, s.mid, s.source, s.target, u.m_trans_origin, u.m_score, u.m_gross_score, u.m_confirmed, '
+               'u.m_locked, u.m_para_id, u.m_created_at, u.m_created_by, u.m_modified_at, u.m_modified_by, u.m_level_edited '
+               'FROM segments_fts JOIN segments s ON segments_fts.rowid = s.id JOIN units u ON s.unit_id = u.id '
+               'JOIN files f ON u.file_id = f.id JOIN documents d ON f.document_id = d.id '
+               f'WHERE {condition} ORDER BY d.path, s.id LIMIT ?')
+        hits: list[tuple[str, Union[SdlxliffSegmentPair, MxliffTransUnit]]] = []
+        for row in self.conn.execute(sql, (pattern, -1 if limit is None else limit)):
+            path, format_, unit_id = row[:3]
+            if format_ == SDLXLIFF:
+                hits.append((path, SdlxliffSegmentPair(row[3], row[4], row[5])))
+            else:
+                alt_trans = [r[1:] for r in self.conn.execute('SELECT unit_id, origin, match_quality, target FROM alt_trans WHERE unit_id = ? '
+                                                              'ORDER BY position', (unit_id,))]
+                hits.append((path, self._to_mxliff_trans_unit(row[3:], alt_trans)))
+        return hits
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import csv
+import unicodedata
+from collections import deque
+from typing import Iterable, Iterator, Optional, Union
+
+from translator_toolkit import segment as segmentlib
+from translator_toolkit.segment import Segment
+from translator_toolkit.sdlxliff import Sdlxliff
+from translator_toolkit.mxliff import Mxliff
+from translator_toolkit.error import TranslatorToolkitError
+
+
+def normalize(text: str) -> str:
+    return unicodedata.normalize('NFKC', text).casefold()
+
+
+def normalize_with_offsets(text: str) -> tuple[str, Optional[list[int]], Optional[list[int]]]:
+    # NFKC and casefold change the length (ß -> ss, ﬁ -> fi), so every normalised character is mapped back to the
+    # start and end of the original character and its combining marks, None when the offsets are unchanged
+    if text.isascii():
+        return text.lower(), None, None
+    parts = []
+    starts: list[int] = []
+    ends: list[int] = []
+    i = 0
+    while i < len(text):
+        j = i + 1
+        while j < len(text) and unicodedata.combining(text[j]):
+            j += 1
+        part = normalize(text[i:j])
+        parts.append(part)
+        starts.extend([i] * len(part))
+        ends.extend([j] * len(part))
+        i = j
+    return ''.join(parts), starts, ends
+
+
+def is_word_char(char: str) -> bool:
+    return (char.isalnum() or char == '_') and not unicodedata.name(char, '').startswith(('CJK', 'HIRAGANA', 'KATAKANA', 'HANGUL'))
+
+
+class Term(object):
+    source: str
+    targets: list[str]
+
+    def __init__(self, source: str, targets: list[str]):
+        self.source = source
+        self.targets = targets
+
+
+class Termbase(object):
+    terms: list[Term]
+
+    def __init__(self, terms: list[Term]):
+        self.terms = terms
+
+    @classmethod
+    def load_csv(cls, termbase_file: str, delimiter: str = ',', target_separator: str = '|') -> Termbase:
+        terms = []
+        with open(termbase_file, newline='', encoding='utf-8-sig') as infile:
+            for row in csv.reader(infile, delimiter=delimiter):
+                if not row or not row[0].strip():
+                    continue
+                targets = [t.strip() for col in row[1:] for t in col.split(target_separator) if t.strip()]
+                terms.append(Term(row[0].strip(), targets))
+        return Termbase(terms)
+
+
+class AhoCorasick(object):
+    def __init__(self, patterns: Iterable[str]):
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._output: list[list[int]] = [[]]
+        self._lengths: list[int] = []
+        for pattern_id, pattern in enumerate(patterns):
+            if not pattern:
+                raise TranslatorToolkitError('empty pattern')
+            self._lengths.append(len(pattern))
+            state = 0
+            for char in pattern:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                state = next_state
+            self._output[state].append(pattern_id)
+        self._build_failure_links()
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                fail = self._goto[fail].get(char, 0)
+                self._fail[next_state] = fail if fail != next_state else 0
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def finditer(self, text: str) -> Iterator[tuple[int, int, int]]:
+        goto, fail, output, lengths = self._goto, self._fail, self._output, self._lengths
+        state = 0
+        for end, char in enumerate(text, 1):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for pattern_id in output[state]:
+                yield end - lengths[pattern_id], end, pattern_id
+
+
+class TermHit(object):
+    source_file: str
+    segment_id: str
+    term: Term
+    start: int
+    end: int
+    target_found: bool
+
+    def __init__(self, source_file: str, segment_id: str, term: Term, start: int, end: int, target_found: bool):
+        self.source_file = source_file
+        self.segment_id = segment_id
+        self.term = term
+        self.start = start
+        self.end = end
+        self.target_found = target_found
+
+    def to_json(self) -> dict:
+        return {
+            'source_file': self.source_file,
+            'segment_id': self.segment_id,
+            'source_term': self.term.source,
+            'target_terms': self.term.targets,
+            'start': self.start,
+            'end': self.end,
+            'target_found': self.target_found
+        }
+
+
+class TermMatcher(object):
+    termbase: Termbase
+    whole_words: bool
+
+    def __init__(self, termbase: Termbase, whole_words: bool = True):
+        self.termbase = termbase
+        self.whole_words = whole_words
+        target_ids: dict[str, int] = {}
+        self._term_target_ids = []
+        for term in termbase.terms:
+            self._term_target_ids.append({target_ids.setdefault(normalize(t), len(target_ids)) for t in term.targets})
+        self._source_automaton = AhoCorasick(normalize(term.source) for term in termbase.terms)
+        self._target_automaton = AhoCorasick(target_ids)
+
+    def _is_whole_word(self, text: str, start: int, end: int) -> bool:
+        if start > 0 and is_word_char(text[start]) and is_word_char(text[start - 1]):
+            return False
+        if end < len(text) and is_word_char(text[end - 1]) and is_word_char(text[end]):
+            return False
+        return True
+
+    def _find(self, automaton: AhoCorasick, text: str) -> Iterator[tuple[int, int, int]]:
+        # offsets and word boundaries refer to the original text
+        normalized, starts, ends = normalize_with_offsets(text)
+        for start, end, pattern_id in automaton.finditer(normalized):
+            if starts is not None and ends is not None:
+                # a word boundary cannot fall inside an original character
+                if self.whole_words and ((start > 0 and starts[start - 1] == starts[start]) or (end < len(ends) and ends[end] == ends[end - 1])):
+                    continue
+                start, end = starts[start], ends[end - 1]
+            if not self.whole_words or self._is_whole_word(text, start, end):
+                yield start, end, pattern_id
+
+    def match(self, segment: Segment) -> list[TermHit]:
+        hits = list(self._find(self._source_automaton, segment.plain_source))
+        if not hits:
+            return []
+        found_target_ids = {target_id for _, _, target_id in self._find(self._target_automaton, segment.plain_target)}
+        terms = self.termbase.terms
+        return [TermHit(segment.source_file, segment.id, terms[term_id], start, end,
+                        not self._term_target_ids[term_id].isdisjoint(found_target_ids))
+                for start, end, term_id in hits]
+
+    def match_segments(self, segments: Iterable[Segment]) -> Iterator[TermHit]:
+        for segment in segments:
+            yield from self.match(segment)
+
+    def match_document(self, doc: Union[Sdlxliff, Mxliff]) -> Iterator[TermHit]:
+        return self.match_segments(segmentlib.iter_segments(doc))
+
+    def get_missing_targets(self, segments: Iterable[Segment]) -> Iterator[TermHit]:
+        for hit in self.match_segments(segments):
+            if hit.term.targets and not hit.target_found:
+                yield hit
@@ -1,5 +1,7 @@
 #!/usr/bin/env python3
+import hashlib
 import os
+from typing import Iterable
 
 
 def remove_if_exists(filepath: str) -> bool:
@@ -7,3 +9,24 @@ def remove_if_exists(filepath: str) -> bool:
         os.remove(filepath)
         return True
     return False
+
+
+def find_files(paths: Iterable[str], exts: Iterable[str]) -> list[str]:
+    exts = tuple(ext.lower() for ext in exts)
+    files: list[str] = []
+    for path in paths:
+        if os.path.isdir(path):
+            for dirpath, dirnames, filenames in os.walk(path):
+                dirnames.sort()
+                files.extend(os.path.join(dirpath, f) for f in sorted(filenames) if f.lower().endswith(exts))
+        else:
+            files.append(path)
+    return files
+
+
+def hash_file(filepath: str, chunk_size: int = 1 << 20) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            h.update(chunk)
+    return h.hexdigest()
@@ -1,7 +1,12 @@
 #!/usr/bin/env python3
+import hashlib
+import re
 from typing import Optional
 from datetime import datetime, timezone, tzinfo
-import regex
+
+
+CJK_CHARS = '\u3005\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff'
+WORD_PATTERN = re.compile(f"[{CJK_CHARS}]|(?:(?![{CJK_CHARS}])[^\\W_])+(?:['’.,-](?:(?![{CJK_CHARS}])[^\\W_])+)*")
 
 
 def is_float(value: str) -> bool:
@@ -27,9 +32,18 @@ def unixtime_to_datetime(value: str, tz: tzinfo = timezone.utc, from_mxliff: boo
 
 
 def isoformat_to_datetime(value: str) -> Optional[datetime]:
+    import regex
     m = regex.search(r'(?P<datetime>\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2})\.(?P<ms>\d{1,})(?P<offset>\+.+)', value)
     if not m:
         return None
     ms = m.group('ms')[:6]
     new_value = f'{m.group("datetime")}.{ms}{m.group("offset")}'
     return datetime.fromisoformat(new_value)
+
+
+def hash_text(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def count_words(value: str) -> int:
+    return sum(1 for _ in WORD_PATTERN.finditer(value))
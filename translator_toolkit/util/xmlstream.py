@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import re
+from typing import IO, Iterator, Optional, Union, AbstractSet
+
+from lxml import etree
+
+from translator_toolkit.util import xmlutil
+from translator_toolkit.error import TranslatorToolkitError
+
+XML_DECLARATION = b'<?xml version="1.0" encoding="utf-8"?>\n'
+
+QNAME_PATTERN = re.compile(rb'<([^\s/>]+)')
+XMLNS_PATTERN = re.compile(rb'\sxmlns(?::([^\s=]+))?="([^"]*)"')
+
+
+class Container(object):
+    tag: str
+    attrib: dict[str, str]
+    nsmap: dict[Optional[str], str]
+    start_tag: bytes
+    end_tag: bytes
+    prologue: list[bytes]
+    joined: bool
+
+    def __init__(self, tag: str, attrib: dict[str, str], nsmap: dict[Optional[str], str]):
+        self.tag = tag
+        self.attrib = attrib
+        self.nsmap = nsmap
+        empty = etree.tostring(etree.Element(tag, attrib=attrib, nsmap=nsmap))
+        self.start_tag = empty[:-2] + b'>'
+        match = QNAME_PATTERN.match(empty)
+        if match is None:
+            raise TranslatorToolkitError(f'cannot serialize container: {tag}')
+        self.end_tag = b'</' + match.group(1) + b'>'
+        self.prologue = []
+        self.joined = False
+
+    @classmethod
+    def from_element(cls, elem: etree._Element) -> Container:
+        return Container(elem.tag, dict(elem.attrib), dict(elem.nsmap))
+
+    @property
+    def key(self) -> tuple:
+        return self.tag, tuple(sorted(self.attrib.items()))
+
+
+def iter_leaves(source: Union[str, IO[bytes], xmlutil.ValidXmlReader], container_tags: AbstractSet[str], huge_tree: bool = False,
+                encoding: Optional[str] = None) -> Iterator[tuple[tuple[Container, ...], etree._Element]]:
+    path: list[Container] = []
+    leaf = None
+    context = etree.iterparse(source, events=('start', 'end'), huge_tree=huge_tree, encoding=encoding)
+    for event, elem in context:
+        if event == 'start':
+            if leaf is not None:
+                continue
+            if elem.tag in container_tags:
+                path.append(Container.from_element(elem))
+            else:
+                leaf = elem
+        elif elem is leaf:
+            yield tuple(path), elem
+            leaf = None
+            xmlutil.release(elem)
+        elif leaf is None:
+            path.pop()
+
+
+def serialize(elem: etree._Element) -> bytes:
+    return etree.tostring(elem, encoding='utf-8', with_tail=False)
+
+
+class XmlStreamWriter(object):
+    def __init__(self, outfile: IO[bytes]):
+        self._outfile = outfile
+        self._stack: list[Container] = []
+        outfile.write(XML_DECLARATION)
+
+    def _strip_namespaces(self, data: bytes) -> bytes:
+        if not self._stack:
+            return data
+        nsmap = self._stack[-1].nsmap
+        end = data.index(b'>')
+
+        def replace(m: re.Match) -> bytes:
+            prefix = m.group(1).decode('utf-8') if m.group(1) is not None else None
+            return b'' if nsmap.get(prefix) == m.group(2).decode('utf-8') else m.group()
+
+        return XMLNS_PATTERN.sub(replace, data[:end]) + data[end:]
+
+    def _sync(self, path: tuple[Container, ...]):
+        n = 0
+        while n < len(self._stack) and n < len(path) and self._stack[n] is path[n]:
+            n += 1
+        while len(self._stack) > n:
+            self._outfile.write(self._stack.pop().end_tag + b'\n')
+        for container in path[n:]:
+            self._outfile.write(self._strip_namespaces(container.start_tag) + b'\n')
+            self._stack.append(container)
+            for data in container.prologue:
+                self._outfile.write(self._strip_namespaces(data) + b'\n')
+
+    def join(self, path: tuple[Container, ...]):
+        for i, container in enumerate(path):
+            if i >= len(self._stack) or self._stack[i].key != container.key:
+                break
+            container.joined = True
+            self._stack[i] = container
+
+    def write(self, path: tuple[Container, ...], data: bytes):
+        self._sync(path)
+        self._outfile.write(self._strip_namespaces(data) + b'\n')
+
+    def close(self):
+        self._sync(())
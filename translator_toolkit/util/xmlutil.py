@@ -1,19 +1,105 @@
 #!/usr/bin/env python3
+from __future__ import annotations
+
 import os
 import re
 from lxml import etree
-from typing import Union
+from typing import Union, Iterable, IO
+
+HUGE_TREE_SIZE_MB = 9
+
+
+def is_huge(size: int) -> bool:
+    return size / 1000000 > HUGE_TREE_SIZE_MB
 
 
 def get_parser(xml_file: str, encoding: Union[str, None] = None) -> etree.XMLParser:
-    size_mb = os.path.getsize(xml_file) / 1000000
-    if size_mb > 9:
+    return get_parser_for_size(os.path.getsize(xml_file), encoding=encoding)
+
+
+def get_parser_for_size(size: int, encoding: Union[str, None] = None) -> etree.XMLParser:
+    if is_huge(size):
         parser = etree.XMLParser(huge_tree=True, encoding=encoding)
     else:
         parser = etree.XMLParser(encoding=encoding)
     return parser
 
 
+def parse_pruned(source: Union[str, IO[bytes], ValidXmlReader], prune_tags: Iterable[str], huge_tree: bool = False,
+                 encoding: Union[str, None] = None) -> etree._Element:
+    tags = list(prune_tags)
+    if not tags:
+        parser = etree.XMLParser(huge_tree=huge_tree, encoding=encoding)
+        return etree.parse(source, parser=parser).getroot()
+    context = etree.iterparse(source, events=('end',), tag=tags, huge_tree=huge_tree, encoding=encoding)
+    for _, elem in context:
+        elem.clear()
+        parent = elem.getparent()
+        if parent is not None:
+            parent.remove(elem)
+    return context.root
+
+
+def release(elem: etree._Element):
+    elem.clear(keep_tail=True)
+    parent = elem.getparent()
+    while parent is not None:
+        while elem.getprevious() is not None:
+            del parent[0]
+        elem = parent
+        parent = elem.getparent()
+
+
+CHAR_REF_PATTERN = re.compile(rb'&#x.+?;', flags=re.IGNORECASE)
+INVALID_CHAR_REF_PATTERN = re.compile(rb'&#x0*(?:[0-8bcef]|1[0-9a-f]|d[89a-f][0-9a-f]{2}|fff[ef]);', flags=re.IGNORECASE)
+MAX_CHAR_REF_SIZE = 32
+READ_SIZE = 1 << 16
+
+
+class ValidXmlReader(object):
+    def __init__(self, xml_file: str, invalid_only: bool = False, chunk_size: int = READ_SIZE):
+        self._file = open(xml_file, 'rb')
+        self._buffer = bytearray()
+        # a trailing partial character reference is held back until the next chunk completes it
+        self._tail = b''
+        self._chunk_size = chunk_size
+        self._pattern = INVALID_CHAR_REF_PATTERN if invalid_only else CHAR_REF_PATTERN
+
+    def _fill(self) -> bool:
+        chunk = self._file.read(self._chunk_size)
+        if not chunk:
+            self._buffer += self._pattern.sub(b' ', self._tail)
+            self._tail = b''
+            return False
+        data = self._tail + chunk
+        start = data.rfind(b'&', max(0, len(data) - MAX_CHAR_REF_SIZE))
+        if start >= 0 and b';' not in data[start:]:
+            data, self._tail = data[:start], data[start:]
+        else:
+            self._tail = b''
+        self._buffer += self._pattern.sub(b' ', data)
+        return True
+
+    def read(self, size: int = -1) -> bytes:
+        while (size < 0 or len(self._buffer) < size) and self._fill():
+            pass
+        if size < 0:
+            size = len(self._buffer)
+        # the buffer never holds much more than one chunk, so dropping the consumed prefix is cheap
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self) -> ValidXmlReader:
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
 def remove_invalid_chars(chars):
     if not chars:
         return chars
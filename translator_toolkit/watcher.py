@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from typing import Iterable, Optional
+
+from lxml import etree
+
+from translator_toolkit import segment as segmentlib
+from translator_toolkit import stats as statslib
+from translator_toolkit.segment import Segment
+from translator_toolkit.search import SearchIndex
+from translator_toolkit.store import ProjectStore
+from translator_toolkit.stats import FileStats
+from translator_toolkit.util import fileutil
+from translator_toolkit.error import TranslatorToolkitError
+
+ADDED = 'added'
+MODIFIED = 'modified'
+REMOVED = 'removed'
+
+WATCH_EXTS = list(segmentlib.EXTENSIONS)
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+EVENT_HEADER = struct.Struct('iIII')
+READ_SIZE = 1 << 16
+
+
+class FileState(object):
+    mtime_ns: int
+    size: int
+
+    def __init__(self, mtime_ns: int, size: int):
+        self.mtime_ns = mtime_ns
+        self.size = size
+
+    @classmethod
+    def from_stat(cls, st: os.stat_result) -> FileState:
+        return FileState(st.st_mtime_ns, st.st_size)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, FileState) and self.mtime_ns == other.mtime_ns and self.size == other.size
+
+
+class Change(object):
+    kind: str
+    source_file: str
+
+    def __init__(self, kind: str, source_file: str):
+        self.kind = kind
+        self.source_file = source_file
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Change) and self.kind == other.kind and self.source_file == other.source_file
+
+    def __repr__(self) -> str:
+        return f'Change({self.kind!r}, {self.source_file!r})'
+
+
+class WatchHandler(object):
+    def update(self, source_file: str, segments: list[Segment]):
+        pass
+
+    def remove(self, source_file: str):
+        pass
+
+
+class SearchIndexHandler(WatchHandler):
+    index: SearchIndex
+
+    def __init__(self, index: SearchIndex):
+        self.index = index
+
+    def update(self, source_file: str, segments: list[Segment]):
+        self.index.add_segments(source_file, segments)
+
+    def remove(self, source_file: str):
+        self.index.remove_file(source_file)
+
+
+class StatsHandler(WatchHandler):
+    stats: dict[str, FileStats]
+
+    def __init__(self):
+        self.stats = {}
+
+    def update(self, source_file: str, segments: list[Segment]):
+        self.stats[source_file] = statslib.get_segment_stats(source_file, segments)
+
+    def remove(self, source_file: str):
+        self.stats.pop(source_file, None)
+
+
+class StoreHandler(WatchHandler):
+    store: ProjectStore
+
+    def __init__(self, store: ProjectStore):
+        self.store = store
+
+    def update(self, source_file: str, segments: list[Segment]):
+        # the store keeps whole documents, so the file is read again here, unchanged content is skipped by hash
+        self.store.add_file(source_file)
+
+    def remove(self, source_file: str):
+        self.store.remove_file(source_file)
+
+
+def is_watched(path: str, exts: tuple[str, ...]) -> bool:
+    return path.lower().endswith(exts)
+
+
+def scan_states(paths: Iterable[str], exts: Iterable[str]) -> dict[str, FileState]:
+    states = {}
+    for source_file in fileutil.find_files(paths, exts):
+        try:
+            states[source_file] = FileState.from_stat(os.stat(source_file))
+        except FileNotFoundError:
+            continue
+    return states
+
+
+class Inotify(object):
+    fd: int
+
+    def __init__(self):
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self._add_watch = libc.inotify_add_watch
+        self._add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        self.dirs: dict[int, str] = {}
+
+    def add_watch(self, dir_path: str):
+        wd = self._add_watch(self.fd, os.fsencode(dir_path), WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f'inotify_add_watch failed: {dir_path}')
+        self.dirs[wd] = dir_path
+
+    def add_tree(self, dir_path: str):
+        for dirpath, _, _ in os.walk(dir_path):
+            self.add_watch(dirpath)
+
+    def read(self, timeout: Optional[float]) -> Optional[list[tuple[str, int]]]:
+        # returns (path, mask) pairs, or None when events were lost and everything has to be rescanned
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        events = []
+        while True:
+            try:
+                data = os.read(self.fd, READ_SIZE)
+            except BlockingIOError:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+                offset += length
+                if mask & IN_Q_OVERFLOW:
+                    return None
+                if mask & IN_IGNORED:
+                    self.dirs.pop(wd, None)
+                    continue
+                dir_path = self.dirs.get(wd)
+                if dir_path is not None:
+                    events.append((os.path.join(dir_path, name) if name else dir_path, mask))
+        return events
+
+    def close(self):
+        os.close(self.fd)
+
+
+class Watcher(object):
+    paths: list[str]
+    handlers: list[WatchHandler]
+    exts: tuple[str, ...]
+    states: dict[str, FileState]
+    errors: dict[str, str]
+
+    def __init__(self, paths: Iterable[str], handlers: Iterable[WatchHandler] = (), exts: Iterable[str] = WATCH_EXTS, use_inotify: Optional[bool] = None):
+        self.paths = [os.path.abspath(p) for p in paths]
+        self.handlers = list(handlers)
+        self.exts = tuple(ext.lower() for ext in exts)
+        self.states = {}
+        # files that failed to parse, usually because they were still being written, are retried once their state changes
+        self.errors = {}
+        self._error_states: dict[str, FileState] = {}
+        self._inotify: Optional[Inotify] = None
+        # inotify does not report changes made by other hosts on network shares, use_inotify=False polls instead
+        if use_inotify is not False and sys.platform.startswith('linux'):
+            try:
+                self._inotify = Inotify()
+            except (OSError, AttributeError):
+                self._inotify = None
+        if use_inotify and self._inotify is None:
+            raise TranslatorToolkitError('inotify is not available')
+
+    @property
+    def uses_inotify(self) -> bool:
+        return self._inotify is not None
+
+    def __enter__(self) -> Watcher:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+
+    def _watch_paths(self):
+        for path in self.paths:
+            if os.path.isdir(path):
+                self._inotify.add_tree(path)
+            elif os.path.isdir(os.path.dirname(path)):
+                self._inotify.add_watch(os.path.dirname(path))
+
+    def _is_selected(self, path: str) -> bool:
+        return any(path == p or path.startswith(p + os.sep) for p in self.paths)
+
+    def apply(self, states: dict[str, FileState], checked: Optional[Iterable[str]] = None) -> list[Change]:
+        # checked limits removals to the given files, otherwise states is the full set of files
+        changes = []
+        for source_file, state in states.items():
+            old_state = self.states.get(source_file)
+            if old_state == state and source_file not in self.errors:
+                continue
+            if self._error_states.get(source_file) == state:
+                continue
+            if not self._update(source_file, state):
+                if old_state is not None and source_file not in self.states:
+                    changes.append(Change(REMOVED, source_file))
+                continue
+            self.states[source_file] = state
+            changes.append(Change(ADDED if old_state is None else MODIFIED, source_file))
+        removed = self.states.keys() - states.keys() if checked is None else {f for f in checked if f in self.states and f not in states}
+        for source_file in [f for f in self._error_states if f not in states and (checked is None or f in checked)]:
+            self.errors.pop(source_file, None)
+            del self._error_states[source_file]
+        for source_file in sorted(removed):
+            del self.states[source_file]
+            self.errors.pop(source_file, None)
+            self._error_states.pop(source_file, None)
+            for handler in self.handlers:
+                handler.remove(source_file)
+            changes.append(Change(REMOVED, source_file))
+        return changes
+
+    def _update(self, source_file: str, state: FileState) -> bool:
+        try:
+            segments = list(segmentlib.stream_segments(source_file))
+        except (TranslatorToolkitError, etree.XMLSyntaxError, OSError) as e:
+            self.errors[source_file] = str(e)
+            self._error_states[source_file] = state
+            return False
+        for handler in self.handlers:
+            try:
+                handler.update(source_file, segments)
+            except Exception as e:
+                # handlers may fail with their own errors (sqlite3.Error from the store), the file is then dropped from
+                # every handler and from states so that no handler keeps a version the others do not have
+                self.errors[source_file] = str(e)
+                self._error_states[source_file] = state
+                self._discard(source_file)
+                return False
+        self.errors.pop(source_file, None)
+        self._error_states.pop(source_file, None)
+        return True
+
+    def _discard(self, source_file: str):
+        self.states.pop(source_file, None)
+        for handler in self.handlers:
+            try:
+                handler.remove(source_file)
+            except Exception:
+                # the update error is already recorded
+                pass
+
+    def refresh(self) -> list[Change]:
+        if self._inotify is not None and not self._inotify.dirs:
+            self._watch_paths()
+        return self.apply(scan_states(self.paths, self.exts))
+
+    def poll(self, timeout: Optional[float] = None) -> list[Change]:
+        if self._inotify is None or not self._inotify.dirs:
+            if timeout:
+                time.sleep(timeout)
+            return self.refresh()
+        events = self._inotify.read(timeout)
+        if events is None:
+            return self.refresh()
+        candidates = set(self.errors)
+        for path, mask in events:
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                self._inotify.add_tree(path)
+                candidates.update(fileutil.find_files([path], self.exts))
+            elif mask & IN_ISDIR and mask & IN_MOVED_FROM:
+                candidates.update(f for f in self.states if f.startswith(path + os.sep))
+            elif is_watched(path, self.exts) and self._is_selected(path):
+                candidates.add(path)
+        states = {}
+        for source_file in candidates:
+            try:
+                states[source_file] = FileState.from_stat(os.stat(source_file))
+            except FileNotFoundError:
+                continue
+        return self.apply(states, candidates)
+
+    def run(self, interval: float = 1.0, should_stop=None, on_change=None):
+        self.refresh()
+        while should_stop is None or not should_stop():
+            changes = self.poll(interval)
+            if changes and on_change is not None:
+                on_change(changes)
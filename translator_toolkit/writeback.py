@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import copy
+import os
+import shutil
+import tempfile
+from typing import Optional
+
+from lxml import etree
+
+from translator_toolkit import segment as segmentlib
+from translator_toolkit.segment import SDLXLIFF, MXLIFF
+from translator_toolkit.split import iter_leaves, is_unit
+from translator_toolkit.ns import XLF, XLFNS, SDLXLF, SDLXLFNS, MXLF
+from translator_toolkit.util import xmlstream
+from translator_toolkit.error import TranslatorToolkitError
+
+XLF_TRANS_UNIT = XLF + 'trans-unit'
+XLF_SOURCE = XLF + 'source'
+XLF_SEG_SOURCE = XLF + 'seg-source'
+XLF_TARGET = XLF + 'target'
+XLF_MRK = XLF + 'mrk'
+SDLXLF_SEG_DEFS = SDLXLF + 'seg-defs'
+SDLXLF_SEG = SDLXLF + 'seg'
+
+
+class TargetUpdate(object):
+    target: str
+    status: Optional[str]
+
+    def __init__(self, target: str, status: Optional[str] = None):
+        self.target = target
+        self.status = status
+
+
+def parse_sdlxliff_content(content: str) -> etree._Element:
+    try:
+        return etree.fromstring(f'<mrk xmlns="{XLFNS}" xmlns:sdl="{SDLXLFNS}">{content}</mrk>')
+    except etree.XMLSyntaxError as e:
+        raise TranslatorToolkitError(f'invalid target content: {content}') from e
+
+
+def get_seg_mrks(elem: etree._Element) -> list[etree._Element]:
+    return [e for e in elem.iter(XLF_MRK) if e.get('mtype') == 'seg']
+
+
+def update_sdlxliff_unit(tu: etree._Element, updates: dict[str, TargetUpdate]) -> int:
+    seg_source = None
+    target = None
+    seg_defs = None
+    # the first of each child wins, as with find()
+    for child in tu.iterchildren():
+        tag = child.tag
+        if tag == XLF_SEG_SOURCE:
+            if seg_source is None:
+                seg_source = child
+        elif tag == XLF_TARGET:
+            if target is None:
+                target = child
+        elif tag == SDLXLF_SEG_DEFS:
+            if seg_defs is None:
+                seg_defs = child
+    if seg_source is None:
+        return 0
+    mids = [mrk.get('mid', '') for mrk in get_seg_mrks(seg_source)]
+    if not any(mid.replace('_x0020_', ' ') in updates for mid in mids):
+        return 0
+    if target is None:
+        target = copy.deepcopy(seg_source)
+        target.tag = XLF_TARGET
+        for mrk in get_seg_mrks(target):
+            mrk.text = None
+            mrk[:] = []
+        seg_source.addnext(target)
+        target.tail = seg_source.tail
+    seg_by_id = {seg.get('id', '').replace('_x0020_', ' '): seg for seg in seg_defs.iterchildren(SDLXLF_SEG)} if seg_defs is not None else {}
+    count = 0
+    for mrk in get_seg_mrks(target):
+        mid = mrk.get('mid', '').replace('_x0020_', ' ')
+        update = updates.get(mid)
+        if update is None:
+            continue
+        content = parse_sdlxliff_content(update.target)
+        mrk.text = content.text
+        mrk[:] = list(content)
+        seg = seg_by_id.get(mid)
+        if update.status is not None and seg is not None:
+            seg.set('conf', update.status)
+        count += 1
+    return count
+
+
+def update_mxliff_unit(tu: etree._Element, updates: dict[str, TargetUpdate]) -> int:
+    update = updates.get(tu.get('id', ''))
+    if update is None:
+        return 0
+    target = None
+    source = None
+    for child in tu.iterchildren():
+        if child.tag == XLF_TARGET:
+            target = child
+            break
+        if child.tag == XLF_SOURCE and source is None:
+            source = child
+    if target is None:
+        target = etree.Element(XLF_TARGET)
+        if source is not None:
+            source.addnext(target)
+            target.tail = source.tail
+        else:
+            tu.insert(0, target)
+    target.text = update.target
+    if update.status is not None:
+        tu.set(MXLF + 'confirmed', update.status)
+    return 1
+
+
+def write_targets(source_file: str, updates: dict[str, TargetUpdate], output_file: Optional[str] = None) -> int:
+    format_ = segmentlib.get_format(source_file)
+    if format_ == SDLXLIFF:
+        update_unit = update_sdlxliff_unit
+    elif format_ == MXLIFF:
+        update_unit = update_mxliff_unit
+    else:
+        raise TranslatorToolkitError(f'writing targets is not supported for {format_} files: {source_file}')
+    output_file = output_file or source_file
+    # write to a temporary file first so that the source can be rewritten in place
+    fd, temp_file = tempfile.mkstemp(suffix='.tmp', dir=os.path.dirname(os.path.abspath(output_file)))
+    count = 0
+    try:
+        with os.fdopen(fd, 'wb') as outfile:
+            writer = xmlstream.XmlStreamWriter(outfile)
+            for path, elem in iter_leaves(source_file, format_):
+                if is_unit(path) and updates:
+                    for tu in elem.iter(XLF_TRANS_UNIT):
+                        count += update_unit(tu, updates)
+                writer.write(path, xmlstream.serialize(elem))
+            writer.close()
+        shutil.copymode(source_file, temp_file)
+        os.replace(temp_file, output_file)
+    except BaseException:
+        os.remove(temp_file)
+        raise
+    return count
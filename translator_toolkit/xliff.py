@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import os
+import sys
+from typing import Iterator, Iterable, Optional, AbstractSet
+
+from lxml import etree
+
+from translator_toolkit.ns import XLF
+from translator_toolkit.util import xmlutil
+from translator_toolkit.error import TranslatorToolkitError
+from translator_toolkit.xjson import XUnit, XGroup, XFile, XDocument
+
+XLF_XLIFF = XLF + 'xliff'
+XLF_FILE = XLF + 'file'
+XLF_TRANS_UNIT = XLF + 'trans-unit'
+XLF_SOURCE = XLF + 'source'
+XLF_TARGET = XLF + 'target'
+XLF_NOTE = XLF + 'note'
+
+XLIFF_FIELDS = frozenset(['id', 'resname', 'source', 'target', 'state', 'approved', 'translate', 'notes'])
+
+
+def get_fields(fields: Optional[Iterable[str]]) -> AbstractSet[str]:
+    if fields is None:
+        return XLIFF_FIELDS
+    fields = frozenset(fields)
+    unknown = fields - XLIFF_FIELDS
+    if unknown:
+        raise TranslatorToolkitError(f'unknown fields: {", ".join(sorted(unknown))}')
+    return fields
+
+
+class XliffTransUnit(object):
+    id: str
+    resname: str
+    source: str
+    target: str
+    state: str
+    approved: bool
+    translate: bool
+    notes: list[str]
+
+    def __init__(self, id_: str, resname: str, source: str, target: str, state: str, approved: bool, translate: bool,
+                 notes: list[str]):
+        self.id = id_
+        self.resname = resname
+        self.source = source
+        self.target = target
+        self.state = state
+        self.approved = approved
+        self.translate = translate
+        self.notes = notes
+
+    @classmethod
+    def from_element(cls, elem: etree._Element, fields: AbstractSet[str] = XLIFF_FIELDS) -> XliffTransUnit:
+        id_ = elem.get('id', '') if 'id' in fields else ''
+        resname = elem.get('resname', '') if 'resname' in fields else ''
+        approved = elem.get('approved') == 'yes' if 'approved' in fields else False
+        translate = elem.get('translate') != 'no' if 'translate' in fields else True
+        source = ''
+        target = ''
+        state = ''
+        notes = []
+        with_source = 'source' in fields
+        with_target = 'target' in fields
+        with_state = 'state' in fields
+        with_notes = 'notes' in fields
+        for child in elem.iterchildren():
+            tag = child.tag
+            if tag == XLF_SOURCE:
+                if with_source:
+                    source = xmlutil.tostring(child)
+            elif tag == XLF_TARGET:
+                if with_target:
+                    target = xmlutil.tostring(child)
+                if with_state:
+                    state = sys.intern(child.get('state', ''))
+            elif tag == XLF_NOTE:
+                if with_notes:
+                    notes.append(child.text or '')
+        obj = XliffTransUnit(id_, resname, source, target, state, approved, translate, notes)
+        return obj
+
+    def to_json(self, srclang: str, tgtlang: str) -> XUnit:
+        obj: XUnit = {
+            'id': self.id,
+            'source': self.source,
+            'target': self.target,
+            'srclang': srclang,
+            'tgtlang': tgtlang,
+            'properties': None
+        }
+        return obj
+
+
+class XliffBody(object):
+    trans_units: list[XliffTransUnit]
+
+    def __init__(self, trans_units: list[XliffTransUnit]):
+        self.trans_units = trans_units
+
+
+class XliffFile(object):
+    source_language: str
+    target_language: str
+    original: str
+    datatype: str
+    body: XliffBody
+
+    def __init__(self, source_language: str, target_language: str, original: str, datatype: str, body: XliffBody):
+        self.source_language = source_language
+        self.target_language = target_language
+        self.original = original
+        self.datatype = datatype
+        self.body = body
+
+    @classmethod
+    def from_header(cls, elem: etree._Element) -> XliffFile:
+        original = elem.get('original', '')
+        datatype = sys.intern(elem.get('datatype', ''))
+        source_language = sys.intern(elem.get('source-language', ''))
+        target_language = sys.intern(elem.get('target-language', ''))
+        obj = XliffFile(source_language, target_language, original, datatype, XliffBody([]))
+        return obj
+
+    def to_json(self) -> XFile:
+        group: XGroup = {
+            'id': self.original,
+            'name': 'body',
+            'units': [tu.to_json(self.source_language, self.target_language) for tu in self.body.trans_units],
+            'properties': None
+        }
+        obj: XFile = {
+            'srclang': self.source_language,
+            'tgtlang': self.target_language,
+            'groups': [group],
+            'properties': {
+                'original': self.original,
+                'datatype': self.datatype
+            }
+        }
+        return obj
+
+
+class Xliff(object):
+    source_file: str
+    version: str
+    files: list[XliffFile]
+
+    def __init__(self, source_file: str, version: str, files: list[XliffFile]):
+        self.source_file = source_file
+        self.version = version
+        self.files = files
+
+    @classmethod
+    def iterparse(cls, source_file: str, fields: Optional[Iterable[str]] = None) -> Iterator[tuple[str, Xliff, XliffFile, Optional[XliffTransUnit]]]:
+        fields = get_fields(fields)
+        huge_tree = xmlutil.is_huge(os.path.getsize(source_file))
+        doc = Xliff(source_file, '', [])
+        file = None
+        with xmlutil.ValidXmlReader(source_file, invalid_only=True) as reader:
+            context = etree.iterparse(reader, events=('start', 'end'), tag=[XLF_XLIFF, XLF_FILE, XLF_TRANS_UNIT], huge_tree=huge_tree)
+            for event, elem in context:
+                tag = elem.tag
+                if tag == XLF_TRANS_UNIT:
+                    if event == 'end' and file is not None:
+                        yield 'trans-unit', doc, file, XliffTransUnit.from_element(elem, fields)
+                        xmlutil.release(elem)
+                elif event == 'start':
+                    if tag == XLF_FILE:
+                        file = XliffFile.from_header(elem)
+                        yield 'file', doc, file, None
+                    else:
+                        doc.version = elem.get('version', '')
+
+    @classmethod
+    def load(cls, source_file: str, fields: Optional[Iterable[str]] = None) -> Xliff:
+        doc = None
+        for event, doc, file, tu in Xliff.iterparse(source_file, fields):
+            if event == 'file':
+                doc.files.append(file)
+            elif tu is not None:
+                file.body.trans_units.append(tu)
+        if doc is None:
+            raise TranslatorToolkitError(f'no file element found: {source_file}')
+        return doc
+
+    @classmethod
+    def stream_trans_units(cls, source_file: str, fields: Optional[Iterable[str]] = None) -> Iterator[tuple[XliffFile, XliffTransUnit]]:
+        for _, _, file, tu in Xliff.iterparse(source_file, fields):
+            if tu is not None:
+                yield file, tu
+
+    def to_json(self) -> XDocument:
+        obj: XDocument = {
+            'source_file': self.source_file,
+            'files': [f.to_json() for f in self.files],
+            'properties': {
+                'version': self.version
+            }
+        }
+        return obj
+
+    def get_all_trans_units(self) -> Iterator[XliffTransUnit]:
+        for file in self.files:
+            for tu in file.body.trans_units:
+                yield tu
+
+    @property
+    def source_language(self):
+        return self.files[0].source_language if self.files else ''
+
+    @property
+    def target_language(self):
+        return self.files[0].target_language if self.files else ''
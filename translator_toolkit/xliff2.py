@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import os
+import sys
+from typing import Iterator, Iterable, Optional, AbstractSet
+
+from lxml import etree
+
+from translator_toolkit.ns import XLF2
+from translator_toolkit.util import xmlutil
+from translator_toolkit.error import TranslatorToolkitError
+from translator_toolkit.xjson import XUnit, XGroup, XFile, XDocument
+
+XLF2_XLIFF = XLF2 + 'xliff'
+XLF2_FILE = XLF2 + 'file'
+XLF2_UNIT = XLF2 + 'unit'
+XLF2_SEGMENT = XLF2 + 'segment'
+XLF2_SOURCE = XLF2 + 'source'
+XLF2_TARGET = XLF2 + 'target'
+XLF2_NOTES = XLF2 + 'notes'
+XLF2_NOTE = XLF2 + 'note'
+
+XLIFF2_FIELDS = frozenset(['id', 'name', 'translate', 'source', 'target', 'state', 'notes'])
+
+
+def get_fields(fields: Optional[Iterable[str]]) -> AbstractSet[str]:
+    if fields is None:
+        return XLIFF2_FIELDS
+    fields = frozenset(fields)
+    unknown = fields - XLIFF2_FIELDS
+    if unknown:
+        raise TranslatorToolkitError(f'unknown fields: {", ".join(sorted(unknown))}')
+    return fields
+
+
+class Xliff2Segment(object):
+    id: str
+    state: str
+    sub_state: str
+    source: str
+    target: str
+
+    def __init__(self, id_: str, state: str, sub_state: str, source: str, target: str):
+        self.id = id_
+        self.state = state
+        self.sub_state = sub_state
+        self.source = source
+        self.target = target
+
+    @classmethod
+    def from_element(cls, elem: etree._Element, fields: AbstractSet[str] = XLIFF2_FIELDS) -> Xliff2Segment:
+        id_ = elem.get('id', '') if 'id' in fields else ''
+        state = sys.intern(elem.get('state', 'initial')) if 'state' in fields else ''
+        sub_state = sys.intern(elem.get('subState', '')) if 'state' in fields else ''
+        source = ''
+        target = ''
+        with_source = 'source' in fields
+        with_target = 'target' in fields
+        for child in elem.iterchildren():
+            tag = child.tag
+            if tag == XLF2_SOURCE:
+                if with_source:
+                    source = xmlutil.tostring(child)
+            elif tag == XLF2_TARGET:
+                if with_target:
+                    target = xmlutil.tostring(child)
+        obj = Xliff2Segment(id_, state, sub_state, source, target)
+        return obj
+
+    def to_json(self, srclang: str, tgtlang: str) -> XUnit:
+        obj: XUnit = {
+            'id': self.id,
+            'source': self.source,
+            'target': self.target,
+            'srclang': srclang,
+            'tgtlang': tgtlang,
+            'properties': None
+        }
+        return obj
+
+
+class Xliff2Unit(object):
+    id: str
+    name: str
+    translate: bool
+    segments: list[Xliff2Segment]
+    notes: list[str]
+
+    def __init__(self, id_: str, name: str, translate: bool, segments: list[Xliff2Segment], notes: list[str]):
+        self.id = id_
+        self.name = name
+        self.translate = translate
+        self.segments = segments
+        self.notes = notes
+
+    @classmethod
+    def from_element(cls, elem: etree._Element, fields: AbstractSet[str] = XLIFF2_FIELDS) -> Xliff2Unit:
+        id_ = elem.get('id', '') if 'id' in fields else ''
+        name = elem.get('name', '') if 'name' in fields else ''
+        translate = True
+        if 'translate' in fields:
+            # translate is inherited from the enclosing group or file
+            for e in (elem, *elem.iterancestors()):
+                v = e.get('translate')
+                if v is not None:
+                    translate = v != 'no'
+                    break
+        segments = []
+        notes: list[str] = []
+        with_notes = 'notes' in fields
+        for child in elem.iterchildren():
+            tag = child.tag
+            if tag == XLF2_SEGMENT:
+                segments.append(Xliff2Segment.from_element(child, fields))
+            elif tag == XLF2_NOTES:
+                if with_notes:
+                    notes.extend(e.text or '' for e in child.iterchildren(XLF2_NOTE))
+        obj = Xliff2Unit(id_, name, translate, segments, notes)
+        return obj
+
+    def to_json(self, srclang: str, tgtlang: str) -> XGroup:
+        obj: XGroup = {
+            'id': self.id,
+            'name': 'unit',
+            'units': [s.to_json(srclang, tgtlang) for s in self.segments],
+            'properties': None
+        }
+        return obj
+
+
+class Xliff2File(object):
+    source_language: str
+    target_language: str
+    id: str
+    original: str
+    units: list[Xliff2Unit]
+
+    def __init__(self, source_language: str, target_language: str, id_: str, original: str, units: list[Xliff2Unit]):
+        self.source_language = source_language
+        self.target_language = target_language
+        self.id = id_
+        self.original = original
+        self.units = units
+
+    @classmethod
+    def from_header(cls, elem: etree._Element, source_language: str, target_language: str) -> Xliff2File:
+        id_ = elem.get('id', '')
+        original = elem.get('original', '')
+        obj = Xliff2File(source_language, target_language, id_, original, [])
+        return obj
+
+    def to_json(self) -> XFile:
+        obj: XFile = {
+            'srclang': self.source_language,
+            'tgtlang': self.target_language,
+            'groups': [u.to_json(self.source_language, self.target_language) for u in self.units],
+            'properties': {
+                'id': self.id,
+                'original': self.original
+            }
+        }
+        return obj
+
+
+class Xliff2(object):
+    source_file: str
+    version: str
+    source_language: str
+    target_language: str
+    files: list[Xliff2File]
+
+    def __init__(self, source_file: str, version: str, source_language: str, target_language: str, files: list[Xliff2File]):
+        self.source_file = source_file
+        self.version = version
+        self.source_language = source_language
+        self.target_language = target_language
+        self.files = files
+
+    @classmethod
+    def iterparse(cls, source_file: str, fields: Optional[Iterable[str]] = None) -> Iterator[tuple[str, Xliff2, Xliff2File, Optional[Xliff2Unit]]]:
+        fields = get_fields(fields)
+        huge_tree = xmlutil.is_huge(os.path.getsize(source_file))
+        doc = Xliff2(source_file, '', '', '', [])
+        file = None
+        with xmlutil.ValidXmlReader(source_file, invalid_only=True) as reader:
+            context = etree.iterparse(reader, events=('start', 'end'), tag=[XLF2_XLIFF, XLF2_FILE, XLF2_UNIT], huge_tree=huge_tree)
+            for event, elem in context:
+                tag = elem.tag
+                if tag == XLF2_UNIT:
+                    if event == 'end' and file is not None:
+                        yield 'unit', doc, file, Xliff2Unit.from_element(elem, fields)
+                        xmlutil.release(elem)
+                elif event == 'start':
+                    if tag == XLF2_FILE:
+                        file = Xliff2File.from_header(elem, doc.source_language, doc.target_language)
+                        yield 'file', doc, file, None
+                    else:
+                        doc.version = elem.get('version', '')
+                        doc.source_language = sys.intern(elem.get('srcLang', ''))
+                        doc.target_language = sys.intern(elem.get('trgLang', ''))
+
+    @classmethod
+    def load(cls, source_file: str, fields: Optional[Iterable[str]] = None) -> Xliff2:
+        doc = None
+        for event, doc, file, unit in Xliff2.iterparse(source_file, fields):
+            if event == 'file':
+                doc.files.append(file)
+            elif unit is not None:
+                file.units.append(unit)
+        if doc is None:
+            raise TranslatorToolkitError(f'no file element found: {source_file}')
+        return doc
+
+    @classmethod
+    def stream_units(cls, source_file: str, fields: Optional[Iterable[str]] = None) -> Iterator[tuple[Xliff2File, Xliff2Unit]]:
+        for _, _, file, unit in Xliff2.iterparse(source_file, fields):
+            if unit is not None:
+                yield file, unit
+
+    def to_json(self) -> XDocument:
+        obj: XDocument = {
+            'source_file': self.source_file,
+            'files': [f.to_json() for f in self.files],
+            'properties': {
+                'version': self.version
+            }
+        }
+        return obj
+
+    def get_all_units(self) -> Iterator[Xliff2Unit]:
+        for file in self.files:
+            for unit in file.units:
+                yield unit
+
+    def get_all_segments(self) -> Iterator[Xliff2Segment]:
+        for file in self.files:
+            for unit in file.units:
+                yield from unit.segments